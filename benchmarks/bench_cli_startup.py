@@ -0,0 +1,80 @@
+"""
+Startup-time benchmark for the headless CLI.
+
+Runs the CLI in fresh interpreters, reports wall-clock startup time and
+uses ``-X importtime`` to prove that neither Qt nor matplotlib is loaded:
+
+    python -m benchmarks.bench_cli_startup --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+CLI_COMMAND = ["-m", "money_analyzer.cli", "loan", "--principal", "250000", "--rate", "5", "--term", "30"]
+GUI_IMPORT = ["-c", "import money_analyzer.app"]
+FORBIDDEN_MODULES = ("PyQt6", "matplotlib")
+
+
+def wall_time(arguments, runs):
+    """
+    Median wall-clock time of running the interpreter with ``arguments``.
+
+    Returns:
+        float: Median seconds over ``runs`` fresh processes.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def imported_modules(arguments):
+    """
+    Modules imported by a run, parsed from ``-X importtime`` output.
+
+    Returns:
+        dict: ``name -> (cumulative microseconds, nesting depth)`` for every
+        imported module; depth 0 means imported directly by the command.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments], check=True, capture_output=True, text=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            modules[name.strip()] = (int(cumulative), depth)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="processes started per measurement")
+    parser.add_argument("--skip-gui", action="store_true", help="do not time the GUI import for comparison")
+    args = parser.parse_args()
+
+    modules = imported_modules(CLI_COMMAND)
+    leaked = sorted(name for name in modules if name.split(".")[0] in FORBIDDEN_MODULES)
+    top_level = [(name, micros) for name, (micros, depth) in modules.items() if depth == 0]
+    slowest = sorted(top_level, key=lambda item: item[1], reverse=True)[:5]
+
+    print(f"CLI startup (median of {args.runs}): {wall_time(CLI_COMMAND, args.runs) * 1e3:.1f} ms")
+    print("Slowest imports: " + ", ".join(f"{name} {micros / 1e3:.1f} ms" for name, micros in slowest))
+    if not args.skip_gui:
+        print(f"GUI import for comparison:    {wall_time(GUI_IMPORT, args.runs) * 1e3:.1f} ms")
+    if leaked:
+        print("FAIL: CLI imported " + ", ".join(leaked))
+        sys.exit(1)
+    print("OK: no Qt or matplotlib modules imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Startup benchmark for the GUI: imports, time-to-first-paint and the time
+until the loan analyzer dock has been built.
+
+Each run starts a fresh interpreter under Qt's offscreen platform:
+
+    python -m benchmarks.bench_gui_startup --runs 5 --importtime
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("matplotlib", "numpy", "pandas")
+
+
+def child():
+    """Start the app, record milestones and print them as JSON."""
+    start = time.perf_counter()
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+    from money_analyzer.theme_manager import ThemeManager
+    from money_analyzer.ui.main_window import MainWindow
+    milestones = {'import_ms': (time.perf_counter() - start) * 1e3}
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and 'first_paint_ms' not in milestones:
+                milestones['first_paint_ms'] = (time.perf_counter() - start) * 1e3
+                milestones['loaded_at_first_paint'] = [name for name in HEAVY_MODULES if name in sys.modules]
+            return False
+
+    app = QApplication([])
+    ThemeManager.get_instance().apply_theme(app)
+    window = MainWindow()
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+
+    def on_materialized(_widget):
+        milestones['loan_widget_ms'] = (time.perf_counter() - start) * 1e3
+        QTimer.singleShot(0, app.quit)
+
+    window.loan_dock.materialized.connect(on_materialized)
+    QTimer.singleShot(30000, app.quit)
+    window.show()
+    app.exec()
+    print(json.dumps(milestones))
+
+
+def run_child(runs):
+    """
+    Run the child ``runs`` times and collect its milestones.
+
+    Returns:
+        list[dict]: Milestones per run, plus the process wall time.
+
+    Raises:
+        RuntimeError: If a child exits with a non-zero status.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_gui_startup", "--child"],
+            capture_output=True, text=True, env=env,
+        )
+        if process.returncode:
+            # A child that crashes at exit is a bug in the app, not noise
+            raise RuntimeError(f"GUI child exited with status {process.returncode}:\n{process.stderr}")
+        milestones = json.loads(process.stdout.strip().splitlines()[-1])
+        milestones['process_ms'] = (time.perf_counter() - start) * 1e3
+        results.append(milestones)
+    return results
+
+
+def import_profile():
+    """
+    Slowest top-level imports of the GUI according to ``-X importtime``.
+
+    Returns:
+        list[tuple]: ``(module, milliseconds)`` sorted slowest first.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import money_analyzer.app"],
+        check=True, capture_output=True, text=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) == 1:
+                modules.append((name.strip(), int(cumulative) / 1e3))
+    return sorted(modules, key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    parser.add_argument("--importtime", action="store_true", help="also print the slowest imports")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    results = run_child(args.runs)
+    for key, label in (
+        ('import_ms', "Module imports"),
+        ('first_paint_ms', "Time to first paint"),
+        ('loan_widget_ms', "Loan analyzer ready"),
+        ('process_ms', "Process wall time"),
+    ):
+        values = [result[key] for result in results if key in result]
+        if values:
+            print(f"{label:<22} {statistics.median(values):8.1f} ms (median of {len(values)})")
+    loaded = sorted({name for result in results for name in result.get('loaded_at_first_paint', ())})
+    print("Heavy modules loaded before first paint: " + (", ".join(loaded) or "none"))
+    if args.importtime:
+        for name, millis in import_profile()[:10]:
+            print(f"  {name:<40} {millis:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for loading saved scenarios into the loan widget.
+
+Writes a JSON file with N random scenarios and times
+``LoanWidget.load_scenarios_file`` under Qt's offscreen platform, counting
+how many times the summary and graph were rendered. ``--store`` imports the
+file into a memory-mapped scenario store first and loads that instead:
+
+    python -m benchmarks.bench_load_scenarios --scenarios 500 [--store]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from money_analyzer.config import (
+    DOWN_PAYMENT_MAX, EXTRA_PAYMENT_MAX, INTEREST_RATE_MAX, INTEREST_RATE_MIN,
+    LOAN_AMOUNT_MAX, LOAN_AMOUNT_MIN, LOAN_TERM_MAX, LOAN_TERM_MIN,
+)
+
+
+def write_scenarios(path, count, seed=0):
+    """Write ``count`` random scenarios in the saved-scenario JSON format."""
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(count):
+        loan_amount = rng.randint(LOAN_AMOUNT_MIN, LOAN_AMOUNT_MAX)
+        scenarios.append({
+            "loan_amount": loan_amount,
+            "down_payment": rng.randint(0, min(DOWN_PAYMENT_MAX, loan_amount // 2)),
+            "interest_rate": rng.randint(INTEREST_RATE_MIN, INTEREST_RATE_MAX),
+            "loan_term": rng.randint(LOAN_TERM_MIN, LOAN_TERM_MAX),
+            "extra_payment": rng.choice([0, rng.randint(0, EXTRA_PAYMENT_MAX // 10)]),
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(scenarios, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", type=int, default=500, help="scenarios in the saved file")
+    parser.add_argument("--store", action="store_true", help="load from a scenario store instead of JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from money_analyzer.models.scenario_store import ScenarioStore
+    from money_analyzer.ui.widgets.loan_widget import LoanWidget
+
+    app = QApplication([])
+    widget = LoanWidget()
+    renders = []
+    original_render = widget.render
+    widget.render = lambda: (renders.append(1), original_render())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scenarios.json")
+        write_scenarios(path, args.scenarios)
+        if args.store:
+            path = ScenarioStore.import_json(path, os.path.join(directory, "scenarios.scenarios")).path
+        start = time.perf_counter()
+        widget.load_scenarios_file(path)
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+
+    print(f"Loaded {len(widget.loan_scenarios)} scenarios in {elapsed * 1e3:.1f} ms "
+          f"({elapsed / max(args.scenarios, 1) * 1e3:.2f} ms/scenario), renders: {len(renders)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Throughput benchmark for LoanBatch against the scalar Loan model.
+
+Prices a random tape of loans both ways and reports loans per second:
+
+    python -m benchmarks.bench_loan_batch --loans 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from money_analyzer.config import (
+    DOWN_PAYMENT_MAX, EXTRA_PAYMENT_MAX, INTEREST_RATE_MAX, INTEREST_RATE_MIN,
+    INTEREST_RATE_SCALE_FACTOR, LOAN_AMOUNT_MAX, LOAN_AMOUNT_MIN, LOAN_TERM_MAX, LOAN_TERM_MIN,
+)
+from money_analyzer.utils.financial_calculations import LoanBatch
+
+
+def random_tape(num_loans, seed=0):
+    """
+    Generate a reproducible batch of loans within the slider bounds.
+
+    Args:
+        num_loans (int): Number of loans in the tape.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        LoanBatch: The generated loans.
+    """
+    rng = np.random.default_rng(seed)
+    principal = rng.uniform(LOAN_AMOUNT_MIN, LOAN_AMOUNT_MAX, num_loans)
+    return LoanBatch(
+        principal,
+        rng.integers(INTEREST_RATE_MIN, INTEREST_RATE_MAX + 1, num_loans) / INTEREST_RATE_SCALE_FACTOR,
+        rng.integers(LOAN_TERM_MIN, LOAN_TERM_MAX + 1, num_loans),
+        np.minimum(rng.uniform(0, DOWN_PAYMENT_MAX, num_loans), principal * 0.5),
+        np.where(rng.random(num_loans) < 0.5, rng.uniform(0, EXTRA_PAYMENT_MAX / 10, num_loans), 0.0),
+    )
+
+
+def measure(label, num_loans, func, repeat=3):
+    """
+    Time ``func`` and print its throughput.
+
+    Returns:
+        float: Best observed loans per second.
+    """
+    best = min(_timed(func) for _ in range(repeat))
+    rate = num_loans / best
+    print(f"{label:<32} {best * 1e3:10.2f} ms {rate:16,.0f} loans/sec")
+    return rate
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(num_loans, scalar_loans, schedule_loans):
+    """
+    Run the batch and scalar measurements.
+
+    Returns:
+        dict: Loans per second for every measurement.
+    """
+    batch = random_tape(num_loans)
+    scalar = [batch[i] for i in range(min(scalar_loans, num_loans))]
+    schedules = batch[:schedule_loans]
+
+    results = {
+        'batch_summary': measure("LoanBatch summary", num_loans, batch.calculate_loan_summary),
+        'scalar_summary': measure(
+            "Loan.calculate_loan_summary", len(scalar),
+            lambda: [loan.calculate_loan_summary() for loan in scalar],
+        ),
+        'batch_schedule': measure(
+            "LoanBatch schedule matrix", len(schedules), schedules.generate_amortization_schedule
+        ),
+        'scalar_schedule': measure(
+            "Loan.calculate_loan_details", len(scalar),
+            lambda: [loan.calculate_loan_details() for loan in scalar],
+        ),
+    }
+    print(f"summary speedup:  {results['batch_summary'] / results['scalar_summary']:.1f}x")
+    print(f"schedule speedup: {results['batch_schedule'] / results['scalar_schedule']:.1f}x")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--loans", type=int, default=200_000, help="loans in the batch tape")
+    parser.add_argument("--scalar-loans", type=int, default=5_000, help="loans priced one at a time")
+    parser.add_argument("--schedule-loans", type=int, default=5_000, help="loans in the schedule matrix")
+    args = parser.parse_args()
+    run(args.loans, args.scalar_loans, args.schedule_loans)
+
+
+if __name__ == "__main__":
+    main()
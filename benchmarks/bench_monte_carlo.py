@@ -0,0 +1,78 @@
+"""
+Scaling benchmark for the Monte Carlo rate-path simulation.
+
+Simulates one adjustable-rate loan with an increasing number of worker
+processes and reports paths per second and the speedup over one process.
+Every run uses the same seed and is checked against the single-process
+result, so the benchmark also verifies reproducibility:
+
+    python -m benchmarks.bench_monte_carlo --paths 50000 --workers 1,2,4,8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.utils.monte_carlo import PATH_COLUMNS, VasicekModel, simulate_loan
+
+
+def default_workers():
+    """Powers of two up to the number of cores, plus the core count itself."""
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+    return workers
+
+
+def run(num_paths, workers, seed=0, repeat=3):
+    """
+    Time the simulation for every worker count.
+
+    Returns:
+        dict: Best seconds per worker count.
+
+    Raises:
+        AssertionError: If a run differs from the single-process result.
+    """
+    loan = Loan(300000, 5.0, 30, 60000, 0, RateSchedule(60, 12, initial_cap=2, periodic_cap=1, lifetime_cap=5))
+    model = VasicekModel(6.0, 0.25, 1.0)
+    reference = simulate_loan(loan, model, num_paths, seed=seed, workers=1)
+
+    timings = {}
+    for count in workers:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = simulate_loan(loan, model, num_paths, seed=seed, workers=count)
+            best = min(best, time.perf_counter() - start)
+        for column in PATH_COLUMNS + ('total_interest',):
+            assert np.array_equal(getattr(result, column), getattr(reference, column)), (count, column)
+        timings[count] = best
+        print(
+            f"{count:>3} workers {best * 1e3:10.1f} ms {num_paths / best:14,.0f} paths/sec "
+            f"{timings[workers[0]] / best:6.2f}x"
+        )
+    print(f"median total interest: ${reference.band('total_interest', 50):,.2f}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=50_000, help="simulated rate paths")
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default: powers of two)")
+    parser.add_argument("--seed", type=int, default=0, help="run seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per worker count; the best is reported")
+    args = parser.parse_args()
+    workers = [int(count) for count in args.workers.split(",")] if args.workers else default_workers()
+    run(args.paths, workers, args.seed, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Scaling benchmark for out-of-core loan-tape processing.
+
+Writes a random tape to a temporary ``.npy`` file, prices it with an
+increasing number of worker processes and reports loans per second and the
+speedup over one process. Every run is checked against the single-process
+result, so the benchmark also verifies that the totals do not depend on the
+number of workers:
+
+    python -m benchmarks.bench_portfolio --loans 1000000 --workers 1,2,4,8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from money_analyzer.config import PORTFOLIO_CHUNK_SIZE
+from money_analyzer.utils.portfolio import CASH_FLOW_COLUMNS, SUMMARY_FIELDS, TAPE_COLUMNS, process_tape
+
+from .bench_loan_batch import random_tape
+from .bench_monte_carlo import default_workers
+
+
+def write_tape(path, num_loans, seed=0):
+    """Save a random tape as a 2-D ``.npy`` array with the first five ``TAPE_COLUMNS``."""
+    batch = random_tape(num_loans, seed)
+    np.save(path, np.column_stack([getattr(batch, name) for name in TAPE_COLUMNS[:5]]))
+
+
+def run(num_loans, workers, chunk_size=PORTFOLIO_CHUNK_SIZE, repeat=1):
+    """
+    Time a whole tape for every worker count.
+
+    Returns:
+        dict: Best seconds per worker count.
+
+    Raises:
+        AssertionError: If a run differs from the single-process result.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        tape = os.path.join(directory, "tape.npy")
+        write_tape(tape, num_loans)
+        reference = process_tape(tape, os.path.join(directory, "reference"), chunk_size, workers=1)
+
+        timings = {}
+        for count in workers:
+            best = float('inf')
+            for attempt in range(repeat):
+                run_dir = os.path.join(directory, f"run-{count}-{attempt}")
+                start = time.perf_counter()
+                result = process_tape(tape, run_dir, chunk_size, workers=count)
+                best = min(best, time.perf_counter() - start)
+            for column in CASH_FLOW_COLUMNS:
+                assert np.array_equal(getattr(result, column), getattr(reference, column)), (count, column)
+            for field in SUMMARY_FIELDS:
+                assert np.array_equal(result.summaries[field], reference.summaries[field], equal_nan=True), (count, field)
+            timings[count] = best
+            print(
+                f"{count:>3} workers {best * 1e3:10.1f} ms {num_loans / best:14,.0f} loans/sec "
+                f"{timings[workers[0]] / best:6.2f}x"
+            )
+        print(f"portfolio interest: ${reference.interest.sum():,.2f}")
+        del reference, result
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--loans", type=int, default=200_000, help="loans in the tape")
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default: powers of two)")
+    parser.add_argument("--chunk-size", type=int, default=PORTFOLIO_CHUNK_SIZE, help="loans per worker task")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per worker count; the best is reported")
+    args = parser.parse_args()
+    workers = [int(count) for count in args.workers.split(",")] if args.workers else default_workers()
+    run(args.loans, workers, args.chunk_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Benchmark suite for the loan engine, the controller, batch pricing and the GUI.
+
+Every benchmark reports the median and best of repeated runs and the
+results are written as JSON, so two commits can be compared:
+
+    python -m benchmarks.bench_suite --output before.json
+    python -m benchmarks.bench_suite --output after.json --compare before.json
+
+The GUI layer drives LoanWidget under Qt's offscreen platform with 1, 10 and
+100 scenarios. A slider tick is timed from the slider change to the end of
+the canvas draw that shows it, so it includes the debounce interval;
+``update_graph`` is timed with the deferred canvas draw flushed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from money_analyzer.config import UPDATE_DEBOUNCE_MS
+from money_analyzer.controllers.loan_controller import LoanController, compute_batch_results
+from money_analyzer.controllers.schedule_cache import ScheduleCache
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.models.scenario import PARAMETERS
+from money_analyzer.utils.financial_calculations import LoanBatch
+
+from .bench_loan_batch import random_tape
+
+LAYERS = ("model", "controller", "batch", "gui")
+MODEL_TERMS = (15, 30)
+MODEL_RATES = (3.0, 6.5, 10.0)
+MODEL_EXTRA_PAYMENTS = (0, 500)
+MODEL_ROUNDING = (None, 'half_even')
+GUI_SCENARIOS = (1, 10, 100)
+
+
+def measure(func, repeat=5, number=1, setup=None):
+    """
+    Time ``func`` and summarize the runs.
+
+    Args:
+        func (Callable[[], object]): Code to time.
+        repeat (int): Timed runs.
+        number (int): Calls per run; times are reported per call.
+        setup (Callable[[], object] | None): Untimed code run before every run,
+            e.g. to clear a cache.
+
+    Returns:
+        dict: ``median_ms``, ``min_ms`` and ``runs``.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {'median_ms': statistics.median(times) * 1e3, 'min_ms': min(times) * 1e3, 'runs': repeat}
+
+
+def model_benchmarks(repeat):
+    """``Loan`` schedule and detail computation across terms, rates, extra payments and engines."""
+    results = {}
+    for term in MODEL_TERMS:
+        for rate in MODEL_RATES:
+            for extra_payment in MODEL_EXTRA_PAYMENTS:
+                for rounding in MODEL_ROUNDING:
+                    loan = Loan(300000, rate, term, 60000, extra_payment, rounding=rounding)
+                    case = f"term={term},rate={rate},extra={extra_payment}"
+                    if rounding is not None:
+                        case += f",rounding={rounding}"
+                    results[f"model.generate_amortization_schedule[{case}]"] = measure(
+                        loan.generate_amortization_schedule, repeat, number=100
+                    )
+                    results[f"model.calculate_loan_details[{case}]"] = measure(
+                        loan.calculate_loan_details, repeat, number=100
+                    )
+    return results
+
+
+def controller_loans():
+    """One fixed-rate, one adjustable-rate and one prepayment loan."""
+    return {
+        'fixed': Loan(300000, 6.5, 30, 60000),
+        'arm': Loan(300000, 6.5, 30, 60000, 0, RateSchedule(60, 12, (7.5,), 2, 1, 5)),
+        'prepayment': Loan(300000, 6.5, 30, 60000, 0, None, [Prepayment(24, 20000), Prepayment(60, 300, True)]),
+    }
+
+
+def controller_benchmarks(repeat):
+    """``LoanController`` lookups on an empty cache (cold) and on a hit (warm)."""
+    results = {}
+    for kind, loan in controller_loans().items():
+        cache = ScheduleCache()
+        controller = LoanController(cache=cache)
+        controller.loan = loan
+        for method in ('get_loan_summary', 'get_amortization_data'):
+            func = getattr(controller, method)
+            results[f"controller.{method}[{kind},cold]"] = measure(func, repeat, setup=cache.clear)
+            results[f"controller.{method}[{kind},warm]"] = measure(func, repeat, number=100)
+    return results
+
+
+def batch_benchmarks(repeat, num_loans):
+    """LoanBatch and ``compute_batch_results`` throughput on a random tape, in float and cent-exact mode."""
+    batch = random_tape(num_loans)
+    cents = LoanBatch(*(getattr(batch, name) for name in PARAMETERS), rounding=['half_even'] * len(batch))
+    charged = LoanBatch(*(getattr(batch, name) for name in PARAMETERS), fees=2500, points=1)
+    charged_summary = charged.calculate_loan_summary()
+    schedules = batch[:min(num_loans, 5_000)]
+    loans = [batch[i] for i in range(min(num_loans, 5_000))]
+    cache = ScheduleCache(maxsize=2 * len(loans))
+    cases = {
+        'batch.calculate_loan_summary': (len(batch), batch.calculate_loan_summary, None),
+        'batch.generate_amortization_schedule': (len(schedules), schedules.generate_amortization_schedule, None),
+        'batch.calculate_loan_summary[rounding=half_even]': (len(cents), cents.calculate_loan_summary, None),
+        'batch.generate_amortization_schedule[rounding=half_even]': (
+            len(schedules), cents[:len(schedules)].generate_amortization_schedule, None
+        ),
+        'batch.calculate_apr': (len(charged), lambda: charged.calculate_apr(charged_summary), None),
+        'batch.compute_batch_results': (len(loans), lambda: compute_batch_results(loans, cache), cache.clear),
+    }
+    results = {}
+    for name, (count, func, setup) in cases.items():
+        result = measure(func, repeat, setup=setup)
+        result['loans'] = count
+        result['loans_per_sec'] = count / (result['min_ms'] / 1e3)
+        results[name] = result
+    return results
+
+
+def gui_benchmarks(repeat, scenario_counts):
+    """Slider-tick latency and ``update_graph`` of LoanWidget per scenario count."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from money_analyzer.models.scenario import Scenario
+    from money_analyzer.ui.widgets.loan_widget import LoanWidget
+
+    app = QApplication.instance() or QApplication([])
+    batch = random_tape(max(scenario_counts))
+    results = {}
+    for count in scenario_counts:
+        widget = LoanWidget()
+        widget.resize(1000, 800)
+        widget.show()
+        with widget.bulk_update():
+            widget.loan_scenarios[0].set_parameters(*batch[0].cache_key()[:5])
+            for i in range(1, count):
+                widget.add_loan_scenario(Scenario(*batch[i].cache_key()[:5]))
+        app.processEvents()
+
+        results.update(widget_benchmarks(widget, count, repeat))
+        widget.close()
+        widget.deleteLater()
+        app.processEvents()
+    return results
+
+
+def widget_benchmarks(widget, count, repeat):
+    """Slider-tick and ``update_graph`` timings of one LoanWidget with ``count`` scenarios."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from money_analyzer.controllers.schedule_cache import shared_cache
+
+    results = {}
+    loop = QEventLoop()
+    connection = widget.canvas.mpl_connect('draw_event', lambda _event: loop.quit())
+    timeout = QTimer()
+    timeout.setSingleShot(True)
+    timeout.timeout.connect(loop.quit)
+    slider = widget.scenario_editor.interest_rate_slider
+    values = (value for value in range(slider.minimum(), slider.maximum() + 1) if value != slider.value())
+
+    def tick():
+        # A new rate every tick, on an empty cache, like a dragged slider
+        slider.setValue(next(values))
+        timeout.start(10000)
+        loop.exec()
+        if not timeout.isActive():
+            raise RuntimeError("The slider change was never drawn")
+        timeout.stop()
+
+    results[f"gui.slider_tick[scenarios={count}]"] = measure(tick, repeat, setup=shared_cache.clear)
+    widget.canvas.mpl_disconnect(connection)
+
+    def update_graph(scenarios):
+        # The plot redraws only series whose data object changed
+        for scenario in scenarios:
+            scenario.amortization_data = dict(scenario.amortization_data)
+        widget.update_graph()
+        widget.canvas.draw()
+
+    current = [widget.current_scenario()]
+    results[f"gui.update_graph[scenarios={count},changed=1]"] = measure(lambda: update_graph(current), repeat)
+    results[f"gui.update_graph[scenarios={count},changed=all]"] = measure(
+        lambda: update_graph(list(widget.loan_scenarios)), repeat
+    )
+    return results
+
+
+def metadata():
+    """Environment of the run, so results from different machines are not mixed up."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'update_debounce_ms': UPDATE_DEBOUNCE_MS,
+    }
+
+
+def run(layers=LAYERS, repeat=5, num_loans=100_000, scenario_counts=GUI_SCENARIOS):
+    """
+    Run the selected layers.
+
+    Returns:
+        dict: ``meta`` and ``results``, keyed by benchmark name.
+    """
+    results = {}
+    if "model" in layers:
+        results.update(model_benchmarks(repeat))
+    if "controller" in layers:
+        results.update(controller_benchmarks(repeat))
+    if "batch" in layers:
+        results.update(batch_benchmarks(repeat, num_loans))
+    if "gui" in layers:
+        results.update(gui_benchmarks(repeat, scenario_counts))
+    return {'meta': metadata(), 'results': results}
+
+
+def compare(results, baseline, threshold):
+    """
+    Median-time ratios against a baseline run.
+
+    Returns:
+        list[str]: Benchmarks slower than ``threshold`` times the baseline.
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        before = baseline['results'].get(name)
+        if before is None or not before['median_ms']:
+            continue
+        ratio = result['median_ms'] / before['median_ms']
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:<64} {before['median_ms']:10.3f} -> {result['median_ms']:10.3f} ms {ratio:6.2f}x{flag}",
+              file=sys.stderr)
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layers", default=",".join(LAYERS), help="comma-separated layers to run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--loans", type=int, default=100_000, help="loans in the batch tape")
+    parser.add_argument("--scenarios", default=",".join(map(str, GUI_SCENARIOS)),
+                        help="comma-separated scenario counts for the GUI layer")
+    parser.add_argument("--output", help="JSON file to write (default: standard output)")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression (exit status 1)")
+    args = parser.parse_args()
+
+    layers = [layer.strip() for layer in args.layers.split(",") if layer.strip()]
+    unknown = set(layers) - set(LAYERS)
+    if unknown:
+        parser.error(f"unknown layers: {', '.join(sorted(unknown))}")
+    scenario_counts = [int(count) for count in args.scenarios.split(",")]
+    results = run(layers, args.repeat, args.loans, scenario_counts)
+
+    for name, result in results['results'].items():
+        print(f"{name:<64} {result['median_ms']:10.3f} ms (best {result['min_ms']:.3f})", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+This module provides the headless command-line interface for loan analysis.
+It only depends on the models and NumPy, so it never imports Qt or
+matplotlib and can run on servers without a display.
+
+Usage:
+    python -m money_analyzer.cli loan --principal 250000 --rate 5 --term 30
+    python -m money_analyzer.cli batch loans.csv --output summaries.csv
+    cat loans.csv | python -m money_analyzer.cli batch --schedule > schedules.csv
+    python -m money_analyzer.cli portfolio tape.npy --run-dir run/ --output cash_flows.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from itertools import islice
+
+import numpy as np
+
+from .config import PORTFOLIO_CHUNK_SIZE
+from .models.fixed_point import ROUNDING_MODES
+from .models.loan import Loan
+from .utils.apr import loan_apr
+from .utils.financial_calculations import LoanBatch
+
+BATCH_COLUMNS = ('principal', 'interest_rate', 'term', 'down_payment', 'extra_payment')
+CHARGE_COLUMNS = ('fees', 'points')
+SUMMARY_COLUMNS = (
+    'loan_amount', 'interest_rate', 'monthly_payment', 'total_interest', 'total_payments', 'loan_term', 'apr',
+)
+SCHEDULE_COLUMNS = ('loan', 'month', 'payment', 'principal', 'interest', 'balance')
+DEFAULT_CHUNK_SIZE = 10000
+SCHEDULE_CHUNK_SIZE = 1000
+
+
+def loan_errors(principal, interest_rate, term, down_payment=0, extra_payment=0, fees=0, points=0):
+    """
+    Check loan parameters element-wise.
+
+    Returns:
+        list[tuple]: ``(invalid, message)`` per rule, where ``invalid`` is a
+        boolean array marking the loans that break it; NaN breaks every rule.
+    """
+    principal, down_payment = np.asarray(principal, dtype=float), np.asarray(down_payment, dtype=float)
+    term = np.asarray(term, dtype=float)
+    rules = (
+        (down_payment >= 0, "down payment must not be negative"),
+        (principal > down_payment, "principal must be greater than the down payment"),
+        (term > 0, "term must be positive"),
+        # LoanBatch stores whole years and would truncate a fractional term
+        (np.isfinite(term) & (term == np.floor(term)), "term must be a whole number of years"),
+        (np.asarray(interest_rate, dtype=float) >= 0, "interest rate must not be negative"),
+        (np.asarray(extra_payment, dtype=float) >= 0, "extra payment must not be negative"),
+        (np.asarray(fees, dtype=float) >= 0, "fees must not be negative"),
+        (np.asarray(points, dtype=float) >= 0, "points must not be negative"),
+    )
+    return [(~valid, message) for valid, message in rules]
+
+
+def read_loan_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE, rounding=None):
+    """
+    Stream a CSV of loan parameters as LoanBatch chunks.
+
+    The CSV needs a header with ``principal``, ``interest_rate`` and
+    ``term`` columns; ``down_payment``, ``extra_payment``, ``fees`` and
+    ``points`` default to 0.
+
+    Args:
+        file (TextIO): Open CSV file.
+        chunk_size (int): Maximum number of loans per chunk.
+        rounding (str | None): Rounding mode of the cent-exact engine for
+            every loan, or ``None`` for the float engine.
+
+    Returns:
+        Iterator[LoanBatch]: Consecutive chunks of the file.
+
+    Raises:
+        ValueError: If a required column is missing from the header; while
+            iterating, if a row is not a valid loan (see ``loan_errors``).
+    """
+    reader = csv.DictReader(file)
+    missing = {'principal', 'interest_rate', 'term'} - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+    return _iter_loan_chunks(reader, chunk_size, rounding)
+
+
+def _iter_loan_chunks(reader, chunk_size, rounding):
+    while True:
+        first_line = reader.line_num + 1
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        columns = [np.array([float(row.get(column) or 0) for row in rows]) for column in BATCH_COLUMNS + CHARGE_COLUMNS]
+        for invalid, message in loan_errors(*columns):
+            if invalid.any():
+                # Rows are reported by CSV line, the header being line 1
+                raise ValueError(f"line {first_line + int(np.argmax(invalid))}: {message}")
+        yield LoanBatch(
+            *columns[:len(BATCH_COLUMNS)], rounding=None if rounding is None else [rounding] * len(rows),
+            fees=columns[-2], points=columns[-1],
+        )
+
+
+def write_summaries(batches, file):
+    """Write one summary row per loan as CSV."""
+    file.write(",".join(SUMMARY_COLUMNS) + "\n")
+    for batch in batches:
+        summary = batch.calculate_loan_summary()
+        summary['apr'] = batch.calculate_apr(summary)
+        np.savetxt(file, np.column_stack([summary[column] for column in SUMMARY_COLUMNS]),
+                   fmt=['%.2f', '%.3f', '%.2f', '%.2f', '%.2f', '%.4f', '%.4f'], delimiter=",")
+
+
+def write_schedules(batches, file):
+    """Write the amortization schedule of every loan as long-format CSV."""
+    file.write(",".join(SCHEDULE_COLUMNS) + "\n")
+    offset = 0
+    for batch in batches:
+        schedule = batch.generate_amortization_schedule().ragged()
+        columns = [schedule['loan'] + offset] + [schedule[column] for column in SCHEDULE_COLUMNS[1:]]
+        np.savetxt(file, np.column_stack(columns), fmt=['%d', '%d', '%.2f', '%.2f', '%.2f', '%.2f'], delimiter=",")
+        offset += len(batch)
+
+
+def run_loan(args, out):
+    for invalid, message in loan_errors(args.principal, args.rate, args.term, args.down, args.extra, args.fees,
+                                        args.points):
+        if invalid:
+            raise ValueError(message)
+    loan = Loan(args.principal, args.rate, args.term, args.down, args.extra, rounding=args.rounding, fees=args.fees,
+                points=args.points)
+    if args.schedule:
+        write_schedules([LoanBatch.from_loans([loan])], out)
+        return
+    loan_summary = loan.calculate_loan_summary()
+    monthly_payment, total_interest, total_payments, num_months = loan_summary
+    # No APR when fees and points leave nothing financed; null in JSON
+    apr = loan_apr(loan, loan_summary)
+    apr = None if math.isnan(apr) else apr
+    summary = {
+        'loan_amount': loan.principal - loan.down_payment,
+        'interest_rate': loan.interest_rate,
+        'apr': apr,
+        'monthly_payment': monthly_payment,
+        'total_interest': total_interest,
+        'total_payments': total_payments,
+        'loan_term': num_months / 12,
+    }
+    if args.json:
+        json.dump(summary, out, indent=2)
+        out.write("\n")
+        return
+    out.write(
+        f"Loan Amount: ${summary['loan_amount']:,.2f}\n"
+        f"Interest Rate: {summary['interest_rate']:.2f}%\n"
+        f"APR: {'n/a' if apr is None else f'{apr:.2f}%'}\n"
+        f"Monthly Payment: ${summary['monthly_payment']:,.2f}\n"
+        f"Loan Term (years): {summary['loan_term']:.1f}\n"
+        f"Total Interest Paid: ${summary['total_interest']:,.2f}\n"
+        f"Total Paid: ${summary['total_payments']:,.2f}\n"
+    )
+
+
+def run_batch(args, out):
+    chunk_size = args.chunk_size or (SCHEDULE_CHUNK_SIZE if args.schedule else DEFAULT_CHUNK_SIZE)
+    batches = read_loan_chunks(args.input, chunk_size, args.rounding)
+    if args.schedule:
+        write_schedules(batches, out)
+    else:
+        write_summaries(batches, out)
+
+
+def run_portfolio(args, out):
+    # Imported here so the other commands do not load multiprocessing
+    from .utils.portfolio import CASH_FLOW_COLUMNS, process_tape
+
+    result = process_tape(args.input, args.run_dir, args.chunk_size, args.workers, args.rounding, args.restart)
+    if result.resumed_chunks:
+        print(f"Resumed after {result.resumed_chunks} of {result.num_chunks} chunks", file=sys.stderr)
+    out.write(",".join(('month',) + CASH_FLOW_COLUMNS) + "\n")
+    np.savetxt(out, np.column_stack([result.months] + [getattr(result, column) for column in CASH_FLOW_COLUMNS]),
+               fmt=['%d', '%.2f', '%.2f', '%.2f', '%.2f'], delimiter=",")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m money_analyzer.cli", description="Headless loan analysis.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    loan_parser = subparsers.add_parser("loan", help="analyze a single loan")
+    loan_parser.add_argument("--principal", type=float, required=True, help="loan amount in dollars")
+    loan_parser.add_argument("--rate", type=float, required=True, help="annual interest rate in percent")
+    loan_parser.add_argument("--term", type=int, required=True, help="loan term in years")
+    loan_parser.add_argument("--down", type=float, default=0, help="down payment in dollars")
+    loan_parser.add_argument("--extra", type=float, default=0, help="extra monthly payment in dollars")
+    loan_parser.add_argument("--fees", type=float, default=0, help="fees paid up front in dollars (raise the APR)")
+    loan_parser.add_argument("--points", type=float, default=0, help="discount points in percent of the loan amount")
+    loan_parser.add_argument("--schedule", action="store_true", help="print the amortization schedule as CSV")
+    loan_parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    loan_parser.set_defaults(handler=run_loan)
+
+    batch_parser = subparsers.add_parser("batch", help="analyze a CSV of loans")
+    batch_parser.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+                              help="CSV with columns " + ", ".join(BATCH_COLUMNS + CHARGE_COLUMNS) + " (default: stdin)")
+    batch_parser.add_argument("--schedule", action="store_true", help="write schedules instead of summaries")
+    batch_parser.add_argument("--chunk-size", type=int, help=(
+        f"loans processed per chunk (default: {DEFAULT_CHUNK_SIZE}, or {SCHEDULE_CHUNK_SIZE} with --schedule)"
+    ))
+    batch_parser.set_defaults(handler=run_batch)
+
+    portfolio_parser = subparsers.add_parser("portfolio", help=(
+        "price a loan tape too large for memory in parallel and write its monthly cash flows"
+    ))
+    portfolio_parser.add_argument("input", help=(
+        "CSV or .npy tape with columns " + ", ".join(BATCH_COLUMNS + CHARGE_COLUMNS)
+    ))
+    portfolio_parser.add_argument("--run-dir", required=True, help=(
+        "directory for the per-loan summaries (summaries.npy) and the checkpoint; rerun to resume"
+    ))
+    portfolio_parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    portfolio_parser.add_argument("--chunk-size", type=int, default=PORTFOLIO_CHUNK_SIZE,
+                                  help=f"loans per worker task (default: {PORTFOLIO_CHUNK_SIZE})")
+    portfolio_parser.add_argument("--restart", action="store_true", help="discard a checkpoint of a different run")
+    portfolio_parser.set_defaults(handler=run_portfolio)
+
+    for subparser in (loan_parser, batch_parser, portfolio_parser):
+        subparser.add_argument("--rounding", choices=list(ROUNDING_MODES), help=(
+            "round every month to the cent (half_up, or half_even for banker's rounding) instead of using floats"
+        ))
+        subparser.add_argument("--output", "-o", type=argparse.FileType("w"), default=sys.stdout,
+                               help="output file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command line interface.
+
+    Args:
+        argv (list[str] | None): Arguments, defaulting to ``sys.argv[1:]``.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args, args.output)
+    except ValueError as error:
+        parser.error(str(error))
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); silence the final flush.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), args.output.fileno())
+    finally:
+        if args.output is not sys.stdout:
+            args.output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,3 +23,45 @@ LOAN_TERM_DEFAULT = 30
 EXTRA_PAYMENT_MIN = 0
 EXTRA_PAYMENT_MAX = 10000
 EXTRA_PAYMENT_DEFAULT = 0
+
+# Number of computed loan results kept by the shared schedule cache
+SCHEDULE_CACHE_SIZE = 512
+
+# Delay used to coalesce bursts of slider events into one recompute (ms)
+UPDATE_DEBOUNCE_MS = 16
+
+# Timing spans: calls kept per stage, the window of the event rates (s) and
+# how often the Performance dock refreshes (ms)
+PROFILER_CAPACITY = 2048
+PROFILER_RATE_WINDOW_S = 5.0
+PERFORMANCE_REFRESH_MS = 500
+
+# Adjustable-rate (ARM) defaults: rates and caps in percent
+ARM_FIXED_YEARS_DEFAULT = 5
+ARM_RESET_MONTHS_DEFAULT = 12
+ARM_ADJUSTED_RATE_DEFAULT = 7.0
+ARM_INITIAL_CAP_DEFAULT = 2.0
+ARM_PERIODIC_CAP_DEFAULT = 1.0
+ARM_LIFETIME_CAP_DEFAULT = 5.0
+ARM_FLOOR_DEFAULT = 0.0
+
+# Up-front finance charges: fees in dollars, points in percent of the loan
+FEES_DEFAULT = 0
+FEES_MAX = 50000
+POINTS_DEFAULT = 0
+POINTS_MAX = 5
+
+# Defaults of a newly added prepayment event
+PREPAYMENT_MONTH_DEFAULT = 12
+PREPAYMENT_AMOUNT_DEFAULT = 10000
+
+# Monte Carlo rate paths behind the fan chart of adjustable-rate scenarios
+SIMULATION_PATHS = 500
+SIMULATION_SEED = 0
+SIMULATION_REVERSION = 0.25
+SIMULATION_VOLATILITY = 1.0
+
+# Out-of-core loan tapes: loans priced per worker task and seconds between
+# checkpoints of a run
+PORTFOLIO_CHUNK_SIZE = 4096
+PORTFOLIO_CHECKPOINT_S = 5.0
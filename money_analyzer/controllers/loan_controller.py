@@ -1,38 +1,148 @@
+from ..models.amortization import AmortizationSchedule
 from ..models.loan import Loan
+from ..utils.apr import loan_apr
+from ..utils.financial_calculations import LoanBatch
+from ..utils.instrumentation import timed
+from .schedule_cache import shared_cache
 import numpy as np
 
+BATCH_CHUNK_SIZE = 1000
+
+def summary_key(loan):
+    return ('summary',) + loan.cache_key()
+
+def amortization_key(loan):
+    return ('amortization',) + loan.cache_key()
+
+def latest_schedule_key(loan):
+    # Loans differing only in prepayments share this key, so an edited event
+    # finds the schedule computed before the edit and reuses its prefix.
+    return ('latest_schedule',) + loan.base_key()
+
+def _running_total(values, start, carry):
+    # Same additions in the same order as np.cumsum over the whole array.
+    return np.cumsum(np.concatenate(([carry], values[start:])))[1:]
+
+@timed('controller.compute_batch_results')
+def compute_batch_results(loans, cache=None):
+    """
+    Compute summaries and amortization data for many loans at once.
+
+    The loans are priced as LoanBatch chunks instead of one by one and the
+    results are stored in the cache, so later controller lookups are hits.
+
+    Args:
+        loans (list[Loan]): Loans to compute.
+        cache (ScheduleCache | None): Cache to fill; defaults to the shared one.
+
+    Returns:
+        list[tuple]: ``(summary, amortization_data)`` per loan, shaped like
+        ``LoanController.get_loan_summary`` and ``get_amortization_data``.
+    """
+    cache = shared_cache if cache is None else cache
+    results = []
+    for start in range(0, len(loans), BATCH_CHUNK_SIZE):
+        chunk = loans[start:start + BATCH_CHUNK_SIZE]
+        batch = LoanBatch.from_loans(chunk)
+        summaries = batch.calculate_loan_summary()
+        aprs = batch.calculate_apr(summaries)
+        schedule = batch.generate_amortization_schedule()
+        principal_paid = np.cumsum(schedule.principal, axis=1)
+        interest_paid = np.cumsum(schedule.interest, axis=1)
+        principal_paid.flags.writeable = False
+        interest_paid.flags.writeable = False
+        months = np.arange(1, schedule.principal.shape[1] + 1)
+        months.flags.writeable = False
+
+        for i, loan in enumerate(chunk):
+            num_months = int(schedule.num_months[i])
+            summary = {
+                'loan_amount': float(summaries['loan_amount'][i]),
+                'interest_rate': float(summaries['interest_rate'][i]),
+                'apr': float(aprs[i]),
+                'monthly_payment': float(summaries['monthly_payment'][i]),
+                'max_monthly_payment': float(summaries['max_monthly_payment'][i]),
+                'total_interest': float(summaries['total_interest'][i]),
+                'total_payments': float(summaries['total_payments'][i]),
+                'loan_term': num_months / 12
+            }
+            amortization_data = {
+                'months': months[:num_months],
+                'principal_payments': principal_paid[i, :num_months],
+                'interest_payments': interest_paid[i, :num_months],
+                'schedule': AmortizationSchedule(
+                    months[:num_months], schedule.payment[i, :num_months], schedule.principal[i, :num_months],
+                    schedule.interest[i, :num_months], schedule.balance[i, :num_months],
+                ),
+            }
+            cache.put(summary_key(loan), summary)
+            cache.put(amortization_key(loan), amortization_data)
+            results.append((dict(summary), dict(amortization_data)))
+
+    return results
+
 class LoanController:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.loan = None
+        self.cache = shared_cache if cache is None else cache
 
-    def create_loan(self, principal, interest_rate, term, down_payment=0, extra_payment=0):
-        self.loan = Loan(principal, interest_rate, term, down_payment, extra_payment)
+    def create_loan(self, principal, interest_rate, term, down_payment=0, extra_payment=0, rate_schedule=None,
+                    prepayments=(), rounding=None, fees=0, points=0):
+        self.loan = Loan(
+            principal, interest_rate, term, down_payment, extra_payment, rate_schedule, prepayments, rounding, fees,
+            points,
+        )
 
+    @timed('controller.get_loan_summary')
     def get_loan_summary(self):
         if not self.loan:
             raise ValueError("Loan has not been created yet.")
 
-        monthly_payment, principal_payments, interest_payments = self.loan.calculate_loan_details()
-        total_interest = np.sum(interest_payments)
-        total_payments = np.sum(principal_payments) + total_interest
+        return dict(self.cache.get_or_compute(summary_key(self.loan), self._compute_loan_summary))
+
+    @timed('controller.get_amortization_data')
+    def get_amortization_data(self):
+        if not self.loan:
+            raise ValueError("Loan has not been created yet.")
+
+        return dict(self.cache.get_or_compute(amortization_key(self.loan), self._compute_amortization_data))
+
+    @timed('controller.compute_loan_summary')
+    def _compute_loan_summary(self):
+        summary = self.loan.calculate_loan_summary()
+        monthly_payment, total_interest, total_payments, num_months = summary
 
         return {
             'loan_amount': self.loan.principal - self.loan.down_payment,
+            'interest_rate': self.loan.interest_rate,
+            'apr': loan_apr(self.loan, summary),
             'monthly_payment': monthly_payment,
+            'max_monthly_payment': max(payment for _, payment in self.loan.calculate_payments()),
             'total_interest': total_interest,
             'total_payments': total_payments,
-            'loan_term': len(principal_payments) / 12
+            'loan_term': num_months / 12
         }
 
-    def get_amortization_data(self):
-        if not self.loan:
-            raise ValueError("Loan has not been created yet.")
+    @timed('controller.compute_amortization_data')
+    def _compute_amortization_data(self):
+        previous = self.cache.peek(latest_schedule_key(self.loan))
+        schedule = self.loan.calculate_amortization(None if previous is None else previous[:2])
+        reused = 0
+        if previous is not None:
+            reused = min(self.loan.shared_months(previous[0]), len(previous[1]), len(schedule))
 
-        monthly_payment, principal_payments, interest_payments = self.loan.calculate_loan_details()
-        months = np.arange(1, len(principal_payments) + 1)
+        data = {'months': np.arange(1, len(schedule) + 1)}
+        for column, name in (('principal', 'principal_payments'), ('interest', 'interest_payments')):
+            values = getattr(schedule, column)
+            if reused:
+                paid = previous[2][name]
+                data[name] = np.concatenate((paid[:reused], _running_total(values, reused, paid[reused - 1])))
+            else:
+                data[name] = np.cumsum(values)
+        for values in data.values():
+            values.flags.writeable = False
+        # The full columns, for views such as the amortization table
+        data['schedule'] = schedule
 
-        return {
-            'months': months,
-            'principal_payments': np.cumsum(principal_payments),
-            'interest_payments': np.cumsum(interest_payments)
-        }
+        self.cache.put(latest_schedule_key(self.loan), (self.loan, schedule, data))
+        return data
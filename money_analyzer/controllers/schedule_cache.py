@@ -0,0 +1,93 @@
+"""
+This module provides the memoizing cache shared by the loan controllers.
+Results are keyed by the loan parameters, so revisiting a slider position
+or asking for the same scenario twice becomes a dictionary lookup.
+"""
+
+import threading
+from collections import OrderedDict
+
+from ..config import SCHEDULE_CACHE_SIZE
+from ..utils.instrumentation import profiler
+
+
+class ScheduleCache:
+    """
+    Bounded, thread-safe LRU cache for computed loan results.
+
+    Values must be treated as immutable by callers since the same object is
+    handed out on every hit.
+    """
+
+    def __init__(self, maxsize=SCHEDULE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for ``key``, computing it on a miss.
+
+        Args:
+            key (Hashable): Parameter key of the value.
+            compute (Callable[[], object]): Produces the value on a miss.
+
+        Returns:
+            object: The cached or freshly computed value.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def peek(self, key, default=None):
+        """Return the value for ``key`` without counting a lookup or reordering."""
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``size``, ``maxsize`` and ``hit_rate``.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+shared_cache = ScheduleCache()
+profiler.add_cache('schedule_cache', shared_cache)
@@ -0,0 +1,235 @@
+"""
+This module provides the cent-exact amortization engine.
+Balances are whole cents held in int64 and every month's interest is rounded
+to the cent with an explicit rule, like a lender statement, so results never
+drift by float noise. Rounding makes each month depend on the rounded month
+before it, so there is no closed form: the NumPy kernel steps through the
+months once and handles every loan of a batch in each step.
+"""
+
+import numpy as np
+
+from .amortization import AmortizationSchedule, level_payment
+
+ROUNDING_MODES = {
+    'half_up': "Cents, half-up",
+    'half_even': "Cents, banker's",
+}
+# Annual rates are held as integer millionths of a percent, so a monthly
+# rate is exactly RATE_UNITS / RATE_DENOMINATOR. The kernel multiplies
+# balance cents by rate units in int64: 20% a year is 2e7 units, and
+# 2**63 / 2e7 is about 4.6e11 cents, so balances up to about $4.6 billion at
+# 20% a year. ``fits_int64`` checks the bound; plain ints have none.
+RATE_DENOMINATOR = 1200 * 10**6
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def check_rounding(rounding):
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode {rounding!r}; use one of {', '.join(ROUNDING_MODES)}")
+
+
+def to_cents(amount, rounding='half_up'):
+    """
+    Dollar amounts as int64 cents.
+
+    Float noise below a millionth of a cent is dropped first, so a typed
+    amount like ``0.125`` is rounded as the tie it is meant to be.
+    """
+    cents = np.round(np.asarray(amount, dtype=float) * 100, 6)
+    cents = np.floor(cents + 0.5) if rounding == 'half_up' else np.rint(cents)
+    return cents.astype(np.int64)
+
+
+def rate_units(monthly_rate):
+    """Monthly rates as integer numerators over ``RATE_DENOMINATOR``."""
+    return np.rint(np.asarray(monthly_rate, dtype=float) * RATE_DENOMINATOR).astype(np.int64)
+
+
+def round_divide(numerator, denominator, rounding='half_up'):
+    """
+    Integer ``numerator / denominator`` rounded to the nearest integer.
+
+    Works on NumPy int64 arrays and on plain ints; numerators must not be
+    negative. Ties go up for ``'half_up'`` and to the even neighbour for
+    ``'half_even'`` (banker's rounding).
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = remainder * 2
+    if rounding == 'half_up':
+        return quotient + (twice >= denominator)
+    return quotient + ((twice > denominator) | ((twice == denominator) & (quotient % 2 == 1)))
+
+
+def fits_int64(loan_cents, monthly_rate_units):
+    """Whether ``balance * rate`` of each loan stays inside int64 in the kernel."""
+    return np.asarray(loan_cents) <= INT64_MAX // np.maximum(monthly_rate_units, 1)
+
+
+def cent_totals(*columns):
+    """Exact dollar sums of schedule columns holding whole cents."""
+    return tuple(int(np.rint(np.asarray(column) * 100).sum()) / 100 for column in columns)
+
+
+def _cent_months(loan_cents, monthly_rate_units, num_payments, payment_cents, extra_cents, rounding):
+    """
+    Step the loans of ``amortize_cents`` month by month.
+
+    Yields:
+        tuple: ``(month, rows, paid, charged, balance)`` for every month
+        index, where ``rows`` are the loans still open at its start.
+    """
+    check_rounding(rounding)
+    if not np.all(fits_int64(loan_cents, monthly_rate_units)):
+        # Balances only fall, so the opening balance bounds every product
+        raise ValueError("Loan balance times rate exceeds the int64 range of the cent kernel")
+    due = payment_cents + extra_cents
+    rows = np.flatnonzero((loan_cents > 0) & (num_payments > 0))
+    opening = loan_cents[rows]
+    month = 0
+    while rows.size:
+        charged = round_divide(opening * monthly_rate_units[rows], RATE_DENOMINATOR, rounding)
+        owed = opening + charged
+        final = (owed <= due[rows]) | (num_payments[rows] <= month + 1)
+        paid = np.where(final, owed, due[rows])
+        opening = owed - paid
+        yield month, rows, paid, charged, opening
+        # Finished loans leave the working set, so late months touch few rows
+        rows, opening = rows[~final], opening[~final]
+        month += 1
+
+
+def _cent_arrays(*arrays):
+    return (np.atleast_1d(array).astype(np.int64).ravel() for array in np.broadcast_arrays(*arrays))
+
+
+def amortize_cents(loan_cents, monthly_rate_units, num_payments, payment_cents, extra_cents=0, rounding='half_up'):
+    """
+    Cent-exact schedules of many level-payment loans in one kernel.
+
+    Every month the interest is ``balance * rate`` rounded to the cent. The
+    month in which the payment covers the balance, or the last scheduled
+    month, is trued up to exactly the balance plus its interest, so every
+    schedule ends at zero. Arguments are int64 arrays that broadcast to one
+    entry per loan.
+
+    Args:
+        loan_cents: Amount borrowed, in cents.
+        monthly_rate_units: Monthly rate over ``RATE_DENOMINATOR``.
+        num_payments: Scheduled number of monthly payments.
+        payment_cents: Regular payment, in cents.
+        extra_cents: Additional principal paid every month, in cents.
+        rounding (str): ``'half_up'`` or ``'half_even'``.
+
+    Returns:
+        tuple: ``(num_months, payment, principal, interest, balance)`` where
+        the last four are int64 cents shaped ``(loans, max(num_months))`` and
+        zero after payoff.
+
+    Raises:
+        ValueError: If a loan is too large for int64 at its rate; see
+            ``fits_int64``.
+    """
+    arrays = tuple(_cent_arrays(loan_cents, monthly_rate_units, num_payments, payment_cents, extra_cents))
+    num_loans, width = len(arrays[0]), int(arrays[2].max(initial=0))
+    columns = [np.zeros((num_loans, width), dtype=np.int64) for _ in range(4)]
+    payment, principal, interest, balance = columns
+    num_months = np.zeros(num_loans, dtype=np.int64)
+    for month, rows, paid, charged, opening in _cent_months(*arrays, rounding):
+        payment[rows, month] = paid
+        interest[rows, month] = charged
+        principal[rows, month] = paid - charged
+        balance[rows, month] = opening
+        num_months[rows] = month + 1
+    return (num_months, *columns)
+
+
+def summarize_cents(loan_cents, monthly_rate_units, num_payments, payment_cents, extra_cents=0, rounding='half_up'):
+    """
+    Totals of ``amortize_cents`` without keeping the schedules.
+
+    Returns:
+        tuple: ``(num_months, total_interest, total_payments)`` per loan, the
+        totals in int64 cents.
+
+    Raises:
+        ValueError: If a loan is too large for int64 at its rate.
+    """
+    arrays = tuple(_cent_arrays(loan_cents, monthly_rate_units, num_payments, payment_cents, extra_cents))
+    num_months, total_interest, total_payments = (np.zeros(len(arrays[0]), dtype=np.int64) for _ in range(3))
+    for month, rows, paid, charged, _ in _cent_months(*arrays, rounding):
+        total_interest[rows] += charged
+        total_payments[rows] += paid
+        num_months[rows] = month + 1
+    return num_months, total_interest, total_payments
+
+
+def amortize_loan_cents(loan_amount, starts, monthly_rates, num_payments, extra_payment=0, prepayments=(),
+                        rounding='half_up'):
+    """
+    Cent-exact schedule of a single loan, including rate resets and prepayments.
+
+    Follows the rules of ``amortize_cents`` with plain ints, which is much
+    faster than the kernel for one loan. At a rate reset the payment is
+    recast and rounded to the cent; lump sums are paid with their month's
+    payment and recurring prepayments raise the payment from their month on.
+    Arguments follow ``payment_segments``.
+
+    Returns:
+        AmortizationSchedule: The schedule in dollars, from whole cents.
+    """
+    check_rounding(rounding)
+    num_payments = int(num_payments)
+    resets = {int(start): float(monthly_rate) for start, monthly_rate in zip(starts, monthly_rates)}
+    recurring, lump_sums = {}, {}
+    for event in prepayments:
+        cents = int(to_cents(event.amount, rounding))
+        if event.recurring:
+            recurring[event.month - 1] = recurring.get(event.month - 1, 0) + cents
+        else:
+            lump_sums[event.month] = lump_sums.get(event.month, 0) + cents
+
+    loan_cents = opening = int(to_cents(loan_amount, rounding))
+    extra = int(to_cents(extra_payment, rounding))
+    changes = set(resets) | set(recurring)
+    half_up = rounding == 'half_up'
+    units = due = payment = 0
+    # Plain ints with round_divide inlined; the loop only records the
+    # interest, payments that differ from the amount due and changes of it
+    interest, dues, exceptions = [], [], {}
+    for month in range(1, num_payments + 1 if opening > 0 else 1):
+        if month - 1 in changes:
+            if month - 1 in resets:
+                monthly_rate = resets[month - 1]
+                units = int(rate_units(monthly_rate))
+                payment = int(to_cents(level_payment(opening / 100, monthly_rate, num_payments - month + 1), rounding))
+            extra += recurring.get(month - 1, 0)
+            due = payment + extra
+            dues.append((month - 1, due))
+        quotient, remainder = divmod(opening * units, RATE_DENOMINATOR)
+        remainder *= 2
+        if remainder > RATE_DENOMINATOR or remainder == RATE_DENOMINATOR and (half_up or quotient & 1):
+            quotient += 1
+        owed = opening + quotient
+        paid = owed if owed <= due or month == num_payments else due
+        if lump_sums and month in lump_sums:
+            paid += min(lump_sums[month], owed - paid)
+        opening = owed - paid
+        interest.append(quotient)
+        if paid != due:
+            exceptions[month - 1] = paid
+        if not opening:
+            break
+
+    num_months = len(interest)
+    interest = np.array(interest, dtype=np.int64)
+    starts = [start for start, _ in dues] + [num_months]
+    payments = np.repeat(np.array([due for _, due in dues], dtype=np.int64), np.diff(starts))
+    if exceptions:
+        payments[list(exceptions)] = list(exceptions.values())
+    principal = payments - interest
+    # Integer sums are exact, so the balances follow from the principal paid
+    balances = loan_cents - np.cumsum(principal)
+    return AmortizationSchedule(
+        np.arange(1, num_months + 1), payments / 100, principal / 100, interest / 100, balances / 100
+    )
@@ -1,12 +1,68 @@
-import numpy as np
+from .amortization import amortize, amortize_segments, payment_segments, summarize_loan, summarize_segments
+from .fixed_point import amortize_loan_cents, cent_totals, check_rounding, to_cents
+from .prepayment import first_changed_month
 
 class Loan:
-    def __init__(self, principal, interest_rate, term, down_payment=0, extra_payment=0):
+    __slots__ = (
+        'principal', 'interest_rate', 'term', 'down_payment', 'extra_payment', 'rate_schedule', 'rounding', 'fees',
+        'points', 'prepayments',
+    )
+
+    def __init__(self, principal, interest_rate, term, down_payment=0, extra_payment=0, rate_schedule=None,
+                 prepayments=(), rounding=None, fees=0, points=0):
         self.principal = principal
         self.interest_rate = interest_rate
         self.term = term
         self.down_payment = down_payment
         self.extra_payment = extra_payment
+        # A RateSchedule makes this an adjustable-rate loan; interest_rate
+        # is then the rate of the fixed period.
+        self.rate_schedule = rate_schedule
+        # Prepayment events: lump sums and recurring extra payments.
+        self.prepayments = tuple(sorted(prepayments, key=lambda event: event.month))
+        # A rounding mode ('half_up' or 'half_even') selects the cent-exact
+        # engine; None keeps the float engine.
+        if rounding is not None:
+            check_rounding(rounding)
+        self.rounding = rounding
+        # Up-front finance charges: fees in dollars, points in percent of the
+        # loan amount. They leave the schedule alone and only raise the APR.
+        self.fees = fees
+        self.points = points
+
+    def cache_key(self):
+        rate_schedule = None if self.rate_schedule is None else self.rate_schedule.cache_key()
+        return (
+            self.principal, self.interest_rate, self.term, self.down_payment, self.extra_payment, rate_schedule,
+            self.rounding, self.fees, self.points, tuple(event.cache_key() for event in self.prepayments),
+        )
+
+    def base_key(self):
+        """``cache_key`` without the prepayment events."""
+        return self.cache_key()[:-1]
+
+    def is_level(self):
+        """Whether the loan is a plain level-payment loan with a closed form."""
+        return self.rate_schedule is None and not self.prepayments
+
+    def shared_months(self, other):
+        """
+        Number of leading months whose schedule rows equal those of ``other``.
+
+        Loans that differ only in their prepayment events share every month
+        before the earliest changed event.
+        """
+        if other is None or other.base_key() != self.base_key():
+            return 0
+        month = first_changed_month(self.prepayments, other.prepayments)
+        return self.term * 12 if month is None else month - 1
+
+    def rate_segments(self):
+        """``(starts, monthly_rates)`` of the loan's rate segments."""
+        if self.rate_schedule is None:
+            return [0], [self.interest_rate / 12 / 100]
+        starts, rates = self.rate_schedule.segments(self.interest_rate, self.term * 12)
+        return starts, rates / 12 / 100
 
     def calculate_monthly_payment(self):
         loan_amount = self.principal - self.down_payment
@@ -16,39 +72,96 @@ class Loan:
             return loan_amount / num_payments
         return (loan_amount * monthly_rate * (1 + monthly_rate) ** num_payments) / ((1 + monthly_rate) ** num_payments - 1)
 
+    def calculate_payments(self):
+        """
+        Monthly payment of every rate period the loan reaches.
+
+        Returns:
+            list[tuple]: ``(start_month, monthly_payment)`` pairs, where the
+            payment includes the extra payment and applies from
+            ``start_month + 1`` on.
+        """
+        if self.is_level():
+            payments = [(0, self.calculate_monthly_payment() + self.extra_payment)]
+        else:
+            starts, monthly_rates = self.rate_segments()
+            payments = []
+            for start, _, _, _, payment, extra, _ in payment_segments(
+                self.principal - self.down_payment, starts, monthly_rates, self.term * 12, self.extra_payment,
+                self.prepayments,
+            ):
+                if not payments or payments[-1][1] != payment + extra:
+                    payments.append((start, payment + extra))
+        if self.rounding is not None:
+            payments = [(start, self.round_to_cents(payment)) for start, payment in payments]
+        return payments
+
+    def round_to_cents(self, amount):
+        return int(to_cents(amount, self.rounding)) / 100
+
+    def calculate_amortization(self, previous=None):
+        """
+        Amortization schedule of the loan.
+
+        Args:
+            previous (tuple): Optional ``(loan, schedule)`` computed earlier,
+                e.g. before a prepayment event was edited; the rows this loan
+                shares with it are reused and only the rest is computed.
+                Cent-exact loans always compute the whole schedule.
+        """
+        if self.rounding is not None:
+            starts, monthly_rates = self.rate_segments()
+            return amortize_loan_cents(
+                self.principal - self.down_payment, starts, monthly_rates, self.term * 12, self.extra_payment,
+                self.prepayments, self.rounding,
+            )
+        if not self.is_level():
+            prefix, prefix_months = None, 0
+            if previous is not None:
+                prefix, prefix_months = previous[1], self.shared_months(previous[0])
+            starts, monthly_rates = self.rate_segments()
+            return amortize_segments(
+                self.principal - self.down_payment, starts, monthly_rates, self.term * 12, self.extra_payment,
+                self.prepayments, prefix, prefix_months,
+            )
+        return amortize(
+            self.principal - self.down_payment,
+            self.interest_rate / 12 / 100,
+            self.term * 12,
+            self.calculate_monthly_payment(),
+            self.extra_payment,
+        )
+
     def generate_amortization_schedule(self):
-        monthly_payment = self.calculate_monthly_payment()
-        remaining_balance = self.principal - self.down_payment
-        schedule = []
-
-        for month in range(1, self.term * 12 + 1):
-            interest_payment = remaining_balance * (self.interest_rate / 12 / 100)
-            principal_payment = monthly_payment - interest_payment + self.extra_payment
-            
-            if remaining_balance - principal_payment < 0:
-                principal_payment = remaining_balance
-                interest_payment = remaining_balance * (self.interest_rate / 12 / 100)
-                monthly_payment = principal_payment + interest_payment
-
-            remaining_balance -= principal_payment
-
-            schedule.append({
-                'month': month,
-                'payment': monthly_payment + self.extra_payment,
-                'principal': principal_payment,
-                'interest': interest_payment,
-                'balance': max(0, remaining_balance)
-            })
-
-            if remaining_balance <= 0:
-                break
-
-        return schedule
+        return self.calculate_amortization().records()
 
     def calculate_loan_details(self):
-        schedule = self.generate_amortization_schedule()
+        schedule = self.calculate_amortization()
+        monthly_payment = self.calculate_monthly_payment() + self.extra_payment
+
+        return monthly_payment, schedule.principal, schedule.interest
+
+    def calculate_loan_summary(self):
+        loan_amount = self.principal - self.down_payment
         monthly_payment = self.calculate_monthly_payment() + self.extra_payment
-        principal_payments = [payment['principal'] for payment in schedule]
-        interest_payments = [payment['interest'] for payment in schedule]
-        
-        return monthly_payment, np.array(principal_payments), np.array(interest_payments)
\ No newline at end of file
+        if self.rounding is not None:
+            # Rounded months have no closed form; sum the exact cents instead
+            schedule = self.calculate_amortization()
+            total_interest, total_payments = cent_totals(schedule.interest, schedule.payment)
+            monthly_payment = self.round_to_cents(self.calculate_monthly_payment()) + self.round_to_cents(self.extra_payment)
+            return monthly_payment, total_interest, total_payments, len(schedule)
+        if self.is_level():
+            summary = summarize_loan(loan_amount, self.interest_rate / 12 / 100, self.term * 12, monthly_payment)
+        else:
+            starts, monthly_rates = self.rate_segments()
+            summary = summarize_segments(
+                loan_amount, starts, monthly_rates, self.term * 12, self.extra_payment, self.prepayments
+            )
+        if summary is None:
+            # Irregular loans without a closed form go through the engine.
+            schedule = self.calculate_amortization()
+            total_interest = float(schedule.interest.sum())
+            summary = len(schedule), total_interest, float(schedule.principal.sum()) + total_interest
+        num_months, total_interest, total_payments = summary
+
+        return monthly_payment, total_interest, total_payments, num_months
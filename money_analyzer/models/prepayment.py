@@ -0,0 +1,60 @@
+"""
+This module describes prepayment events on a loan.
+A prepayment is either a one-off lump sum paid with a given month's payment
+or an extra amount paid every month from a given month on. Events never
+recast the regular payment, so they shorten the loan instead.
+"""
+
+
+class Prepayment:
+    """
+    One prepayment event.
+
+    ``month`` is the 1-based payment month. A lump sum is paid on top of
+    that month's payment; a recurring prepayment adds ``amount`` to every
+    payment from ``month`` on, in addition to ``Loan.extra_payment``.
+    """
+
+    __slots__ = ('month', 'amount', 'recurring')
+
+    def __init__(self, month, amount, recurring=False):
+        if month < 1:
+            raise ValueError("Prepayment months start at 1")
+        self.month = int(month)
+        self.amount = float(amount)
+        self.recurring = bool(recurring)
+
+    def __repr__(self):
+        kind = "recurring" if self.recurring else "lump sum"
+        return f"Prepayment(month={self.month}, amount={self.amount!r}, {kind})"
+
+    def __eq__(self, other):
+        return isinstance(other, Prepayment) and self.cache_key() == other.cache_key()
+
+    def __hash__(self):
+        return hash(self.cache_key())
+
+    def cache_key(self):
+        return (self.month, self.amount, self.recurring)
+
+    def to_dict(self):
+        return {'month': self.month, 'amount': self.amount, 'recurring': self.recurring}
+
+    @classmethod
+    def from_dict(cls, prepayment):
+        return cls(**prepayment)
+
+
+def first_changed_month(prepayments, other):
+    """
+    Earliest month whose payment differs between two sets of events.
+
+    Args:
+        prepayments (Iterable[Prepayment]): Events of one loan.
+        other (Iterable[Prepayment]): Events of an otherwise identical loan.
+
+    Returns:
+        int | None: 1-based month, or ``None`` when both sets are equal.
+    """
+    changed = set(prepayments) ^ set(other)
+    return min((event.month for event in changed), default=None)
@@ -0,0 +1,124 @@
+"""
+This module describes adjustable-rate (ARM) loans as rate schedules.
+A RateSchedule turns a loan's initial rate into piecewise-constant rate
+segments: a fixed period followed by periodic resets towards a fully indexed
+rate, limited by an initial cap, a periodic cap, a lifetime cap and a floor.
+The amortization engine prices each segment in closed form.
+"""
+
+import numpy as np
+
+
+class RateSchedule:
+    """
+    Rate path of an adjustable-rate loan.
+
+    Rates, caps and the floor are in percent like ``Loan.interest_rate``.
+    At reset ``k`` the rate moves towards ``rates[k]`` (the last entry is
+    reused for all later resets), by at most ``initial_cap`` at the first
+    reset and ``periodic_cap`` afterwards, and always stays between
+    ``floor`` and the initial rate plus ``lifetime_cap``. A cap of ``None``
+    means no limit; an empty ``rates`` keeps the initial rate throughout.
+    """
+
+    __slots__ = ('fixed_months', 'reset_months', 'rates', 'initial_cap', 'periodic_cap', 'lifetime_cap', 'floor')
+
+    def __init__(self, fixed_months, reset_months=12, rates=(), initial_cap=None, periodic_cap=None,
+                 lifetime_cap=None, floor=0.0):
+        if fixed_months <= 0 or reset_months <= 0:
+            raise ValueError("The fixed and reset periods must be at least one month")
+        self.fixed_months = int(fixed_months)
+        self.reset_months = int(reset_months)
+        self.rates = tuple(float(rate) for rate in rates)
+        self.initial_cap = initial_cap
+        self.periodic_cap = periodic_cap
+        self.lifetime_cap = lifetime_cap
+        self.floor = floor
+
+    def __repr__(self):
+        return f"RateSchedule({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def __eq__(self, other):
+        return isinstance(other, RateSchedule) and self.cache_key() == other.cache_key()
+
+    def __hash__(self):
+        return hash(self.cache_key())
+
+    def cache_key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        schedule = {name: getattr(self, name) for name in self.__slots__}
+        schedule['rates'] = list(self.rates)
+        return schedule
+
+    @classmethod
+    def from_dict(cls, schedule):
+        return cls(**schedule)
+
+    def reset_starts(self, num_payments):
+        """Payments made before each reset of a ``num_payments`` loan."""
+        return np.arange(self.fixed_months, int(num_payments), self.reset_months, dtype=np.int64)
+
+    def cap_rates(self, initial_rate, targets):
+        """
+        Apply the caps and the floor to indexed rates at successive resets.
+
+        Caps make every reset depend on the previous one, so the resets are
+        walked in order, but each step is vectorized over the leading axes;
+        a 2-D ``targets`` caps many simulated rate paths at once.
+
+        Args:
+            initial_rate (float): Annual rate of the fixed period, in percent.
+            targets (numpy.ndarray): Fully indexed rate at each reset, along
+                the last axis.
+
+        Returns:
+            numpy.ndarray: Rate charged after each reset, shaped like ``targets``.
+        """
+        targets = np.asarray(targets, dtype=float)
+        rates = np.empty_like(targets)
+        steps = self._walk(np.full(targets.shape[:-1], float(initial_rate)), np.moveaxis(targets, -1, 0),
+                           np.minimum, np.maximum)
+        for k, rate in enumerate(steps):
+            rates[..., k] = rate
+        return rates
+
+    def segments(self, initial_rate, num_payments):
+        """
+        Rate segments of a loan with ``num_payments`` scheduled payments.
+
+        Only the resets need to be walked; the cost does not depend on the
+        number of months.
+
+        Args:
+            initial_rate (float): Annual rate of the fixed period, in percent.
+            num_payments (int): Scheduled number of monthly payments.
+
+        Returns:
+            tuple: ``(starts, rates)`` arrays, where segment ``i`` begins
+            after ``starts[i]`` payments and charges ``rates[i]`` percent.
+        """
+        starts, rates = [0], [float(initial_rate)]
+        if self.rates:
+            resets = self.reset_starts(num_payments).tolist()
+            targets = [self.rates[min(k, len(self.rates) - 1)] for k in range(len(resets))]
+            # Plain floats: a single loan is faster without NumPy per step
+            starts += resets
+            rates += self._walk(float(initial_rate), targets, min, max)
+        return np.array(starts, dtype=np.int64), np.array(rates, dtype=float)
+
+    def _walk(self, initial_rate, targets, minimum, maximum):
+        # Shared by the scalar and vectorized paths through minimum/maximum
+        rate = initial_rate
+        ceiling = None if self.lifetime_cap is None else initial_rate + self.lifetime_cap
+        for k, target in enumerate(targets):
+            cap = self.initial_cap if k == 0 else self.periodic_cap
+            if cap is not None:
+                target = minimum(maximum(target, rate - cap), rate + cap)
+            if ceiling is not None:
+                target = minimum(target, ceiling)
+            if self.floor is not None:
+                target = maximum(target, self.floor)
+            rate = target
+            yield rate
@@ -0,0 +1,147 @@
+"""
+This module provides the headless scenario model behind the loan widget.
+Scenarios are plain ``__slots__`` objects holding loan parameters and the
+latest computed results, so thousands of them can be kept without any Qt
+widgets; the UI only binds an editor to the scenario currently shown.
+"""
+
+from ..config import (
+    DOWN_PAYMENT_DEFAULT, EXTRA_PAYMENT_DEFAULT, FEES_DEFAULT, INTEREST_RATE_DEFAULT,
+    INTEREST_RATE_SCALE_FACTOR, LOAN_AMOUNT_DEFAULT, LOAN_TERM_DEFAULT, POINTS_DEFAULT,
+)
+from ..utils.financial_calculations import LoanBatch
+from .loan import Loan
+
+PARAMETERS = ('principal', 'interest_rate', 'term', 'down_payment', 'extra_payment')
+
+
+class Scenario:
+    """
+    Parameters and computed results of one loan scenario.
+
+    Parameters follow ``Loan`` (dollars, annual rate in percent, years);
+    ``rate_schedule`` makes the scenario an adjustable-rate loan and
+    ``prepayments`` holds its ``Prepayment`` events and ``rounding`` selects
+    the cent-exact engine (``None`` keeps the float engine). ``fees`` and
+    ``points`` are paid up front and only affect the APR.
+    ``summary`` and ``amortization_data`` hold the latest results in the
+    shapes returned by ``LoanController`` and are ``None`` until computed.
+    """
+
+    __slots__ = PARAMETERS + ('rate_schedule', 'prepayments', 'rounding', 'fees', 'points', 'name', 'summary', 'amortization_data')
+
+    def __init__(self, principal=LOAN_AMOUNT_DEFAULT, interest_rate=INTEREST_RATE_DEFAULT / INTEREST_RATE_SCALE_FACTOR,
+                 term=LOAN_TERM_DEFAULT, down_payment=DOWN_PAYMENT_DEFAULT, extra_payment=EXTRA_PAYMENT_DEFAULT,
+                 name=None, rate_schedule=None, prepayments=(), rounding=None, fees=FEES_DEFAULT,
+                 points=POINTS_DEFAULT):
+        self.principal = principal
+        self.interest_rate = interest_rate
+        self.term = term
+        self.down_payment = down_payment
+        self.extra_payment = extra_payment
+        self.rate_schedule = rate_schedule
+        self.prepayments = tuple(prepayments)
+        self.rounding = rounding
+        self.fees = fees
+        self.points = points
+        self.name = name
+        self.summary = None
+        self.amortization_data = None
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, {', '.join(f'{name}={getattr(self, name)!r}' for name in PARAMETERS)})"
+
+    def set_parameters(self, principal, interest_rate, term, down_payment=0, extra_payment=0):
+        self.principal = principal
+        self.interest_rate = interest_rate
+        self.term = term
+        self.down_payment = down_payment
+        self.extra_payment = extra_payment
+
+    def parameters(self):
+        return tuple(getattr(self, name) for name in PARAMETERS)
+
+    def loan(self):
+        """A new ``Loan`` with the current parameters."""
+        return Loan(*self.parameters(), self.rate_schedule, self.prepayments, self.rounding, self.fees, self.points)
+
+    def set_results(self, summary, amortization_data):
+        self.summary = summary
+        self.amortization_data = amortization_data
+
+
+class ScenarioCollection:
+    """
+    Ordered collection of scenarios, independent of any widget.
+
+    Scenarios compare by identity, so two scenarios with the same parameters
+    are still distinct entries.
+    """
+
+    __slots__ = ('_scenarios',)
+
+    def __init__(self, scenarios=()):
+        self._scenarios = list(scenarios)
+
+    @classmethod
+    def from_batch(cls, batch):
+        """
+        Build one scenario per loan of a LoanBatch.
+
+        Args:
+            batch (LoanBatch): Loans to turn into scenarios.
+
+        Returns:
+            ScenarioCollection: Scenarios holding plain Python numbers.
+        """
+        columns = (getattr(batch, name).tolist() for name in PARAMETERS)
+        rate_schedules = batch.rate_schedules or [None] * len(batch)
+        prepayments = batch.prepayments or [()] * len(batch)
+        rounding = batch.rounding or [None] * len(batch)
+        charges = zip(batch.fees.tolist(), batch.points.tolist())
+        return cls(
+            Scenario(*parameters, rate_schedule=rate_schedule, prepayments=events, rounding=mode, fees=fees,
+                     points=points)
+            for parameters, rate_schedule, events, mode, (fees, points) in zip(
+                zip(*columns), rate_schedules, prepayments, rounding, charges
+            )
+        )
+
+    def __len__(self):
+        return len(self._scenarios)
+
+    def __iter__(self):
+        return iter(self._scenarios)
+
+    def __getitem__(self, index):
+        return self._scenarios[index]
+
+    def __contains__(self, scenario):
+        return scenario in self._scenarios
+
+    def index(self, scenario):
+        return self._scenarios.index(scenario)
+
+    def append(self, scenario):
+        self._scenarios.append(scenario)
+        return scenario
+
+    def pop(self, index=-1):
+        return self._scenarios.pop(index)
+
+    def clear(self):
+        self._scenarios.clear()
+
+    def loans(self):
+        return [scenario.loan() for scenario in self._scenarios]
+
+    def batch(self):
+        """All scenarios as one LoanBatch."""
+        return LoanBatch(
+            *([getattr(scenario, name) for scenario in self._scenarios] for name in PARAMETERS),
+            rate_schedules=[scenario.rate_schedule for scenario in self._scenarios],
+            prepayments=[scenario.prepayments for scenario in self._scenarios],
+            rounding=[scenario.rounding for scenario in self._scenarios],
+            fees=[scenario.fees for scenario in self._scenarios],
+            points=[scenario.points for scenario in self._scenarios],
+        )
@@ -0,0 +1,386 @@
+"""
+This module provides the on-disk scenario store used to save loan scenarios.
+A store is a directory holding a small JSON manifest and one raw binary file
+per column. Columns are opened with ``np.memmap``, so even very large stores
+load lazily and without copying, and new scenarios are appended in place.
+
+Layout of a version 5 store::
+
+    manifest.json         format, version, row counts, column dtypes, the
+                          rate schedules of adjustable-rate scenarios, the
+                          prepayment events of scenarios that have them, the
+                          rounding mode of cent-exact scenarios and the
+                          fees and points of scenarios that charge any
+    <parameter>.bin       one value per scenario (principal, interest_rate, ...)
+    schedule_offsets.bin  optional; scenario i spans offsets[i]:offsets[i + 1]
+    schedule_<column>.bin optional; flat payment/principal/interest/balance
+"""
+
+import json
+import os
+
+import numpy as np
+
+from ..config import INTEREST_RATE_SCALE_FACTOR
+from ..utils.financial_calculations import LoanBatch
+from .amortization import AmortizationSchedule
+from .prepayment import Prepayment
+from .rate_schedule import RateSchedule
+
+STORE_FORMAT = "money-analyzer-scenarios"
+STORE_VERSION = 5  # 2 added rate schedules, 3 prepayments, 4 rounding modes, 5 fees; older stores still open
+MANIFEST_NAME = "manifest.json"
+PARAMETER_DTYPES = {
+    'principal': '<f8',
+    'interest_rate': '<f8',
+    'term': '<i8',
+    'down_payment': '<f8',
+    'extra_payment': '<f8',
+}
+SCHEDULE_DTYPES = {
+    'payment': '<f8',
+    'principal': '<f8',
+    'interest': '<f8',
+    'balance': '<f8',
+}
+OFFSETS_DTYPE = '<i8'
+
+
+def is_scenario_store(path):
+    """Whether ``path`` is a store directory or the manifest inside one."""
+    path = os.fspath(path)
+    if os.path.basename(path) == MANIFEST_NAME:
+        return os.path.isfile(path)
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def read_json_scenarios(path):
+    """
+    Read a legacy JSON scenario file as a LoanBatch.
+
+    The JSON format stores raw slider values, so the interest rate is
+    converted back from slider units to percent.
+
+    Args:
+        path (str | os.PathLike): File written by the old "Save Scenarios".
+
+    Returns:
+        LoanBatch: One loan per saved scenario.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        scenarios_data = json.load(f)
+    return LoanBatch(
+        np.array([scenario["loan_amount"] for scenario in scenarios_data], dtype=float),
+        np.array([scenario["interest_rate"] for scenario in scenarios_data], dtype=float) / INTEREST_RATE_SCALE_FACTOR,
+        np.array([scenario["loan_term"] for scenario in scenarios_data], dtype=np.int64),
+        np.array([scenario["down_payment"] for scenario in scenarios_data], dtype=float),
+        np.array([scenario["extra_payment"] for scenario in scenarios_data], dtype=float),
+    )
+
+
+class ScenarioStore:
+    """
+    Versioned, append-only columnar store of loan scenarios.
+
+    Use ``create`` for a new store and ``open`` for an existing one. Column
+    arrays are read-only memory maps that are only opened when first used.
+    """
+
+    def __init__(self, path, manifest):
+        self.path = os.fspath(path)
+        self._manifest = manifest
+        self._columns = {}
+
+    @classmethod
+    def create(cls, path, with_schedules=False, overwrite=False):
+        """
+        Create an empty store at ``path``.
+
+        Args:
+            path (str | os.PathLike): Directory to create.
+            with_schedules (bool): Also store the amortization schedule of
+                every appended scenario.
+            overwrite (bool): Replace an existing store at ``path``.
+
+        Returns:
+            ScenarioStore: The new, empty store.
+
+        Raises:
+            FileExistsError: If ``path`` already holds a store and
+                ``overwrite`` is false.
+        """
+        path = os.fspath(path)
+        if is_scenario_store(path):
+            if not overwrite:
+                raise FileExistsError(f"A scenario store already exists at {path}")
+            os.remove(os.path.join(path, MANIFEST_NAME))
+            for name in os.listdir(path):
+                if name.endswith('.bin'):
+                    os.remove(os.path.join(path, name))
+        os.makedirs(path, exist_ok=True)
+
+        manifest = {
+            'format': STORE_FORMAT,
+            'version': STORE_VERSION,
+            'count': 0,
+            'parameters': dict(PARAMETER_DTYPES),
+            'schedules': None,
+            'rate_schedules': {},
+            'prepayments': {},
+            'rounding': {},
+            'fees': {},
+        }
+        if with_schedules:
+            manifest['schedules'] = {'rows': 0, 'offsets': OFFSETS_DTYPE, 'columns': dict(SCHEDULE_DTYPES)}
+        store = cls(path, manifest)
+        for name in store._file_names():
+            open(store._file(name), 'wb').close()
+        if with_schedules:
+            with open(store._file('schedule_offsets'), 'wb') as f:
+                f.write(np.zeros(1, dtype=OFFSETS_DTYPE).tobytes())
+        store._write_manifest()
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open an existing store.
+
+        Args:
+            path (str | os.PathLike): Store directory or its manifest file.
+
+        Returns:
+            ScenarioStore: The opened store.
+
+        Raises:
+            ValueError: If the manifest has an unknown format or a newer version.
+        """
+        path = os.fspath(path)
+        if os.path.basename(path) == MANIFEST_NAME:
+            path = os.path.dirname(path)
+        with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != STORE_FORMAT:
+            raise ValueError(f"{path} is not a scenario store")
+        if manifest.get('version', 0) > STORE_VERSION:
+            raise ValueError(
+                f"Scenario store version {manifest['version']} is newer than the supported version {STORE_VERSION}"
+            )
+        return cls(path, manifest)
+
+    @classmethod
+    def import_json(cls, json_path, path, with_schedules=False, overwrite=False):
+        """Create a store at ``path`` from a legacy JSON scenario file."""
+        store = cls.create(path, with_schedules=with_schedules, overwrite=overwrite)
+        store.append(read_json_scenarios(json_path))
+        return store
+
+    def __len__(self):
+        return self._manifest['count']
+
+    @property
+    def version(self):
+        return self._manifest['version']
+
+    @property
+    def has_schedules(self):
+        return self._manifest['schedules'] is not None
+
+    def parameter(self, name):
+        """Read-only memory map of one parameter column."""
+        if name not in self._manifest['parameters']:
+            raise KeyError(name)
+        return self._column(name, len(self))
+
+    def batch(self, start=0, stop=None):
+        """
+        Scenarios ``start:stop`` as a LoanBatch over the memory-mapped columns.
+
+        Returns:
+            LoanBatch: Batch whose arrays are views of the store, not copies.
+        """
+        columns = [self.parameter(name)[start:stop] for name in PARAMETER_DTYPES]
+        first = range(len(self))[start:stop].start
+        rate_schedules = [None] * len(columns[0])
+        for index, rate_schedule in self.rate_schedules().items():
+            if 0 <= index - first < len(rate_schedules):
+                rate_schedules[index - first] = rate_schedule
+        prepayments = [()] * len(columns[0])
+        for index, events in self.prepayments().items():
+            if 0 <= index - first < len(prepayments):
+                prepayments[index - first] = events
+        rounding = [None] * len(columns[0])
+        for index, mode in self.rounding().items():
+            if 0 <= index - first < len(rounding):
+                rounding[index - first] = mode
+        fees, points = np.zeros(len(columns[0])), np.zeros(len(columns[0]))
+        for index, (index_fees, index_points) in self.fees().items():
+            if 0 <= index - first < len(fees):
+                fees[index - first], points[index - first] = index_fees, index_points
+        return LoanBatch(
+            *columns, rate_schedules=rate_schedules, prepayments=prepayments, rounding=rounding, fees=fees, points=points
+        )
+
+    def rate_schedules(self):
+        """Rate schedules of the adjustable-rate scenarios, keyed by index."""
+        return {
+            int(index): RateSchedule.from_dict(rate_schedule)
+            for index, rate_schedule in self._manifest.get('rate_schedules', {}).items()
+        }
+
+    def prepayments(self):
+        """Prepayment events of the scenarios that have any, keyed by index."""
+        return {
+            int(index): tuple(Prepayment.from_dict(event) for event in events)
+            for index, events in self._manifest.get('prepayments', {}).items()
+        }
+
+    def rounding(self):
+        """Rounding modes of the cent-exact scenarios, keyed by index."""
+        return {int(index): mode for index, mode in self._manifest.get('rounding', {}).items()}
+
+    def fees(self):
+        """``(fees, points)`` of the scenarios that charge any, keyed by index."""
+        return {int(index): tuple(charges) for index, charges in self._manifest.get('fees', {}).items()}
+
+    def loan(self, index):
+        """Scenario ``index`` as a ``Loan``."""
+        if not -len(self) <= index < len(self):
+            raise IndexError("scenario index out of range")
+        index %= len(self)
+        # A one-row batch reads a single row of every memory-mapped column
+        return self.batch(index, index + 1)[0]
+
+    def schedule(self, index):
+        """
+        Stored amortization schedule of scenario ``index``.
+
+        Returns:
+            AmortizationSchedule: Columns are views into the memory maps.
+
+        Raises:
+            LookupError: If the store was created without schedules.
+            IndexError: If ``index`` is out of range; negative indices count
+                from the end.
+        """
+        if not self.has_schedules:
+            raise LookupError("This scenario store does not hold schedules")
+        if not -len(self) <= index < len(self):
+            raise IndexError("scenario index out of range")
+        index %= len(self)
+        offsets = self._column('schedule_offsets', len(self) + 1)
+        start, stop = int(offsets[index]), int(offsets[index + 1])
+        schedule_rows = self._manifest['schedules']['rows']
+        return AmortizationSchedule(
+            np.arange(1, stop - start + 1),
+            *(self._column('schedule_' + column, schedule_rows)[start:stop] for column in SCHEDULE_DTYPES)
+        )
+
+    def append(self, loans):
+        """
+        Append scenarios to the end of the store.
+
+        Column files are extended first and the manifest is replaced last, so
+        an interrupted append leaves the store at its previous length.
+
+        Args:
+            loans (LoanBatch | Iterable[Loan]): Scenarios to add.
+
+        Returns:
+            int: Number of scenarios in the store afterwards.
+        """
+        batch = loans if isinstance(loans, LoanBatch) else LoanBatch.from_loans(loans)
+        count = len(self)
+        schedules = self._manifest['schedules']
+        self._truncate_to_manifest()
+        self._columns.clear()
+
+        for name, dtype in self._manifest['parameters'].items():
+            self._append_bytes(name, np.asarray(getattr(batch, name), dtype=dtype))
+        if schedules is not None and len(batch):
+            schedule = batch.generate_amortization_schedule().ragged()
+            offsets = schedule['offsets'][1:] + schedules['rows']
+            self._append_bytes('schedule_offsets', offsets.astype(OFFSETS_DTYPE))
+            for column, dtype in schedules['columns'].items():
+                self._append_bytes('schedule_' + column, schedule[column].astype(dtype))
+            schedules['rows'] = int(offsets[-1])
+
+        rate_schedules = self._manifest.setdefault('rate_schedules', {})
+        for index in batch.variable_rate_indices():
+            # Few scenarios are adjustable-rate, so they live in the manifest
+            rate_schedules[str(count + index)] = batch.rate_schedules[index].to_dict()
+            self._manifest['version'] = STORE_VERSION
+        prepayments = self._manifest.setdefault('prepayments', {})
+        for index in batch.prepayment_indices():
+            prepayments[str(count + index)] = [event.to_dict() for event in batch.prepayments[index]]
+            self._manifest['version'] = STORE_VERSION
+        rounding = self._manifest.setdefault('rounding', {})
+        for index, mode in enumerate(batch.rounding or ()):
+            if mode is not None:
+                rounding[str(count + index)] = mode
+                self._manifest['version'] = STORE_VERSION
+        fees = self._manifest.setdefault('fees', {})
+        for index in np.flatnonzero((batch.fees != 0) | (batch.points != 0)):
+            fees[str(count + index)] = [float(batch.fees[index]), float(batch.points[index])]
+            self._manifest['version'] = STORE_VERSION
+        self._manifest['count'] = count + len(batch)
+        self._write_manifest()
+        return len(self)
+
+    def _file(self, name):
+        return os.path.join(self.path, name + '.bin')
+
+    def _file_names(self):
+        names = list(self._manifest['parameters'])
+        schedules = self._manifest['schedules']
+        if schedules is not None:
+            names.append('schedule_offsets')
+            names.extend('schedule_' + column for column in schedules['columns'])
+        return names
+
+    def _dtype(self, name):
+        if name in self._manifest['parameters']:
+            return np.dtype(self._manifest['parameters'][name])
+        if name == 'schedule_offsets':
+            return np.dtype(self._manifest['schedules']['offsets'])
+        return np.dtype(self._manifest['schedules']['columns'][name[len('schedule_'):]])
+
+    def _column(self, name, length):
+        column = self._columns.get(name)
+        if column is None:
+            dtype = self._dtype(name)
+            if length:
+                column = np.memmap(self._file(name), dtype=dtype, mode='r', shape=(length,))
+            else:
+                # mmap cannot map an empty file
+                column = np.empty(0, dtype=dtype)
+                column.flags.writeable = False
+            self._columns[name] = column
+        return column
+
+    def _rows(self, name):
+        if name in self._manifest['parameters']:
+            return len(self)
+        if name == 'schedule_offsets':
+            return len(self) + 1
+        return self._manifest['schedules']['rows']
+
+    def _truncate_to_manifest(self):
+        # Drops bytes left behind by an append that died before its manifest
+        for name in self._file_names():
+            size = self._rows(name) * self._dtype(name).itemsize
+            if os.path.getsize(self._file(name)) != size:
+                os.truncate(self._file(name), size)
+
+    def _append_bytes(self, name, values):
+        with open(self._file(name), 'ab') as f:
+            f.write(np.ascontiguousarray(values).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        temporary_path = manifest_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(temporary_path, manifest_path)
@@ -1,6 +1,19 @@
-from PyQt6.QtWidgets import QMainWindow, QMenuBar, QMenu, QDockWidget
+from PyQt6.QtWidgets import QMainWindow, QMenuBar, QMenu
 from PyQt6.QtCore import Qt
-from .widgets.loan_widget import LoanWidget
+from .widgets.lazy_dock import LazyDockWidget
+
+def create_loan_widget():
+    # Imported lazily: the loan widget pulls in numpy and matplotlib.
+    from .widgets.loan_widget import LoanWidget
+    return LoanWidget()
+
+def create_sensitivity_widget(base_provider):
+    from .widgets.sensitivity_widget import SensitivityWidget
+    return SensitivityWidget(base_provider)
+
+def create_performance_widget():
+    from .widgets.performance_widget import PerformanceWidget
+    return PerformanceWidget()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -11,6 +24,10 @@ class MainWindow(QMainWindow):
         self.setup_menu_bar()
         self.setup_dock_widgets()
 
+    @property
+    def loan_widget(self):
+        return self.loan_dock.content()
+
     def setup_menu_bar(self):
         menu_bar = QMenuBar(self)
         self.setMenuBar(menu_bar)
@@ -22,14 +39,35 @@ class MainWindow(QMainWindow):
         tools_menu = QMenu("Tools", self)
         menu_bar.addMenu(tools_menu)
         tools_menu.addAction("Loan Analyzer", self.show_loan_analyzer)
+        tools_menu.addAction("Sensitivity Analysis", self.show_sensitivity_analysis)
+        tools_menu.addAction("Performance", self.show_performance)
         # Add more tools here as you implement them
 
     def setup_dock_widgets(self):
-        self.loan_widget = LoanWidget()
-        self.loan_dock = QDockWidget("Loan Analyzer", self)
-        self.loan_dock.setWidget(self.loan_widget)
+        self.loan_dock = LazyDockWidget("Loan Analyzer", create_loan_widget, self)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.loan_dock)
+        # Hidden until requested, so it is not built at startup
+        self.sensitivity_dock = LazyDockWidget(
+            "Sensitivity Analysis", lambda: create_sensitivity_widget(self.current_scenario), self
+        )
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.sensitivity_dock)
+        self.sensitivity_dock.hide()
+        # Timings are only recorded once this dock has been opened
+        self.performance_dock = LazyDockWidget("Performance", create_performance_widget, self)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.performance_dock)
+        self.performance_dock.hide()
 
     def show_loan_analyzer(self):
         self.loan_dock.show()
-        self.loan_dock.raise_()
\ No newline at end of file
+        self.loan_dock.raise_()
+
+    def show_sensitivity_analysis(self):
+        self.sensitivity_dock.show()
+        self.sensitivity_dock.raise_()
+
+    def show_performance(self):
+        self.performance_dock.show()
+        self.performance_dock.raise_()
+
+    def current_scenario(self):
+        return self.loan_widget.current_scenario()
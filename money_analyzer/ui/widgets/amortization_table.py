@@ -0,0 +1,210 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSpinBox, QTableView, QHeaderView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+import numpy as np
+
+class AmortizationTableModel(QAbstractTableModel):
+    """
+    Table model reading straight from columnar schedule arrays.
+
+    Rows are never materialized: the view asks for the cells it paints and
+    only those are formatted. Filtering and sorting produce an index array
+    into the columns, so both stay cheap with hundreds of thousands of rows.
+    """
+
+    COLUMNS = (
+        ('scenario', "Scenario"),
+        ('month', "Month"),
+        ('payment', "Payment"),
+        ('principal', "Principal"),
+        ('interest', "Interest"),
+        ('balance', "Balance"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = {name: np.empty(0) for name, _ in self.COLUMNS}
+        self._labels = []
+        self._mask = None
+        self._rows = np.empty(0, dtype=np.intp)
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_columns(self, columns, labels):
+        """
+        Show new schedule data.
+
+        Args:
+            columns (dict): Equal-length arrays for every name in ``COLUMNS``;
+                ``scenario`` holds indices into ``labels``.
+            labels (list[str]): Display name of each scenario.
+        """
+        self.beginResetModel()
+        self._columns = {name: np.asarray(columns[name]) for name, _ in self.COLUMNS}
+        self._labels = list(labels)
+        self._mask = None
+        self._update_rows()
+        self.endResetModel()
+
+    def set_filter(self, scenarios=None, year=None):
+        """
+        Restrict the visible rows.
+
+        Args:
+            scenarios (Iterable[int] | None): Scenario indices to keep, or
+                ``None`` for all scenarios.
+            year (int | None): Loan year (1-based) to keep, or ``None``.
+        """
+        mask = None
+        if scenarios is not None:
+            mask = np.isin(self._columns['scenario'], np.fromiter(scenarios, dtype=np.int64))
+        if year is not None:
+            in_year = (self._columns['month'] - 1) // 12 == year - 1
+            mask = in_year if mask is None else mask & in_year
+        self.beginResetModel()
+        self._mask = mask
+        self._update_rows()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._update_rows()
+        self.endResetModel()
+
+    def row_indices(self):
+        """Positions in the schedule columns of the displayed rows, in order."""
+        return self._rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.COLUMNS[index.column()][0]
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._columns[name][self._rows[index.row()]]
+            if name == 'scenario':
+                return self._labels[value]
+            if name == 'month':
+                return str(value)
+            return f"${value:,.2f}"
+        if role == Qt.ItemDataRole.TextAlignmentRole and name != 'scenario':
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section][1]
+        return str(section + 1)
+
+    def _update_rows(self):
+        size = len(self._columns['month'])
+        rows = np.arange(size) if self._mask is None else np.flatnonzero(self._mask)
+        if self._sort_column is not None and 0 <= self._sort_column < len(self.COLUMNS):
+            keys = self._columns[self.COLUMNS[self._sort_column][0]][rows]
+            if self._sort_order == Qt.SortOrder.DescendingOrder:
+                # Negated keys keep ties in schedule order, unlike reversing
+                keys = -keys
+            rows = rows[np.argsort(keys, kind='stable')]
+        self._rows = rows
+
+class AmortizationTable(QWidget):
+    """
+    Amortization table of the current scenario or of all scenarios stacked.
+
+    Rows come from the schedules already computed with each scenario's
+    results, so the table shows exactly what the summary and graph show and
+    never prices a loan itself. It only rebuilds while visible and only for
+    the scenarios in scope; changing the year only refilters.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scenarios = ()
+        self.current_index = 0
+        self._sources = None
+        self._stale = False
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(["Current Scenario", "All Scenarios"])
+        self.scope_combo.currentIndexChanged.connect(self.refresh)
+        self.year_spin = QSpinBox()
+        self.year_spin.setRange(0, 100)
+        self.year_spin.setSpecialValueText("All")
+        self.year_spin.valueChanged.connect(self.apply_filter)
+        controls.addWidget(QLabel("Show:"))
+        controls.addWidget(self.scope_combo)
+        controls.addWidget(QLabel("Year:"))
+        controls.addWidget(self.year_spin)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.model = AmortizationTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.table_view.setAlternatingRowColors(True)
+        # Fixed row heights keep scrolling independent of the row count
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table_view)
+
+    def set_scenarios(self, scenarios, current_index=0):
+        self.scenarios = scenarios
+        self.current_index = current_index
+        self.refresh()
+
+    def set_current_index(self, index):
+        self.current_index = index
+        if self.scope_combo.currentIndex() == 0:
+            self.refresh()
+
+    def refresh(self):
+        if not self.isVisible():
+            self._stale = True
+            return
+        self._stale = False
+        if self.scope_combo.currentIndex() == 0:
+            indices = [self.current_index] if 0 <= self.current_index < len(self.scenarios) else []
+        else:
+            indices = range(len(self.scenarios))
+        sources = [
+            (index, self.scenarios[index].name, self.scenarios[index].amortization_data['schedule'])
+            for index in indices
+            if self.scenarios[index].amortization_data is not None
+        ]
+        # Schedules are immutable and replaced on every change, so identity is enough
+        if sources != self._sources:
+            self._sources = sources
+            schedules = [schedule for _, _, schedule in sources]
+            columns = {
+                name: np.concatenate([getattr(schedule, name) for schedule in schedules]) if schedules else np.empty(0)
+                for name, _ in self.model.COLUMNS if name != 'scenario'
+            }
+            columns['scenario'] = np.repeat(
+                np.array([index for index, _, _ in sources], dtype=np.int64), [len(schedule) for schedule in schedules]
+            )
+            self.model.set_columns(columns, [scenario.name for scenario in self.scenarios])
+        self.apply_filter()
+
+    def apply_filter(self):
+        self.model.set_filter(year=self.year_spin.value() or None)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
@@ -0,0 +1,50 @@
+from PyQt6.QtWidgets import QDockWidget, QLabel
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+
+class _Placeholder(QLabel):
+    painted = pyqtSignal()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        self.painted.emit()
+
+class LazyDockWidget(QDockWidget):
+    """
+    Dock widget that builds its content the first time it is shown.
+
+    A lightweight placeholder is painted first, then ``factory`` is called on
+    the next event loop pass to create the real widget. Heavy modules
+    imported by the factory are therefore loaded after the first frame
+    instead of at startup.
+    """
+
+    materialized = pyqtSignal(object)
+
+    def __init__(self, title, factory, parent=None):
+        super().__init__(title, parent)
+        self._factory = factory
+        self._content = None
+        placeholder = _Placeholder("Loading...")
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        placeholder.painted.connect(self._on_placeholder_painted)
+        self.setWidget(placeholder)
+
+    def is_materialized(self):
+        return self._content is not None
+
+    def content(self):
+        """
+        Return the real widget, building it now if necessary.
+
+        Returns:
+            QWidget: The widget produced by the factory.
+        """
+        if self._content is None:
+            self._content = self._factory()
+            self.setWidget(self._content)
+            self.materialized.emit(self._content)
+        return self._content
+
+    def _on_placeholder_painted(self):
+        if self._content is None:
+            QTimer.singleShot(0, self.content)
@@ -1,14 +1,26 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSlider, QLabel, QLineEdit, QHBoxLayout
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSlider, QLabel, QLineEdit, QHBoxLayout, QComboBox, QPushButton, QCheckBox, QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView
 from PyQt6.QtCore import Qt, pyqtSignal
-from ...controllers.loan_controller import LoanController
 from ...config import *  # Import all constants from config.py
+from ...models.fixed_point import ROUNDING_MODES
+from ...models.prepayment import Prepayment
+from ...models.rate_schedule import RateSchedule
+from ...utils.instrumentation import timed
+from ...utils.goal_seek import break_even_rate, max_loan_amount, required_extra_payment
+import math
 
 class LoanScenario(QWidget):
-    loan_updated = pyqtSignal()
+    """
+    Slider editor for one headless Scenario at a time.
+
+    A single editor is rebound to whichever scenario is shown, so scenarios
+    that are not visible cost no widgets.
+    """
+
+    loan_updated = pyqtSignal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.controller = LoanController()
+        self.scenario = None
         self.setup_ui()
         self.connect_signals()
         self._updating = False
@@ -37,6 +49,240 @@ class LoanScenario(QWidget):
         layout.addWidget(self.interest_rate_container)
         layout.addWidget(self.loan_term_container)
         layout.addWidget(self.extra_payment_container)
+        layout.addWidget(self.create_rate_controls())
+        layout.addWidget(self.create_prepayment_controls())
+        layout.addWidget(self.create_fee_controls())
+        layout.addWidget(self.create_rounding_controls())
+        layout.addWidget(self.create_solver_controls())
+
+    def create_rate_controls(self):
+        # Adjustable rate: after the fixed period the rate resets towards the
+        # adjusted rate, limited by the caps and the floor
+        container = QWidget()
+        layout = QHBoxLayout(container)
+        self.arm_checkbox = QCheckBox("Adjustable Rate")
+        self.arm_fixed_years = QSpinBox()
+        self.arm_fixed_years.setRange(1, LOAN_TERM_MAX)
+        self.arm_fixed_years.setValue(ARM_FIXED_YEARS_DEFAULT)
+        self.arm_reset_combo = QComboBox()
+        for months in (1, 6, 12):
+            self.arm_reset_combo.addItem(f"{months} mo", months)
+        self.arm_reset_combo.setCurrentIndex(self.arm_reset_combo.findData(ARM_RESET_MONTHS_DEFAULT))
+
+        layout.addWidget(self.arm_checkbox)
+        layout.addWidget(QLabel("Fixed (years):"))
+        layout.addWidget(self.arm_fixed_years)
+        layout.addWidget(QLabel("Reset every:"))
+        layout.addWidget(self.arm_reset_combo)
+        self.arm_rate_inputs = {}
+        for name, label, default in (
+            ('rate', "Adjusted Rate (%):", ARM_ADJUSTED_RATE_DEFAULT),
+            ('initial_cap', "Initial Cap:", ARM_INITIAL_CAP_DEFAULT),
+            ('periodic_cap', "Periodic Cap:", ARM_PERIODIC_CAP_DEFAULT),
+            ('lifetime_cap', "Lifetime Cap:", ARM_LIFETIME_CAP_DEFAULT),
+            ('floor', "Floor (%):", ARM_FLOOR_DEFAULT),
+        ):
+            spin_box = QDoubleSpinBox()
+            spin_box.setRange(0, INTEREST_RATE_MAX / INTEREST_RATE_SCALE_FACTOR)
+            spin_box.setDecimals(3)
+            spin_box.setSingleStep(0.125)
+            spin_box.setValue(default)
+            self.arm_rate_inputs[name] = spin_box
+            layout.addWidget(QLabel(label))
+            layout.addWidget(spin_box)
+        layout.addStretch()
+        self.set_rate_controls_enabled(False)
+        return container
+
+    def set_rate_controls_enabled(self, enabled):
+        self.arm_fixed_years.setEnabled(enabled)
+        self.arm_reset_combo.setEnabled(enabled)
+        for spin_box in self.arm_rate_inputs.values():
+            spin_box.setEnabled(enabled)
+
+    def rate_schedule(self):
+        if not self.arm_checkbox.isChecked():
+            return None
+        inputs = {name: spin_box.value() for name, spin_box in self.arm_rate_inputs.items()}
+        return RateSchedule(
+            self.arm_fixed_years.value() * 12,
+            self.arm_reset_combo.currentData(),
+            (inputs['rate'],),
+            initial_cap=inputs['initial_cap'],
+            periodic_cap=inputs['periodic_cap'],
+            lifetime_cap=inputs['lifetime_cap'],
+            floor=inputs['floor'],
+        )
+
+    def set_rate_schedule(self, rate_schedule):
+        # Signals are blocked like in set_parameters
+        widgets = [self.arm_checkbox, self.arm_fixed_years, self.arm_reset_combo, *self.arm_rate_inputs.values()]
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.arm_checkbox.setChecked(rate_schedule is not None)
+        if rate_schedule is not None:
+            self.arm_fixed_years.setValue(rate_schedule.fixed_months // 12)
+            index = self.arm_reset_combo.findData(rate_schedule.reset_months)
+            if index < 0:
+                self.arm_reset_combo.addItem(f"{rate_schedule.reset_months} mo", rate_schedule.reset_months)
+                index = self.arm_reset_combo.count() - 1
+            self.arm_reset_combo.setCurrentIndex(index)
+            values = {
+                'rate': rate_schedule.rates[-1] if rate_schedule.rates else 0.0,
+                'initial_cap': rate_schedule.initial_cap,
+                'periodic_cap': rate_schedule.periodic_cap,
+                'lifetime_cap': rate_schedule.lifetime_cap,
+                'floor': rate_schedule.floor,
+            }
+            for name, value in values.items():
+                if value is not None:
+                    self.arm_rate_inputs[name].setValue(value)
+        for widget in widgets:
+            widget.blockSignals(False)
+        self.set_rate_controls_enabled(rate_schedule is not None)
+
+    def create_prepayment_controls(self):
+        # One row per prepayment event; editing a late event only recomputes
+        # the schedule from that month on
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        header = QHBoxLayout()
+        self.add_prepayment_button = QPushButton("Add")
+        self.remove_prepayment_button = QPushButton("Remove")
+        header.addWidget(QLabel("Prepayments:"))
+        header.addWidget(self.add_prepayment_button)
+        header.addWidget(self.remove_prepayment_button)
+        header.addStretch()
+
+        self.prepayment_table = QTableWidget(0, 3)
+        self.prepayment_table.setHorizontalHeaderLabels(["Month", "Amount ($)", "Every Month From Then"])
+        self.prepayment_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.prepayment_table.verticalHeader().setVisible(False)
+        self.prepayment_table.setMaximumHeight(120)
+
+        layout.addLayout(header)
+        layout.addWidget(self.prepayment_table)
+        return container
+
+    def add_prepayment_row(self, prepayment):
+        row = self.prepayment_table.rowCount()
+        self.prepayment_table.insertRow(row)
+        self.prepayment_table.setItem(row, 0, QTableWidgetItem(str(prepayment.month)))
+        self.prepayment_table.setItem(row, 1, QTableWidgetItem(f"{prepayment.amount:g}"))
+        recurring = QTableWidgetItem()
+        recurring.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+        recurring.setCheckState(Qt.CheckState.Checked if prepayment.recurring else Qt.CheckState.Unchecked)
+        self.prepayment_table.setItem(row, 2, recurring)
+
+    def add_prepayment(self):
+        self.prepayment_table.blockSignals(True)
+        self.add_prepayment_row(Prepayment(PREPAYMENT_MONTH_DEFAULT, PREPAYMENT_AMOUNT_DEFAULT))
+        self.prepayment_table.blockSignals(False)
+        self.update_loan(True)
+
+    def remove_prepayment(self):
+        rows = sorted({index.row() for index in self.prepayment_table.selectedIndexes()}, reverse=True)
+        if not rows and self.prepayment_table.rowCount():
+            rows = [self.prepayment_table.rowCount() - 1]
+        for row in rows:
+            self.prepayment_table.removeRow(row)
+        self.update_loan(True)
+
+    def prepayments(self):
+        # Rows that do not parse yet (e.g. while typing) are left out
+        prepayments = []
+        for row in range(self.prepayment_table.rowCount()):
+            month, amount, recurring = (self.prepayment_table.item(row, column) for column in range(3))
+            try:
+                prepayment = Prepayment(int(month.text()), float(amount.text().replace(',', '')),
+                                        recurring.checkState() == Qt.CheckState.Checked)
+            except (AttributeError, ValueError):
+                continue
+            if prepayment.amount > 0:
+                prepayments.append(prepayment)
+        return tuple(prepayments)
+
+    def set_prepayments(self, prepayments):
+        self.prepayment_table.blockSignals(True)
+        self.prepayment_table.setRowCount(0)
+        for prepayment in prepayments:
+            self.add_prepayment_row(prepayment)
+        self.prepayment_table.blockSignals(False)
+
+    def create_fee_controls(self):
+        # Charges paid up front; they leave the schedule alone and raise the APR
+        container = QWidget()
+        layout = QHBoxLayout(container)
+        self.fees_input = QDoubleSpinBox()
+        self.fees_input.setRange(0, FEES_MAX)
+        self.fees_input.setDecimals(2)
+        self.fees_input.setSingleStep(100)
+        self.fees_input.setValue(FEES_DEFAULT)
+        self.points_input = QDoubleSpinBox()
+        self.points_input.setRange(0, POINTS_MAX)
+        self.points_input.setDecimals(3)
+        self.points_input.setSingleStep(0.125)
+        self.points_input.setValue(POINTS_DEFAULT)
+        layout.addWidget(QLabel("Fees ($):"))
+        layout.addWidget(self.fees_input)
+        layout.addWidget(QLabel("Points (%):"))
+        layout.addWidget(self.points_input)
+        layout.addStretch()
+        return container
+
+    def set_fees(self, fees, points):
+        for spin_box, value in ((self.fees_input, fees), (self.points_input, points)):
+            spin_box.blockSignals(True)
+            spin_box.setValue(value)
+            spin_box.blockSignals(False)
+
+    def create_rounding_controls(self):
+        # Cent-exact schedules round every month's interest like a lender does
+        container = QWidget()
+        layout = QHBoxLayout(container)
+        self.rounding_combo = QComboBox()
+        self.rounding_combo.addItem("Float (default)", None)
+        for mode, label in ROUNDING_MODES.items():
+            self.rounding_combo.addItem(label, mode)
+        layout.addWidget(QLabel("Rounding:"))
+        layout.addWidget(self.rounding_combo)
+        layout.addStretch()
+        return container
+
+    def set_rounding(self, rounding):
+        self.rounding_combo.blockSignals(True)
+        self.rounding_combo.setCurrentIndex(max(self.rounding_combo.findData(rounding), 0))
+        self.rounding_combo.blockSignals(False)
+
+    def update_solve_enabled(self):
+        # Goal seek assumes a single rate and no prepayments for the whole term
+        scenario = self.scenario
+        self.solve_button.setEnabled(scenario is not None and scenario.rate_schedule is None and not scenario.prepayments)
+
+    def create_solver_controls(self):
+        # "Solve for" mode: set one slider from a target instead of by hand
+        container = QWidget()
+        layout = QHBoxLayout(container)
+        self.solve_combo = QComboBox()
+        self.solve_combo.addItems([
+            "Extra payment to pay off in (years)",
+            "Max loan amount for payment cap ($)",
+            "Break-even interest rate for payment cap ($)",
+        ])
+        self.solve_target_input = QLineEdit()
+        self.solve_target_input.setFixedWidth(80)
+        self.solve_button = QPushButton("Solve")
+        self.solve_status_label = QLabel("")
+        self.solve_target_input.returnPressed.connect(self.solve)
+        self.solve_button.clicked.connect(self.solve)
+
+        layout.addWidget(QLabel("Solve for:"))
+        layout.addWidget(self.solve_combo)
+        layout.addWidget(self.solve_target_input)
+        layout.addWidget(self.solve_button)
+        layout.addWidget(self.solve_status_label)
+        layout.addStretch()
+        return container
 
     def create_slider_with_input(self, min_value, max_value, default_value, label, scale_factor=1, name=None):
         container = QWidget()
@@ -58,15 +304,57 @@ class LoanScenario(QWidget):
         
         return container, slider, input_field
 
+    def bind(self, scenario):
+        # Shows ``scenario`` in the sliders without writing back to it
+        self.scenario = scenario
+        self.setEnabled(scenario is not None)
+        self.solve_status_label.setText("")
+        if scenario is not None:
+            self.set_parameters(
+                round(scenario.principal),
+                round(scenario.down_payment),
+                round(scenario.interest_rate * INTEREST_RATE_SCALE_FACTOR),
+                scenario.term,
+                round(scenario.extra_payment),
+            )
+            self.set_rate_schedule(scenario.rate_schedule)
+            self.set_prepayments(scenario.prepayments)
+            self.set_fees(scenario.fees, scenario.points)
+            self.set_rounding(scenario.rounding)
+            self.update_solve_enabled()
+
+    def set_parameters(self, loan_amount, down_payment, interest_rate, loan_term, extra_payment):
+        # Values are in slider units; signals are blocked so nothing recomputes
+        sliders = (
+            self.loan_amount_slider, self.down_payment_slider, self.interest_rate_slider,
+            self.loan_term_slider, self.extra_payment_slider,
+        )
+        for slider, value in zip(sliders, (loan_amount, down_payment, interest_rate, loan_term, extra_payment)):
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+
     def connect_signals(self):
         self.loan_amount_slider.valueChanged.connect(lambda: self.update_loan(True))
         self.down_payment_slider.valueChanged.connect(lambda: self.update_loan(True))
         self.interest_rate_slider.valueChanged.connect(lambda: self.update_loan(True))
         self.loan_term_slider.valueChanged.connect(lambda: self.update_loan(True))
         self.extra_payment_slider.valueChanged.connect(lambda: self.update_loan(True))
+        self.arm_checkbox.toggled.connect(lambda: self.update_loan(True))
+        self.arm_fixed_years.valueChanged.connect(lambda: self.update_loan(True))
+        self.arm_reset_combo.currentIndexChanged.connect(lambda: self.update_loan(True))
+        for spin_box in self.arm_rate_inputs.values():
+            spin_box.valueChanged.connect(lambda: self.update_loan(True))
+        self.add_prepayment_button.clicked.connect(self.add_prepayment)
+        self.remove_prepayment_button.clicked.connect(self.remove_prepayment)
+        self.prepayment_table.itemChanged.connect(lambda: self.update_loan(True))
+        self.fees_input.valueChanged.connect(lambda: self.update_loan(True))
+        self.points_input.valueChanged.connect(lambda: self.update_loan(True))
+        self.rounding_combo.currentIndexChanged.connect(lambda: self.update_loan(True))
 
+    @timed('loan_scenario.update_loan')
     def update_loan(self, emit_signal=True):
-        if self._updating:
+        if self._updating or self.scenario is None:
             return
         self._updating = True
 
@@ -76,14 +364,54 @@ class LoanScenario(QWidget):
         loan_term = self.loan_term_slider.value()
         extra_payment = self.extra_payment_slider.value()
 
-        self.controller.create_loan(loan_amount, interest_rate, loan_term, down_payment, extra_payment)
-        
+        self.scenario.set_parameters(loan_amount, interest_rate, loan_term, down_payment, extra_payment)
+        self.scenario.rate_schedule = self.rate_schedule()
+        self.scenario.prepayments = self.prepayments()
+        self.scenario.rounding = self.rounding_combo.currentData()
+        self.scenario.fees = self.fees_input.value()
+        self.scenario.points = self.points_input.value()
+        self.set_rate_controls_enabled(self.scenario.rate_schedule is not None)
+        self.update_solve_enabled()
+
         self._updating = False
         if emit_signal:
-            self.loan_updated.emit()
+            self.loan_updated.emit(self.scenario)
+
+    def solve(self):
+        if self.scenario is None:
+            return
+        if self.scenario.rate_schedule is not None or self.scenario.prepayments:
+            self.solve_status_label.setText("Solving needs a fixed rate and no prepayments")
+            return
+        try:
+            target = float(self.solve_target_input.text())
+        except ValueError:
+            self.solve_status_label.setText("Enter a number")
+            return
 
-    def get_amortization_data(self):
-        return self.controller.get_amortization_data()
+        scenario = self.scenario
+        loan_amount = scenario.principal - scenario.down_payment
+        mode = self.solve_combo.currentIndex()
+        if mode == 0:
+            extra = float(required_extra_payment(loan_amount, scenario.interest_rate, scenario.term, round(target * 12)))
+            # Whole dollars, rounded up so the payoff target is still met
+            self.set_solved_value(self.extra_payment_slider, math.ceil(extra - 1e-9), f"Extra payment: ${extra:,.2f}")
+        elif mode == 1:
+            amount = float(max_loan_amount(target, scenario.interest_rate, scenario.term, scenario.extra_payment))
+            principal = amount + scenario.down_payment
+            self.set_solved_value(self.loan_amount_slider, math.floor(principal), f"Max loan amount: ${principal:,.2f}")
+        else:
+            rate = float(break_even_rate(loan_amount, target, scenario.term, scenario.extra_payment))
+            if math.isnan(rate):
+                self.solve_status_label.setText("Not reachable even at 0%")
+                return
+            self.set_solved_value(
+                self.interest_rate_slider, math.floor(rate * INTEREST_RATE_SCALE_FACTOR), f"Break-even rate: {rate:.3f}%"
+            )
 
-    def get_loan_summary(self):
-        return self.controller.get_loan_summary()
\ No newline at end of file
+    def set_solved_value(self, slider, value, message):
+        if not slider.minimum() <= value <= slider.maximum():
+            message += " (outside the slider range)"
+        self.solve_status_label.setText(message)
+        # Moving the slider updates the scenario like a manual change would
+        slider.setValue(value)
@@ -1,30 +1,40 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSlider, QLabel, QLineEdit, QHBoxLayout, QCheckBox, QPushButton, QFileDialog, QMessageBox, QTabWidget, QInputDialog, QMenu, QTabBar, QToolButton
-from PyQt6.QtCore import Qt, QPoint
-from PyQt6.QtGui import QIcon
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import numpy as np
-import csv
-import json
-from ...controllers.loan_controller import LoanController
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QCheckBox, QPushButton, QFileDialog, QMessageBox, QInputDialog, QMenu, QTabBar, QToolButton
+from PyQt6.QtCore import Qt, QPoint, QTimer
+from contextlib import contextmanager
+import math
+from ...controllers.loan_controller import compute_batch_results
+from ...config import UPDATE_DEBOUNCE_MS, SIMULATION_PATHS, SIMULATION_SEED, SIMULATION_REVERSION, SIMULATION_VOLATILITY
 from functools import partial
 from .loan_scenario import LoanScenario
+from .amortization_table import AmortizationTable
+from ..workers import LoanComputeService
+from ...utils.data_visualization import AmortizationPlot
+from ...utils.exporters import export_schedules
+from ...utils.instrumentation import timed
+from ...utils.monte_carlo import VasicekModel, simulate_loan
+from ...models.scenario import Scenario, ScenarioCollection
+from ...models.scenario_store import ScenarioStore, is_scenario_store, read_json_scenarios
+
+# Result stream of the Monte Carlo bands in the compute service
+SIMULATION_OWNER = 'simulation'
 
 class CustomTabBar(QTabBar):
+    """
+    Tab bar with one shared close button that follows the current tab.
+
+    A close button widget per tab makes every insertion re-layout all of
+    them, which turns loading thousands of scenarios quadratic.
+    """
+
     def __init__(self, parent=None, loan_widget=None):
         super().__init__(parent)
         self.loan_widget = loan_widget
         self.setTabsClosable(False)  # Disable built-in close buttons
-
-    def tabInserted(self, index):
-        if index != self.count() - 1:  # Ensure the "+" tab does not get a close button
-            self.add_close_button(index)
-
-    def add_close_button(self, index):
-        close_button = QToolButton(self)
-        close_button.setText('x')  # Set the text to 'x'
-        close_button.setFixedSize(16, 16)  # Set a fixed size for the button
-        close_button.setStyleSheet("""
+        self._close_button_index = -1
+        self.close_button = QToolButton(self)
+        self.close_button.setText('x')  # Set the text to 'x'
+        self.close_button.setFixedSize(16, 16)  # Set a fixed size for the button
+        self.close_button.setStyleSheet("""
             QToolButton {
                 border: none;
                 border-radius: 8px;
@@ -38,43 +48,108 @@ class CustomTabBar(QTabBar):
                 background-color: lightgray;
             }
         """)  # Set the styles for normal and hover states
-        close_button.clicked.connect(partial(self.loan_widget.remove_tab, index))
-        self.setTabButton(index, QTabBar.ButtonPosition.RightSide, close_button)
+        self.close_button.hide()
+        self.close_button.clicked.connect(self.close_current_tab)
+        self.currentChanged.connect(self.move_close_button)
+
+    def tabInserted(self, index):
+        if index <= self._close_button_index:
+            self._close_button_index += 1
+
+    def removeTab(self, index):
+        # Detach the shared button first; QTabBar deletes a removed tab's buttons
+        if index == self._close_button_index:
+            self.setTabButton(index, QTabBar.ButtonPosition.RightSide, None)
+            self._close_button_index = -1
+        elif index < self._close_button_index:
+            self._close_button_index -= 1
+        super().removeTab(index)
+
+    def move_close_button(self, index):
+        if self._close_button_index >= 0:
+            self.setTabButton(self._close_button_index, QTabBar.ButtonPosition.RightSide, None)
+            self._close_button_index = -1
+        if 0 <= index < self.count() - 1:  # Ensure the "+" tab does not get a close button
+            self.setTabButton(index, QTabBar.ButtonPosition.RightSide, self.close_button)
+            self._close_button_index = index
+
+    def close_current_tab(self):
+        self.loan_widget.remove_tab(self.currentIndex())
 
 class LoanWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.loan_scenarios = []
+        self.loan_scenarios = ScenarioCollection()
+        self._dirty_scenarios = set()
+        self._simulations = {}
+        self._pending_simulation = None
+        self._bulk_depth = 0
+        self.compute_service = LoanComputeService(self)
+        self.init_update_timer()
         self.setup_ui()
         self.add_loan_scenario()
         self.add_plus_tab()
 
+    def init_update_timer(self):
+        # Coalesces bursts of slider events into one recompute per interval
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_DEBOUNCE_MS)
+        self._update_timer.timeout.connect(self.flush_updates)
+        # Results arrive one scenario at a time; render them together
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self.render)
+
+    def update_interval(self):
+        return self._update_timer.interval()
+
+    def set_update_interval(self, msec):
+        self._update_timer.setInterval(msec)
+
     def setup_ui(self):
         self.layout = QVBoxLayout(self)
-        self.init_tab_widget()
+        self.init_tab_bar()
+        self.init_scenario_editor()
         self.init_checkboxes()
         self.init_export_button()
         self.init_summary_label()
         self.init_matplotlib_canvas()
+        self.init_amortization_table()
         self.init_save_load_buttons()
 
-    def init_tab_widget(self):
-        self.tab_widget = QTabWidget()
-        self.tab_widget.setTabBar(CustomTabBar(self.tab_widget, self))
-        self.tab_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.tab_widget.customContextMenuRequested.connect(self.show_context_menu)
-        self.tab_widget.tabBarDoubleClicked.connect(self.rename_tab)
-        self.layout.addWidget(self.tab_widget)
+    def init_tab_bar(self):
+        self.tab_bar = CustomTabBar(self, self)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.setUsesScrollButtons(True)
+        self.tab_bar.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tab_bar.customContextMenuRequested.connect(self.show_context_menu)
+        self.tab_bar.tabBarDoubleClicked.connect(self.rename_tab)
+        self.tab_bar.tabBarClicked.connect(self.handle_tab_click)
+        self.tab_bar.currentChanged.connect(self.bind_current_scenario)
+        self.layout.addWidget(self.tab_bar)
+
+    def init_scenario_editor(self):
+        # One editor serves every tab; it is rebound when the tab changes
+        self.scenario_editor = LoanScenario()
+        self.scenario_editor.loan_updated.connect(self.mark_dirty)
+        self.layout.addWidget(self.scenario_editor)
 
     def init_checkboxes(self):
         self.horizontal_grid_checkbox = QCheckBox("Show Horizontal Grid Lines")
         self.vertical_grid_checkbox = QCheckBox("Show Vertical Grid Lines")
         self.layout.addWidget(self.horizontal_grid_checkbox)
         self.layout.addWidget(self.vertical_grid_checkbox)
+        self.table_checkbox = QCheckBox("Show Amortization Table")
+        self.layout.addWidget(self.table_checkbox)
+        self.bands_checkbox = QCheckBox("Show Interest Bands for Simulated Rates (Adjustable Rate)")
+        self.bands_checkbox.toggled.connect(lambda: self.update_graph())
+        self.layout.addWidget(self.bands_checkbox)
 
     def init_export_button(self):
-        self.export_button = QPushButton("Export to CSV")
-        self.export_button.clicked.connect(self.export_to_csv)
+        self.export_button = QPushButton("Export Schedules")
+        self.export_button.clicked.connect(self.export_schedules)
         self.layout.addWidget(self.export_button)
 
     def init_summary_label(self):
@@ -82,11 +157,25 @@ class LoanWidget(QWidget):
         self.layout.addWidget(self.summary_label)
 
     def init_matplotlib_canvas(self):
-        self.fig, self.ax = plt.subplots(figsize=(6, 4))
+        # matplotlib is imported here so it only loads once the widget is built
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=(6, 4))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvas(self.fig)
+        # draw_idle ends in canvas.draw(), so this also times deferred draws
+        self.canvas.draw = timed('loan_widget.canvas_draw')(self.canvas.draw)
+        self.plot = AmortizationPlot(self.fig, self.ax, self.canvas)
         self.layout.addWidget(self.canvas)
         self.canvas.mpl_connect("motion_notify_event", self.on_hover)
 
+    def init_amortization_table(self):
+        self.amortization_table = AmortizationTable()
+        self.amortization_table.hide()
+        self.table_checkbox.toggled.connect(self.amortization_table.setVisible)
+        self.layout.addWidget(self.amortization_table)
+
     def init_save_load_buttons(self):
         save_button = QPushButton("Save Scenarios")
         load_button = QPushButton("Load Scenarios")
@@ -98,158 +187,280 @@ class LoanWidget(QWidget):
         button_layout.addWidget(load_button)
         self.layout.addLayout(button_layout)
 
-    def add_loan_scenario(self):
-        scenario = LoanScenario()
-        self.loan_scenarios.append(scenario)
-        self.tab_widget.insertTab(self.tab_widget.count() - 1, scenario, f"Loan {len(self.loan_scenarios)}")
-        scenario.loan_amount_slider.valueChanged.connect(self.update_loan)
-        scenario.down_payment_slider.valueChanged.connect(self.update_loan)
-        scenario.interest_rate_slider.valueChanged.connect(self.update_loan)
-        scenario.loan_term_slider.valueChanged.connect(self.update_loan)
-        scenario.extra_payment_slider.valueChanged.connect(self.update_loan)
-        self.update_loan()
+    def add_loan_scenario(self, scenario=None):
+        scenario = self.loan_scenarios.append(scenario or Scenario())
+        if scenario.name is None:
+            scenario.name = f"Loan {len(self.loan_scenarios)}"
+        self.tab_bar.insertTab(self.tab_bar.count() - 1, scenario.name)
+        self.mark_dirty(scenario)
+        return scenario
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        Group many scenario changes into one batch computation and render.
+
+        Per-scenario recomputes and redraws are suppressed inside the block;
+        on exit every scenario is priced in a single LoanBatch pass.
+        """
+        self._bulk_depth += 1
+        # A hidden tab bar skips the re-layout on every inserted tab
+        tab_bar_visible = self.tab_bar.isVisibleTo(self)
+        self.tab_bar.hide()
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self.tab_bar.setVisible(tab_bar_visible)
+                self.bind_current_scenario(self.tab_bar.currentIndex())
+                self.compute_all()
+
+    def compute_all(self):
+        self._update_timer.stop()
+        self._dirty_scenarios.clear()
+        results = compute_batch_results(self.loan_scenarios.loans())
+        for scenario, (summary, amortization_data) in zip(self.loan_scenarios, results):
+            self.compute_service.cancel(scenario)
+            scenario.set_results(summary, amortization_data)
+        self._render_timer.stop()
+        self.render()
+
+    def current_scenario(self):
+        index = self.tab_bar.currentIndex()
+        return self.loan_scenarios[index] if 0 <= index < len(self.loan_scenarios) else None
+
+    def bind_current_scenario(self, index):
+        if self._bulk_depth:
+            return
+        if index >= len(self.loan_scenarios) and self.loan_scenarios:
+            # Never leave the "+" tab selected; this re-enters with a valid index
+            self.tab_bar.setCurrentIndex(len(self.loan_scenarios) - 1)
+            return
+        self.scenario_editor.bind(self.current_scenario())
+        self.amortization_table.set_current_index(index)
+        if self.bands_checkbox.isChecked():
+            # The fan chart follows the current scenario
+            self.update_graph()
 
     def add_plus_tab(self):
-        plus_tab = QWidget()
-        self.tab_widget.addTab(plus_tab, "+")
-        self.tab_widget.tabBarClicked.connect(self.handle_tab_click)
+        self.tab_bar.addTab("+")
 
     def handle_tab_click(self, index):
-        if index == self.tab_widget.count() - 1:  # If the "+" tab is clicked
+        if index == self.tab_bar.count() - 1:  # If the "+" tab is clicked
             self.add_loan_scenario()
-            self.tab_widget.setCurrentIndex(self.tab_widget.count() - 2)  # Switch to the new tab
+            self.tab_bar.setCurrentIndex(self.tab_bar.count() - 2)  # Switch to the new tab
 
     def remove_tab(self, index):
-        if index != self.tab_widget.count() - 1:  # Ensure the "+" tab is not removed
-            self.tab_widget.removeTab(index)
+        if index != self.tab_bar.count() - 1:  # Ensure the "+" tab is not removed
             if index < len(self.loan_scenarios):
-                self.loan_scenarios.pop(index)
-            self.update_loan()
+                scenario = self.loan_scenarios.pop(index)
+                self._dirty_scenarios.discard(scenario)
+                self.compute_service.cancel(scenario)
+                self._simulations.pop(scenario, None)
+                if self._pending_simulation and self._pending_simulation[0] is scenario:
+                    self.compute_service.cancel(SIMULATION_OWNER)
+                    self._pending_simulation = None
+            self.tab_bar.removeTab(index)
+            self.bind_current_scenario(self.tab_bar.currentIndex())
+            # No other scenario's inputs changed; redraw with the results at hand
+            self._render_timer.stop()
+            self.render()
 
     def rename_tab(self, index):
-        if index != self.tab_widget.count() - 1:  # Ensure the "+" tab is not renamed
+        if index != self.tab_bar.count() - 1:  # Ensure the "+" tab is not renamed
             new_name, ok = QInputDialog.getText(self, "Rename Tab", "Enter new name:")
             if ok and new_name:
-                self.tab_widget.setTabText(index, new_name)
+                self.tab_bar.setTabText(index, new_name)
+                self.loan_scenarios[index].name = new_name
 
     def show_context_menu(self, position: QPoint):
         context_menu = QMenu(self)
         rename_action = context_menu.addAction("Rename Tab")
         remove_action = context_menu.addAction("Remove Tab")
-        action = context_menu.exec(self.tab_widget.mapToGlobal(position))
-        current_index = self.tab_widget.tabBar().tabAt(position)
+        action = context_menu.exec(self.tab_bar.mapToGlobal(position))
+        current_index = self.tab_bar.tabAt(position)
 
         if action == rename_action:
             self.rename_tab(current_index)
         elif action == remove_action:
             self.remove_tab(current_index)
 
-    def update_loan(self):
-        for scenario in self.loan_scenarios:
-            scenario.update_loan()
+    def mark_dirty(self, scenario):
+        self._dirty_scenarios.add(scenario)
+        if not self._bulk_depth and not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def flush_updates(self, redraw=False):
+        self._update_timer.stop()
+        dirty, self._dirty_scenarios = self._dirty_scenarios, set()
+        for scenario in dirty:
+            self.request_results(scenario)
+        if redraw:
+            self._render_timer.start()
+
+    def request_results(self, scenario):
+        self.compute_service.submit(scenario, scenario.loan(), partial(self.apply_results, scenario))
+
+    def apply_results(self, scenario, summary, amortization_data):
+        scenario.set_results(summary, amortization_data)
+        self._render_timer.start()
+
+    def render(self):
         self.update_summary()
         self.update_graph()
+        self.amortization_table.set_scenarios(self.loan_scenarios, self.tab_bar.currentIndex())
+
+    def update_loan(self):
+        if self._bulk_depth:
+            return
+        self._dirty_scenarios.update(self.loan_scenarios)
+        self.flush_updates(redraw=True)
+
+    @staticmethod
+    def payment_change_text(summary):
+        # Adjustable-rate resets and recurring prepayments raise the payment
+        max_payment = summary.get('max_monthly_payment', summary['monthly_payment'])
+        if max_payment > summary['monthly_payment'] + 0.005:
+            return f" (up to ${max_payment:,.2f} later)"
+        return ""
 
+    @staticmethod
+    def apr_text(summary):
+        # The APR is undefined when fees and points eat the whole loan
+        apr = summary['apr']
+        return "n/a" if math.isnan(apr) else f"{apr:.2f}%"
+
+    @timed('loan_widget.update_summary')
     def update_summary(self):
-        summaries = [scenario.get_loan_summary() for scenario in self.loan_scenarios]
+        summaries = [scenario.summary for scenario in self.loan_scenarios]
         summary_texts = [
             f"Loan {i+1}:\n"
             f"Loan Amount: ${summary['loan_amount']:,.2f}\n"
-            f"APR: {scenario.controller.loan.interest_rate:.2f}%\n"
-            f"Monthly Payment: ${summary['monthly_payment']:,.2f}\n"
+            f"Interest Rate: {summary['interest_rate']:.2f}%\n"
+            f"APR: {self.apr_text(summary)}\n"
+            f"Monthly Payment: ${summary['monthly_payment']:,.2f}"
+            f"{self.payment_change_text(summary)}\n"
             f"Loan Term (years): {summary['loan_term']:.1f}\n"
             f"Total Interest Paid: ${summary['total_interest']:,.2f}\n"
-            for i, (scenario, summary) in enumerate(zip(self.loan_scenarios, summaries))
+            for i, summary in enumerate(summaries)
+            if summary is not None
         ]
         self.summary_label.setText("\n\n".join(summary_texts))
 
+    @timed('loan_widget.update_graph')
     def update_graph(self):
-        self.ax.clear()
-        for i, scenario in enumerate(self.loan_scenarios):
-            amortization_data = scenario.get_amortization_data()
-            self.ax.plot(amortization_data['months'], amortization_data['principal_payments'], label=f"Principal Paid (Loan {i+1})")
-            self.ax.plot(amortization_data['months'], amortization_data['interest_payments'], label=f"Interest Paid (Loan {i+1})")
-        
-        self.ax.set_title("Loan Repayment Breakdown")
-        self.ax.set_xlabel("Month")
-        self.ax.set_ylabel("Amount Paid")
-        
-        # Check if there are any labels before calling legend
-        handles, labels = self.ax.get_legend_handles_labels()
-        if labels:
-            self.ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
-
-        self.ax.grid(
+        self.plot.set_grid(
             self.horizontal_grid_checkbox.isChecked(),
-            axis='y',
-        )
-        self.ax.grid(
             self.vertical_grid_checkbox.isChecked(),
-            axis='x',
         )
+        self.plot.update([
+            (scenario, f"Loan {i+1}", scenario.amortization_data)
+            for i, scenario in enumerate(self.loan_scenarios)
+            if scenario.amortization_data is not None
+        ], self.simulation_bands())
 
-        # Use subplots_adjust instead of tight_layout
-        self.fig.subplots_adjust(bottom=0.2, top=0.8)
-        self.canvas.draw()
+    def simulation_bands(self):
+        # Fan chart of cumulative interest for the current adjustable-rate
+        # scenario without prepayments; results are cached until its loan changes.
+        # A changed loan is simulated on the compute pool and, like the lines,
+        # the previous bands stay up until the new ones arrive
+        scenario = self.current_scenario()
+        if (not self.bands_checkbox.isChecked() or scenario is None or scenario.rate_schedule is None
+                or scenario.prepayments):
+            return []
+        loan = scenario.loan()
+        cached = self._simulations.get(scenario)
+        if cached is None or cached[0] != loan.cache_key():
+            self.request_simulation(scenario, loan)
+        if cached is None:
+            return []
+        result = cached[1]
+        return [(scenario, result.months, result.interest_paid)]
 
-    def export_to_csv(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save CSV", "", "CSV Files (*.csv);;All Files (*)")
+    def request_simulation(self, scenario, loan):
+        key = loan.cache_key()
+        if self._pending_simulation == (scenario, key):
+            return
+        self._pending_simulation = scenario, key
+        schedule = loan.rate_schedule
+        # The indexed rate reverts towards the adjusted rate of the schedule
+        model = VasicekModel(
+            schedule.rates[-1] if schedule.rates else loan.interest_rate,
+            SIMULATION_REVERSION, SIMULATION_VOLATILITY,
+        )
+        # One owner for all bands: only the current scenario's are shown
+        self.compute_service.submit_call(
+            SIMULATION_OWNER, partial(simulate_loan, loan, model, SIMULATION_PATHS, seed=SIMULATION_SEED),
+            partial(self.apply_simulation, scenario, key),
+        )
+
+    def apply_simulation(self, scenario, key, result):
+        self._pending_simulation = None
+        self._simulations = {scenario: (key, result)}
+        if scenario is self.current_scenario():
+            self.update_graph()
+
+    def export_schedules(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Schedules", "",
+            "CSV Files (*.csv);;Compressed NumPy (*.npz);;Parquet Files (*.parquet)"
+        )
         if file_path:
-            amortization_data = self.loan_scenarios[0].get_amortization_data()
-            with open(file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["Month", "Monthly Payment", "Principal", "Interest"])
-                for month, principal, interest in zip(amortization_data['months'], amortization_data['principal_payments'], amortization_data['interest_payments']):
-                    writer.writerow([month, principal + interest, principal, interest])
+            file_format = selected_filter.rsplit("*.", 1)[-1].rstrip(")")
+            if not file_path.lower().endswith("." + file_format):
+                file_path += "." + file_format
+            try:
+                export_schedules(file_path, self.loan_scenarios.batch(), file_format)
+            except (ImportError, OSError) as error:
+                QMessageBox.warning(self, "Export Failed", str(error))
 
     def save_scenarios(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save Loan Scenarios", "", "JSON Files (*.json)")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Loan Scenarios", "", "Scenario Stores (*.scenarios)")
         if file_path:
-            scenarios_data = []
-            for scenario in self.loan_scenarios:
-                scenario_data = {
-                    "loan_amount": scenario.loan_amount_slider.value(),
-                    "down_payment": scenario.down_payment_slider.value(),
-                    "interest_rate": scenario.interest_rate_slider.value(),
-                    "loan_term": scenario.loan_term_slider.value(),
-                    "extra_payment": scenario.extra_payment_slider.value(),
-                }
-                scenarios_data.append(scenario_data)
-            
-            with open(file_path, 'w') as f:
-                json.dump(scenarios_data, f)
+            if not file_path.lower().endswith(".scenarios"):
+                file_path += ".scenarios"
+            try:
+                self.save_scenarios_file(file_path)
+            except OSError as error:
+                QMessageBox.warning(self, "Save Failed", str(error))
+                return
             QMessageBox.information(self, "Save Successful", "Loan scenarios saved successfully.")
 
+    def save_scenarios_file(self, file_path):
+        store = ScenarioStore.create(file_path, overwrite=True)
+        store.append(self.loan_scenarios.batch())
+        return store
+
     def load_scenarios(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Load Loan Scenarios", "", "JSON Files (*.json)")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load Loan Scenarios", "", "Scenario Stores (manifest.json);;Legacy JSON Files (*.json)"
+        )
         if file_path:
-            with open(file_path, 'r') as f:
-                scenarios_data = json.load(f)
-            
-            # Clear existing scenarios
-            for i in range(self.tab_widget.count() - 1, 0, -1):  # Leave the '+' tab
-                self.remove_tab(i)
-            
-            # Load saved scenarios
-            for scenario_data in scenarios_data:
-                self.add_loan_scenario()
-                scenario = self.loan_scenarios[-1]
-                scenario.loan_amount_slider.setValue(scenario_data["loan_amount"])
-                scenario.down_payment_slider.setValue(scenario_data["down_payment"])
-                scenario.interest_rate_slider.setValue(scenario_data["interest_rate"])
-                scenario.loan_term_slider.setValue(scenario_data["loan_term"])
-                scenario.extra_payment_slider.setValue(scenario_data["extra_payment"])
-                scenario.update_loan()
-            
-            self.update_loan()
+            try:
+                self.load_scenarios_file(file_path)
+            except (OSError, ValueError, KeyError) as error:
+                QMessageBox.warning(self, "Load Failed", str(error))
+                return
             QMessageBox.information(self, "Load Successful", "Loan scenarios loaded successfully.")
 
+    def load_scenarios_file(self, file_path):
+        # Scenario stores are memory-mapped; old JSON saves are still accepted
+        if is_scenario_store(file_path):
+            batch = ScenarioStore.open(file_path).batch()
+        else:
+            batch = read_json_scenarios(file_path)
+        with self.bulk_update():
+            # Clear existing scenarios, leaving the '+' tab
+            for i in range(len(self.loan_scenarios) - 1, -1, -1):
+                self.remove_tab(i)
+
+            for scenario in ScenarioCollection.from_batch(batch):
+                self.add_loan_scenario(scenario)
+
+    @timed('loan_widget.on_hover')
     def on_hover(self, event):
-        if event.inaxes == self.ax:
-            # Display information based on hover location
-            month = int(event.xdata)
-            if 0 <= month < len(self.loan_scenarios[0].get_amortization_data()['months']):
-                principal = self.loan_scenarios[0].get_amortization_data()['principal_payments'][month]
-                interest = self.loan_scenarios[0].get_amortization_data()['interest_payments'][month]
-                self.ax.set_title(f"Month: {month}, Principal: ${principal:,.2f}, Interest: ${interest:,.2f}")
-                self.canvas.draw()
\ No newline at end of file
+        if not self.loan_scenarios:
+            return
+        scenario = self.current_scenario() or self.loan_scenarios[0]
+        self.plot.hover(scenario, event.xdata if event.inaxes == self.ax else None)
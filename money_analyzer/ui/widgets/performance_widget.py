@@ -0,0 +1,113 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+from PyQt6.QtCore import Qt, QTimer
+from ...config import PERFORMANCE_REFRESH_MS, PROFILER_RATE_WINDOW_S
+from ...utils.instrumentation import profiler
+
+class PerformanceWidget(QWidget):
+    """
+    Live view of the timing spans and cache counters of the shared profiler.
+
+    Recording starts when the widget is built and can be switched off; the
+    view only refreshes while it is visible.
+    """
+
+    COLUMNS = ("Stage", "Calls", "p50 (ms)", "p95 (ms)", "Max (ms)", "Calls/s")
+
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(PERFORMANCE_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.record_checkbox.setChecked(True)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.record_checkbox = QCheckBox("Record Timings")
+        self.record_checkbox.toggled.connect(self.set_recording)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        controls.addWidget(self.record_checkbox)
+        controls.addWidget(reset_button)
+        controls.addWidget(export_button)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.span_table = QTableWidget(0, len(self.COLUMNS))
+        self.span_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.span_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.span_table.horizontalHeader().setStretchLastSection(True)
+        self.span_table.verticalHeader().setVisible(False)
+        self.span_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.span_table)
+        self.cache_label = QLabel("")
+        layout.addWidget(self.cache_label)
+        layout.addWidget(QLabel(f"Percentiles cover the latest {profiler.capacity} calls per stage; "
+                                f"rates the last {PROFILER_RATE_WINDOW_S:g} s."))
+
+    def set_recording(self, enabled):
+        if enabled:
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.refresh()
+
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    def refresh(self):
+        snapshot = profiler.snapshot()
+        spans = snapshot['spans']
+        self.span_table.setRowCount(len(spans))
+        for row, (name, summary) in enumerate(spans.items()):
+            values = (
+                name,
+                str(summary['count']),
+                self.format_ms(summary['p50_ms']),
+                self.format_ms(summary['p95_ms']),
+                self.format_ms(summary['max_ms']),
+                f"{summary['rate_per_sec']:.1f}",
+            )
+            for column, value in enumerate(values):
+                item = self.span_table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.span_table.setItem(row, column, item)
+                item.setText(value)
+        self.cache_label.setText("\n".join(
+            f"{name}: {stats['hit_rate']:.1%} hit rate ({stats['hits']:,} hits, {stats['misses']:,} misses, "
+            f"{stats['size']}/{stats['maxsize']} entries)"
+            for name, stats in snapshot['caches'].items()
+        ))
+
+    @staticmethod
+    def format_ms(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    def export(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Timings", "", "JSON Files (*.json);;CSV Files (*.csv)"
+        )
+        if file_path:
+            file_format = selected_filter.rsplit("*.", 1)[-1].rstrip(")")
+            if not file_path.lower().endswith("." + file_format):
+                file_path += "." + file_format
+            try:
+                profiler.export(file_path)
+            except OSError as error:
+                QMessageBox.warning(self, "Export Failed", str(error))
@@ -0,0 +1,169 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QDoubleSpinBox, QSpinBox, QPushButton
+from PyQt6.QtCore import QTimer
+from ...config import UPDATE_DEBOUNCE_MS
+from ...models.scenario import Scenario
+from ...utils.sensitivity import DEFAULT_RESOLUTION, IRREGULAR_RESOLUTION, METRICS, PARAMETERS, parameter_values, sensitivity_grid
+from ...utils.data_visualization import SensitivityHeatmap
+
+class SensitivityWidget(QWidget):
+    """
+    Heatmap of one loan metric over a grid of two loan parameters.
+
+    The parameters that are not swept come from a base loan, a snapshot of
+    the loan analyzer's current scenario when ``base_provider`` is given,
+    including its rate schedule, prepayments and rounding mode.
+    """
+
+    def __init__(self, base_provider=None):
+        super().__init__()
+        self.base_provider = base_provider
+        self.base = Scenario().loan()
+        self.grid = None
+        self._grid_key = None
+        self.init_update_timer()
+        self.setup_ui()
+        self.update_grid()
+
+    def init_update_timer(self):
+        # Coalesces bursts of control changes into one grid evaluation
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_DEBOUNCE_MS)
+        self._update_timer.timeout.connect(self.update_grid)
+
+    def setup_ui(self):
+        self.layout = QVBoxLayout(self)
+        self.init_controls()
+        self.init_matplotlib_canvas()
+
+    def init_controls(self):
+        controls = QGridLayout()
+        self.axis_controls = {}
+        for row, (axis, default) in enumerate((("x", 'interest_rate'), ("y", 'term'))):
+            combo = QComboBox()
+            for name, (label, _, _) in PARAMETERS.items():
+                combo.addItem(label, name)
+            combo.setCurrentIndex(list(PARAMETERS).index(default))
+            minimum, maximum = QDoubleSpinBox(), QDoubleSpinBox()
+            controls.addWidget(QLabel(f"{axis.upper()} axis:"), row, 0)
+            controls.addWidget(combo, row, 1)
+            controls.addWidget(QLabel("from"), row, 2)
+            controls.addWidget(minimum, row, 3)
+            controls.addWidget(QLabel("to"), row, 4)
+            controls.addWidget(maximum, row, 5)
+            self.axis_controls[axis] = (combo, minimum, maximum)
+            combo.currentIndexChanged.connect(lambda _, axis=axis: self.reset_range(axis))
+            minimum.valueChanged.connect(self.schedule_update)
+            maximum.valueChanged.connect(self.schedule_update)
+            self.reset_range(axis)
+
+        self.metric_combo = QComboBox()
+        for name, label in METRICS.items():
+            self.metric_combo.addItem(label, name)
+        self.metric_combo.currentIndexChanged.connect(self.schedule_update)
+        self.resolution_spin = QSpinBox()
+        self.resolution_spin.setRange(2, 1000)
+        self.resolution_spin.setValue(DEFAULT_RESOLUTION)
+        self.resolution_spin.valueChanged.connect(self.schedule_update)
+        self.base_button = QPushButton("Use Current Scenario")
+        self.base_button.clicked.connect(self.use_current_scenario)
+        self.base_button.setEnabled(self.base_provider is not None)
+
+        options = QHBoxLayout()
+        options.addWidget(QLabel("Show:"))
+        options.addWidget(self.metric_combo)
+        options.addWidget(QLabel("Resolution:"))
+        options.addWidget(self.resolution_spin)
+        options.addWidget(self.base_button)
+        options.addStretch()
+        self.base_label = QLabel("")
+        self.layout.addLayout(controls)
+        self.layout.addLayout(options)
+        self.layout.addWidget(self.base_label)
+
+    def init_matplotlib_canvas(self):
+        # matplotlib is imported here so it only loads once the widget is built
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=(6, 4))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvas(self.fig)
+        self.heatmap = SensitivityHeatmap(self.fig, self.ax, self.canvas)
+        self.layout.addWidget(self.canvas)
+        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
+
+    def reset_range(self, axis):
+        combo, minimum, maximum = self.axis_controls[axis]
+        _, low, high = PARAMETERS[combo.currentData()]
+        step = 0.1 if combo.currentData() == 'interest_rate' else 1
+        for spin_box, value in ((minimum, low), (maximum, high)):
+            spin_box.blockSignals(True)
+            spin_box.setDecimals(1 if step < 1 else 0)
+            spin_box.setSingleStep(step)
+            spin_box.setRange(low, high)
+            spin_box.setValue(value)
+            spin_box.blockSignals(False)
+        self.schedule_update()
+
+    def schedule_update(self):
+        self._update_timer.start()
+
+    def use_current_scenario(self):
+        base = self.base_provider()
+        if base is not None:
+            # A snapshot, so later slider moves do not silently change the grid
+            self.base = base.loan()
+            self.update_grid()
+
+    def axis(self, axis):
+        combo, minimum, maximum = self.axis_controls[axis]
+        name = combo.currentData()
+        low, high = sorted((minimum.value(), maximum.value()))
+        return name, parameter_values(name, low, high, self.resolution())
+
+    def resolution(self):
+        # Adjustable-rate and prepayment loans are priced one by one
+        if self.base.is_level():
+            return self.resolution_spin.value()
+        return min(self.resolution_spin.value(), IRREGULAR_RESOLUTION)
+
+    def update_grid(self):
+        self._update_timer.stop()
+        (x_name, x_values), (y_name, y_values) = self.axis("x"), self.axis("y")
+        if x_name == y_name:
+            self.base_label.setText("Choose two different parameters.")
+            return
+        metric = self.metric_combo.currentData()
+        grid_key = (x_name, x_values[0], x_values[-1], len(x_values), y_name, y_values[0], y_values[-1], len(y_values),
+                    self.base.cache_key())
+        if grid_key != self._grid_key:
+            # All metrics come out of one pass, so switching metric is free
+            self.grid = sensitivity_grid(self.base, x_name, x_values, y_name, y_values)
+            self._grid_key = grid_key
+        self.base_label.setText("Base: " + ", ".join(
+            f"{label} {getattr(self.base, name):,.2f}" for name, (label, _, _) in PARAMETERS.items()
+            if name not in (x_name, y_name)
+        ) + self.base_note())
+        self.heatmap.show(
+            grid_key + (metric,), self.grid[metric], x_values, y_values,
+            PARAMETERS[x_name][0], PARAMETERS[y_name][0], METRICS[metric],
+        )
+
+    def base_note(self):
+        notes = []
+        if self.base.rate_schedule is not None:
+            notes.append("adjustable rate")
+        if self.base.prepayments:
+            notes.append("prepayments")
+        if self.base.rounding is not None:
+            notes.append(f"rounded to the cent ({self.base.rounding})")
+        if not self.base.is_level() and self.resolution() < self.resolution_spin.value():
+            notes.append(f"at most {IRREGULAR_RESOLUTION} samples per axis")
+        return "; " + ", ".join(notes) if notes else ""
+
+    def on_hover(self, event):
+        if event.inaxes == self.ax:
+            self.heatmap.hover(event.xdata, event.ydata)
+        else:
+            self.heatmap.hover(None, None)
@@ -0,0 +1,143 @@
+"""
+This module runs loan computations, and other slow work such as Monte
+Carlo bands, off the Qt GUI thread.
+Every submission is tagged with a generation number, unique across owners,
+so results superseded by a newer slider value are dropped instead of applied.
+The service drains its thread pool when the application quits, so no task
+outlives the objects it reports to.
+"""
+
+import itertools
+from functools import partial
+
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from ..controllers.loan_controller import LoanController
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object, int, object)
+
+
+def compute_loan(loan, cache=None):
+    """Summary and amortization data of ``loan``, as the controller returns them."""
+    controller = LoanController(cache=cache)
+    controller.loan = loan
+    return controller.get_loan_summary(), controller.get_amortization_data()
+
+
+class LoanComputeTask(QRunnable):
+    """
+    Thread-pool task running one computation submitted to the service.
+    """
+
+    def __init__(self, service, owner, generation, compute):
+        super().__init__()
+        self.service = service
+        self.owner = owner
+        self.generation = generation
+        self.compute = compute
+
+    def run(self):
+        # Skip work that was superseded while the task sat in the queue.
+        if self.service.is_stale(self.owner, self.generation):
+            return
+        self.service.signals.finished.emit(self.owner, self.generation, self.compute())
+
+
+class LoanComputeService(QObject):
+    """
+    Submits computations to a QThreadPool and applies only the latest.
+
+    Callbacks always run on the thread that owns the service (the GUI
+    thread), so they can touch widgets directly. Unless a pool is given the
+    service owns one, and :meth:`shutdown` runs when the application quits.
+    """
+
+    def __init__(self, parent=None, thread_pool=None, cache=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool(self)
+        self.cache = cache
+        self.signals = _TaskSignals()
+        self.signals.finished.connect(self._on_finished)
+        # Latest generation per owner with a computation in flight
+        self._generations = {}
+        self._callbacks = {}
+        self._counter = itertools.count(1)
+        self._closed = False
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, owner, loan, callback):
+        """
+        Queue a loan computation for ``owner``, superseding any pending one.
+
+        Args:
+            owner (Hashable): Identifies the result stream, e.g. a scenario.
+            loan (Loan): Loan to compute; it must not be mutated afterwards.
+            callback (Callable[[dict, dict], None]): Receives the summary and
+                amortization data once the latest computation finishes.
+
+        Returns:
+            int: Generation number assigned to this submission.
+        """
+        return self.submit_call(owner, partial(compute_loan, loan, self.cache), lambda results: callback(*results))
+
+    def submit_call(self, owner, compute, callback):
+        """
+        Queue any computation for ``owner``, superseding any pending one.
+
+        Args:
+            owner (Hashable): Identifies the result stream.
+            compute (Callable[[], object]): Runs on a pool thread; it must
+                not touch widgets.
+            callback (Callable[[object], None]): Receives the return value of
+                the latest computation on the service's thread.
+
+        Returns:
+            int: Generation number assigned to this submission.
+        """
+        generation = next(self._counter)
+        if self._closed:
+            # Late submissions from timers firing during teardown are dropped
+            return generation
+        self._generations[owner] = generation
+        self._callbacks[owner] = callback
+        self.thread_pool.start(LoanComputeTask(self, owner, generation, compute))
+        return generation
+
+    def cancel(self, owner):
+        """Drop pending and future results for ``owner``."""
+        # Generations are never reused, so forgetting the owner is enough to
+        # make a result still in flight stale
+        self._generations.pop(owner, None)
+        self._callbacks.pop(owner, None)
+
+    def shutdown(self):
+        """
+        Drop queued tasks and wait for the running ones to finish.
+
+        A task still running at teardown would report to a deleted signals
+        object and abort the process, so the owner must call this before the
+        service is destroyed; it is connected to ``aboutToQuit``.
+        """
+        self._closed = True
+        self._generations.clear()
+        self._callbacks.clear()
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone()
+
+    def is_stale(self, owner, generation):
+        return self._closed or self._generations.get(owner) != generation
+
+    def is_pending(self, owner):
+        return owner in self._callbacks
+
+    def _on_finished(self, owner, generation, result):
+        if self.is_stale(owner, generation):
+            return
+        del self._generations[owner]
+        callback = self._callbacks.pop(owner, None)
+        if callback is not None:
+            callback(result)
@@ -0,0 +1,170 @@
+"""
+This module computes the annual percentage rate (APR) of loans: the rate at
+which the payments actually made, discounted monthly, are worth exactly the
+amount financed, i.e. the loan amount minus fees and points paid up front.
+Without fees the APR equals the nominal rate; fees and points raise it, and
+more so when extra payments retire the loan early. There is no closed form,
+so the internal rate of return is found with vectorized Newton steps and a
+bisection fallback for whole arrays of loans at once. Rates follow ``Loan``
+(annual rate in percent) and all arguments broadcast.
+"""
+
+import numpy as np
+
+from .goal_seek import MAX_ITERATIONS, RATE_TOLERANCE, annuity_factor
+
+VALUE_TOLERANCE = 1e-12  # present value, relative to the amount financed
+
+
+def amount_financed(loan_amount, fees=0, points=0):
+    """
+    Cash the borrower actually receives.
+
+    Args:
+        loan_amount: Amount borrowed (principal minus down payment).
+        fees: Finance charges paid up front, in dollars.
+        points: Discount points, in percent of the loan amount.
+
+    Returns:
+        numpy.ndarray: Loan amount minus fees and points.
+    """
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    return loan_amount - fees - loan_amount * np.asarray(points, dtype=float) / 100
+
+
+def solve_rate(npv, present_value, total_payments, guess=None):
+    """
+    Monthly rate at which payments are worth ``present_value``.
+
+    ``npv(rate)`` returns the discounted payments minus ``present_value``
+    and its slope; it falls as the rate rises. Payments worth their total at
+    a 0% rate bracket the root between 0 and ``total / present_value - 1``,
+    so every Newton step that leaves the bracket is replaced by bisection.
+
+    Args:
+        npv (Callable): ``rate -> (value, slope)`` on arrays of rates.
+        present_value: Amount financed per loan.
+        total_payments: Undiscounted sum of the payments per loan.
+        guess: Starting rate, e.g. the nominal monthly rate.
+
+    Returns:
+        numpy.ndarray: Monthly rate as a fraction, ``nan`` where nothing is
+        financed or nothing is paid.
+    """
+    present_value, total_payments = np.broadcast_arrays(
+        np.asarray(present_value, dtype=float), np.asarray(total_payments, dtype=float)
+    )
+    feasible = (present_value > 0) & (total_payments > 0)
+    bound = np.where(feasible, total_payments / np.where(feasible, present_value, 1) - 1, 0.0)
+    low, high = np.minimum(bound, 0.0), np.maximum(bound, 0.0)
+    rate = (low + high) / 2 if guess is None else np.asarray(guess, dtype=float) + np.zeros_like(low)
+    rate = np.where((rate > low) & (rate < high), rate, (low + high) / 2)
+
+    for _ in range(MAX_ITERATIONS):
+        value, slope = npv(rate)
+        below = value > 0
+        low = np.where(below, rate, low)
+        high = np.where(below, high, rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate - value / slope
+        inside = np.isfinite(newton) & (newton > low) & (newton < high)
+        converged = ~feasible | (high - low <= RATE_TOLERANCE) | (np.abs(value) <= VALUE_TOLERANCE * present_value)
+        rate = np.where(converged, rate, np.where(inside, newton, (low + high) / 2))
+        if np.all(converged):
+            break
+
+    return np.where(feasible, rate, np.nan)
+
+
+def level_irr(present_value, payment, num_months, final_payment, guess=None):
+    """
+    Monthly IRR of level payments followed by a different final payment.
+
+    The schedule of a level-payment loan is ``payment`` for the first
+    ``num_months - 1`` months and ``final_payment`` in the last, so its
+    value has a closed form and each Newton step costs a few array
+    operations however long the loans run.
+
+    Returns:
+        numpy.ndarray: Monthly rate as a fraction; see ``solve_rate``.
+    """
+    present_value, payment, num_months, final_payment = np.broadcast_arrays(
+        np.asarray(present_value, dtype=float), np.asarray(payment, dtype=float),
+        np.asarray(num_months, dtype=float), np.asarray(final_payment, dtype=float),
+    )
+    level_months = np.maximum(num_months - 1, 0)
+
+    def npv(rate):
+        factor = annuity_factor(rate, level_months)
+        final_discount = np.exp(-num_months * np.log1p(rate))
+        value = payment * factor + final_payment * final_discount - present_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # d/dr of (1 - (1 + r)^-n) / r and of (1 + r)^-m
+            factor_slope = (level_months * np.exp(-(level_months + 1) * np.log1p(rate)) - factor) / rate
+        slope = payment * factor_slope - final_payment * num_months * final_discount / (1 + rate)
+        return value, slope
+
+    total_payments = np.where(num_months > 0, payment * level_months + final_payment, 0.0)
+    return solve_rate(npv, present_value, total_payments, guess)
+
+
+def schedule_irr(cash_flows, present_value, guess=None):
+    """
+    Monthly IRR of arbitrary monthly cash flows.
+
+    Args:
+        cash_flows: Payments shaped ``(loans, months)``, month 1 first and
+            zero-padded after payoff.
+        present_value: Amount financed per loan.
+        guess: Starting rate per loan.
+
+    Returns:
+        numpy.ndarray: Monthly rate as a fraction; see ``solve_rate``.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    months = np.arange(1, cash_flows.shape[1] + 1)
+
+    def npv(rate):
+        discount = np.exp(-months * np.log1p(rate)[:, None])
+        value = (cash_flows * discount).sum(axis=1) - present_value
+        slope = -(cash_flows * months * discount).sum(axis=1) / (1 + rate)
+        return value, slope
+
+    present_value = np.broadcast_to(np.asarray(present_value, dtype=float), cash_flows.shape[:1])
+    return solve_rate(npv, present_value, cash_flows.sum(axis=1), guess)
+
+
+def loan_apr(loan, summary=None):
+    """
+    APR of one ``Loan``.
+
+    A level-payment loan without fees or points repays exactly its nominal
+    rate, so that is its APR. Other level-payment loans, cent-exact ones
+    included, are discounted in closed form from their summary, like
+    ``LoanBatch.calculate_apr``; adjustable rates and prepayments change the
+    cash flows month by month, so those loans are discounted over their own
+    amortization schedule.
+
+    Args:
+        loan (Loan): Loan to price.
+        summary (tuple | None): ``loan.calculate_loan_summary()``, when
+            already computed.
+
+    Returns:
+        float: Annual rate in percent, ``nan`` when fees and points leave
+        nothing financed.
+    """
+    plain = loan.is_level() and loan.rounding is None and not (loan.fees or loan.points)
+    if plain and loan.principal > loan.down_payment:
+        return float(loan.interest_rate)
+    financed = amount_financed(loan.principal - loan.down_payment, loan.fees, loan.points)
+    guess = np.array([loan.interest_rate / 12 / 100])
+    if loan.is_level():
+        payment, _, total_payments, num_months = loan.calculate_loan_summary() if summary is None else summary
+        final_payment = total_payments - payment * max(num_months - 1, 0)
+        rate = level_irr(financed, payment, num_months, final_payment, guess)
+    else:
+        schedule = loan.calculate_amortization()
+        # Principal plus interest is what reaches the lender every month
+        rate = schedule_irr(schedule.principal + schedule.interest, financed, guess)
+    return float(np.ravel(rate)[0]) * 12 * 100
@@ -0,0 +1,419 @@
+"""
+This module provides the plotting layer used by the analysis widgets.
+AmortizationPlot keeps one persistent Line2D per series and updates it in
+place, optionally with percentile fan bands; SensitivityHeatmap shows cached
+colormapped grids, and both draw their hover readouts by blitting over a
+cached background.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+def min_max_decimate(x, y, num_bins):
+    """
+    Downsample a series to the extrema of ``num_bins`` equal-sized bins.
+
+    Keeping both the minimum and the maximum of every bin preserves the
+    visual envelope of the line when one bin maps to one pixel column. NaN
+    values are ignored for the extrema, but the first NaN of a bin is kept
+    so the gap it draws survives.
+
+    Args:
+        x (numpy.ndarray): Sorted x values.
+        y (numpy.ndarray): Y values, same length as ``x``.
+        num_bins (int): Number of bins, typically the canvas width in pixels.
+
+    Returns:
+        tuple: Decimated ``(x, y)``; the inputs are returned unchanged when
+        they already have at most ``2 * num_bins`` points.
+    """
+    size = len(x)
+    if num_bins <= 0 or size <= 2 * num_bins:
+        return x, y
+    bin_size = -(-size // num_bins)
+    padded = np.empty(bin_size * num_bins, dtype=float)
+    padded[:size] = y
+    padded[size:] = y[-1]
+    bins = padded.reshape(num_bins, bin_size)
+    offsets = np.arange(num_bins) * bin_size
+    missing = np.isnan(bins)
+    keep = [[0, size - 1]]
+    if missing.any():
+        # argmin and argmax would stop at the first NaN of a bin
+        gaps = missing.any(axis=1)
+        keep.append(offsets[gaps] + missing[gaps].argmax(axis=1))
+        keep.append(offsets + np.where(missing, np.inf, bins).argmin(axis=1))
+        keep.append(offsets + np.where(missing, -np.inf, bins).argmax(axis=1))
+    else:
+        keep.append(offsets + bins.argmin(axis=1))
+        keep.append(offsets + bins.argmax(axis=1))
+    keep = np.concatenate(keep)
+    keep = np.unique(np.minimum(keep, size - 1))
+    return x[keep], y[keep]
+
+
+class AmortizationPlot:
+    """
+    Persistent-artist renderer for cumulative principal and interest curves.
+
+    Series are identified by a hashable key (e.g. a scenario). Updating a
+    series calls ``set_data`` on its existing lines instead of clearing the
+    axes, and the hover readout is an animated text artist blitted on top of
+    the last full draw.
+
+    Lines only receive the visible part of each series, min/max decimated to
+    the axes width in pixels; zooming, panning and resizing re-decimate from
+    the full-resolution data, which stays available for hover and export.
+    """
+
+    SERIES = (('principal_payments', "Principal Paid"), ('interest_payments', "Interest Paid"))
+    # Legend layout and text rendering grow with every entry and dominate
+    # the draw long before the lines do, so only the first series are listed.
+    MAX_LEGEND_SERIES = 10
+
+    def __init__(self, figure, ax, canvas):
+        self.figure = figure
+        self.ax = ax
+        self.canvas = canvas
+        self._lines = {}
+        self._data = {}
+        self._labels = {}
+        self._limits = {}
+        self._bands = {}
+        self._band_data = {}
+        self._legend_labels = None
+        self._background = None
+        self._view = None
+        self._updating = False
+
+        ax.set_title("Loan Repayment Breakdown")
+        ax.set_xlabel("Month")
+        ax.set_ylabel("Amount Paid")
+        figure.subplots_adjust(bottom=0.2, top=0.8)
+        self._hover_text = ax.text(
+            0.01, 0.98, "", transform=ax.transAxes, va='top', ha='left', animated=True,
+            bbox={'boxstyle': 'round', 'facecolor': 'white', 'alpha': 0.8},
+        )
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('resize_event', self._on_view_changed)
+        ax.callbacks.connect('xlim_changed', self._on_view_changed)
+
+    def update(self, series, bands=()):
+        """
+        Synchronize the plotted lines with ``series`` and redraw once.
+
+        Args:
+            series (list[tuple]): ``(key, label, amortization_data)`` entries
+                in legend order; keys missing from the list are removed.
+            bands (list[tuple]): ``(key, months, rows)`` fan charts, where
+                ``rows`` are cumulative percentile curves in increasing order;
+                outer pairs of rows are shaded and an odd middle row is drawn
+                as a dashed median. Keys missing from the list are removed.
+        """
+        keys = {key for key, _, _ in series}
+        for key in list(self._lines):
+            if key not in keys:
+                self.remove(key)
+
+        changed = []
+        for key, label, data in series:
+            if self._data.get(key) is data and self._labels.get(key) == label:
+                continue
+            lines = self._lines.get(key)
+            if lines is None:
+                lines = self._lines[key] = [self.ax.plot([], [])[0] for _ in self.SERIES]
+            for line, (_, name) in zip(lines, self.SERIES):
+                line.set_label(f"{name} ({label})")
+            self._data[key] = data
+            self._labels[key] = label
+            self._limits[key] = self.data_limits(data)
+            changed.append(key)
+        self._update_bands(bands)
+
+        self._updating = True
+        try:
+            self._rescale()
+        finally:
+            self._updating = False
+        view = self._current_view()
+        if view != self._view:
+            self._view = view
+            changed = list(self._lines)
+        for key in changed:
+            self._set_line_data(key)
+        self._update_legend([key for key, _, _ in series])
+        self.canvas.draw_idle()
+
+    def _update_bands(self, bands):
+        keys = {key for key, _, _ in bands}
+        for key in list(self._bands):
+            if key not in keys:
+                self._remove_band(key)
+        for key, months, rows in bands:
+            if self._band_data.get(key) is rows:
+                continue
+            self._remove_band(key)
+            artists = []
+            count = len(rows)
+            # Shaded in the colour of the series' interest line
+            color = self._lines[key][1].get_color() if key in self._lines else 'tab:orange'
+
+            for i in range(count // 2):
+                # Inner bands are darker, so the fan fades towards the tails
+                artists.append(self.ax.fill_between(
+                    months, rows[i], rows[count - 1 - i], color=color, alpha=0.15 + 0.15 * i, linewidth=0,
+                ))
+            if count % 2:
+                artists.append(self.ax.plot(months, rows[count // 2], color=color, linestyle='--')[0])
+            self._bands[key] = artists
+            self._band_data[key] = rows
+            self._limits[('band', key)] = (float(months[-1]), float(np.max(rows))) if len(months) else (0.0, 0.0)
+
+    def _remove_band(self, key):
+        for artist in self._bands.pop(key, ()):
+            artist.remove()
+        self._band_data.pop(key, None)
+        self._limits.pop(('band', key), None)
+
+    def remove(self, key):
+        """Remove the lines of series ``key``."""
+        for line in self._lines.pop(key, ()):
+            line.remove()
+        self._data.pop(key, None)
+        self._labels.pop(key, None)
+        self._limits.pop(key, None)
+
+    def set_grid(self, horizontal, vertical):
+        """Toggle the horizontal and vertical grid lines."""
+        self.ax.grid(horizontal, axis='y')
+        self.ax.grid(vertical, axis='x')
+
+    def data_limits(self, data):
+        """
+        Axis extent needed by one series.
+
+        Returns:
+            tuple: ``(x_max, y_max)`` of the series.
+        """
+        months = data['months']
+        if not len(months):
+            return 0.0, 0.0
+        # Cumulative curves are non-decreasing, so the last point is the max.
+        return float(months[-1]), max(float(data[column][-1]) for column, _ in self.SERIES)
+
+    def hover(self, key, xdata):
+        """
+        Show the readout of series ``key`` at ``xdata`` using blitting.
+
+        Args:
+            key (Hashable): Series to read values from.
+            xdata (float | None): Mouse position in data coordinates, or
+                ``None`` to hide the readout.
+        """
+        data = self._data.get(key)
+        text = ""
+        if data is not None and xdata is not None and len(data['months']):
+            index = int(np.clip(round(xdata) - 1, 0, len(data['months']) - 1))
+            text = (
+                f"{self._labels[key]} - Month: {data['months'][index]}, "
+                f"Principal: \\${data['principal_payments'][index]:,.2f}, "
+                f"Interest: \\${data['interest_payments'][index]:,.2f}"
+            )
+        if text == self._hover_text.get_text():
+            return
+        self._hover_text.set_text(text)
+        self._blit()
+
+    def _current_view(self):
+        return tuple(self.ax.get_xlim()), max(int(self.ax.bbox.width), 1)
+
+    def _set_line_data(self, key):
+        data = self._data[key]
+        months = data['months']
+        (x_min, x_max), width = self._view
+        start = max(np.searchsorted(months, x_min, side='left') - 1, 0)
+        stop = np.searchsorted(months, x_max, side='right') + 1
+        for line, (column, _) in zip(self._lines[key], self.SERIES):
+            line.set_data(*min_max_decimate(months[start:stop], data[column][start:stop], width))
+
+    def _on_view_changed(self, _event):
+        if self._updating:
+            return
+        view = self._current_view()
+        if view == self._view:
+            return
+        self._view = view
+        for key in self._lines:
+            self._set_line_data(key)
+        self.canvas.draw_idle()
+
+    def _rescale(self):
+        if not self._limits:
+            return
+        x_max = max(limit[0] for limit in self._limits.values())
+        y_max = max(limit[1] for limit in self._limits.values())
+        x_limits = (0, max(x_max, 1) * 1.02)
+        y_limits = (0, max(y_max, 1) * 1.05)
+        if self.ax.get_xlim() != x_limits:
+            self.ax.set_xlim(x_limits)
+        if self.ax.get_ylim() != y_limits:
+            self.ax.set_ylim(y_limits)
+
+    def _update_legend(self, order):
+        order = order[:self.MAX_LEGEND_SERIES]
+        labels = [self._labels[key] for key in order]
+        if labels == self._legend_labels:
+            return
+        self._legend_labels = labels
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if labels:
+            handles = [line for key in order for line in self._lines[key]]
+            self.ax.legend(handles=handles, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
+
+    def _on_draw(self, _event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._hover_text)
+
+    def _blit(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self._hover_text)
+        self.canvas.blit(self.ax.bbox)
+
+
+def nearest_index(values, value):
+    """Index of the entry of sorted ``values`` closest to ``value``."""
+    index = int(np.clip(np.searchsorted(values, value), 1, max(len(values) - 1, 1)))
+    if len(values) < 2 or abs(values[index - 1] - value) <= abs(values[index] - value):
+        return index - 1
+    return index
+
+
+class SensitivityHeatmap:
+    """
+    Heatmap of a 2-D sensitivity grid with a blitted hover readout.
+
+    The grid is colormapped once into an RGBA image that is cached per
+    grid, so redraws, resizes and switching back to an earlier grid never
+    re-run the colormap. The hover readout indexes the grid array directly.
+    """
+
+    CACHE_SIZE = 8
+
+    def __init__(self, figure, ax, canvas, cmap='viridis'):
+        from matplotlib import colormaps
+        from matplotlib.cm import ScalarMappable
+        from matplotlib.colors import Normalize
+
+        self.figure = figure
+        self.ax = ax
+        self.canvas = canvas
+        self.cmap = colormaps[cmap]
+        self._images = OrderedDict()
+        self._image = None
+        self._grid = None
+        self._x_values = self._y_values = None
+        self._labels = ("", "", "")
+        self._background = None
+        self._mappable = ScalarMappable(Normalize(0, 1), self.cmap)
+        self._colorbar = figure.colorbar(self._mappable, ax=ax)
+        self._hover_text = ax.text(
+            0.01, 0.98, "", transform=ax.transAxes, va='top', ha='left', animated=True,
+            bbox={'boxstyle': 'round', 'facecolor': 'white', 'alpha': 0.8},
+        )
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def show(self, key, grid, x_values, y_values, x_label, y_label, label):
+        """
+        Display ``grid`` and redraw once.
+
+        Args:
+            key (Hashable): Identifies the grid contents for the image cache.
+            grid (numpy.ndarray): Values, one row per entry of ``y_values``.
+            x_values (numpy.ndarray): Sorted column coordinates.
+            y_values (numpy.ndarray): Sorted row coordinates.
+            x_label (str): Axis label for the columns.
+            y_label (str): Axis label for the rows.
+            label (str): Name of the plotted metric.
+        """
+        image, vmin, vmax = self._colormapped(key, grid)
+        self._grid = grid
+        self._x_values = np.asarray(x_values)
+        self._y_values = np.asarray(y_values)
+        self._labels = (x_label, y_label, label)
+        extent = (*self._edges(self._x_values), *self._edges(self._y_values))
+        if self._image is None:
+            self._image = self.ax.imshow(image, origin='lower', aspect='auto', extent=extent, interpolation='nearest')
+        else:
+            self._image.set_data(image)
+            self._image.set_extent(extent)
+        self._mappable.norm.vmin, self._mappable.norm.vmax = vmin, vmax
+        self._colorbar.update_normal(self._mappable)
+        self._colorbar.set_label(label)
+        self.ax.set_xlabel(x_label)
+        self.ax.set_ylabel(y_label)
+        self._hover_text.set_text("")
+        self.canvas.draw_idle()
+
+    def value_at(self, xdata, ydata):
+        """
+        Grid cell nearest to a point in data coordinates.
+
+        Returns:
+            tuple | None: ``(x, y, value)`` or ``None`` if nothing is shown.
+        """
+        if self._grid is None:
+            return None
+        column = nearest_index(self._x_values, xdata)
+        row = nearest_index(self._y_values, ydata)
+        return self._x_values[column], self._y_values[row], self._grid[row, column]
+
+    def hover(self, xdata, ydata):
+        """Show the readout at a point, or hide it when ``xdata`` is None."""
+        text = ""
+        cell = None if xdata is None or ydata is None else self.value_at(xdata, ydata)
+        if cell is not None:
+            lines = (f"{label}: {value:,.2f}" for label, value in zip(self._labels, cell))
+            # Escaped so paired dollar signs are not parsed as mathtext
+            text = "\n".join(lines).replace("$", "\\$")
+        if text == self._hover_text.get_text():
+            return
+        self._hover_text.set_text(text)
+        self._blit()
+
+    def _colormapped(self, key, grid):
+        cached = self._images.get(key)
+        if cached is None:
+            finite = grid[np.isfinite(grid)]
+            vmin, vmax = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+            scaled = (grid - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(grid)
+            cached = self.cmap(np.ma.masked_invalid(scaled), bytes=True), vmin, vmax
+            self._images[key] = cached
+            while len(self._images) > self.CACHE_SIZE:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(key)
+        return cached
+
+    @staticmethod
+    def _edges(values):
+        if len(values) < 2:
+            return float(values[0]) - 0.5, float(values[0]) + 0.5
+        half_step = (values[-1] - values[0]) / (len(values) - 1) / 2
+        return float(values[0] - half_step), float(values[-1] + half_step)
+
+    def _on_draw(self, _event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._hover_text)
+
+    def _blit(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self._hover_text)
+        self.canvas.blit(self.ax.bbox)
@@ -0,0 +1,209 @@
+"""
+This module streams amortization schedules to CSV, NPZ and Parquet files.
+Schedules are produced in fixed-size chunks by a generator pipeline, so the
+memory used by an export does not grow with the number of loans exported.
+It has no Qt dependency and can be used from the GUI or from scripts.
+"""
+
+import os
+import zipfile
+
+import numpy as np
+
+from .financial_calculations import LoanBatch
+
+SCHEDULE_COLUMNS = ('scenario', 'month', 'payment', 'principal', 'interest', 'balance')
+CSV_ROW_FORMAT = "%d,%d,%.2f,%.2f,%.2f,%.2f\n"
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def iter_schedule_chunks(loans, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream the schedules of many loans as column chunks.
+
+    Args:
+        loans (LoanBatch | Iterable[Loan]): Loans to export. Their position
+            is written to the ``scenario`` column.
+        chunk_rows (int): Approximate number of schedule rows per chunk.
+
+    Yields:
+        dict: One array per name in ``SCHEDULE_COLUMNS``.
+    """
+    if isinstance(loans, LoanBatch):
+        yield from _iter_batch_chunks(loans, chunk_rows)
+        return
+
+    pending, pending_rows = [], 0
+    for index, loan in enumerate(loans):
+        schedule = loan.calculate_amortization()
+        pending.append((index, schedule))
+        pending_rows += len(schedule)
+        if pending_rows >= chunk_rows:
+            yield _concatenate(pending)
+            pending, pending_rows = [], 0
+    if pending:
+        yield _concatenate(pending)
+
+
+def _iter_batch_chunks(batch, chunk_rows):
+    if not len(batch):
+        return
+    loans_per_chunk = max(chunk_rows // max(int(batch.num_payments.max()), 1), 1)
+    for start in range(0, len(batch), loans_per_chunk):
+        schedule = batch[start:start + loans_per_chunk].generate_amortization_schedule().ragged()
+        chunk = {column: schedule[column] for column in SCHEDULE_COLUMNS[1:]}
+        chunk['scenario'] = schedule['loan'] + start
+        yield chunk
+
+
+def _concatenate(schedules):
+    chunk = {
+        column: np.concatenate([getattr(schedule, column) for _, schedule in schedules])
+        for column in SCHEDULE_COLUMNS[1:]
+    }
+    chunk['scenario'] = np.repeat([index for index, _ in schedules], [len(schedule) for _, schedule in schedules])
+    return chunk
+
+
+class CsvScheduleWriter:
+    """
+    Writes schedule chunks as CSV, formatting each chunk into one block.
+
+    Accepts a path or an already open text file, which is left open.
+    """
+
+    def __init__(self, file):
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self.file = open(file, 'w', newline='', encoding='utf-8') if self._owns_file else file
+        self.file.write(",".join(SCHEDULE_COLUMNS) + "\n")
+
+    def write(self, chunk):
+        # tolist() yields plain Python numbers, which format much faster than
+        # the NumPy scalars np.savetxt works through row by row.
+        rows = zip(*(chunk[column].tolist() for column in SCHEDULE_COLUMNS))
+        self.file.write("".join(map(CSV_ROW_FORMAT.__mod__, rows)))
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NpzScheduleWriter:
+    """
+    Writes schedule chunks into a compressed ``.npz`` archive.
+
+    Every chunk is stored as its own ``<column>_<chunk>`` member, so chunks
+    are compressed and written as they arrive. ``read_npz_schedules``
+    reassembles the columns.
+    """
+
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        self.chunks = 0
+
+    def write(self, chunk):
+        for column in SCHEDULE_COLUMNS:
+            with self.archive.open(f"{column}_{self.chunks:06d}.npy", 'w', force_zip64=True) as member:
+                np.lib.format.write_array(member, np.ascontiguousarray(chunk[column]), allow_pickle=False)
+        self.chunks += 1
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetScheduleWriter:
+    """
+    Writes schedule chunks to Parquet, one row group per chunk.
+
+    Requires the optional ``pyarrow`` package.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from error
+        self._pa = pa
+        self.schema = pa.schema([
+            ('scenario', pa.int64()), ('month', pa.int64()),
+            *((column, pa.float64()) for column in SCHEDULE_COLUMNS[2:]),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+
+    def write(self, chunk):
+        arrays = [self._pa.array(np.asarray(chunk[field.name], dtype=field.type.to_pandas_dtype()))
+                  for field in self.schema]
+        self.writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+WRITERS = {
+    'csv': CsvScheduleWriter,
+    'npz': NpzScheduleWriter,
+    'parquet': ParquetScheduleWriter,
+}
+
+
+def export_schedules(path, loans, file_format=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Export the schedules of ``loans`` to ``path``.
+
+    Args:
+        path (str | os.PathLike): Destination file.
+        loans (LoanBatch | Iterable[Loan]): Loans to export.
+        file_format (str | None): ``csv``, ``npz`` or ``parquet``; inferred
+            from the file extension when omitted.
+        chunk_rows (int): Approximate number of rows held in memory at once.
+
+    Returns:
+        int: Number of schedule rows written.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    file_format = (file_format or os.path.splitext(os.fspath(path))[1].lstrip('.')).lower()
+    if file_format not in WRITERS:
+        raise ValueError(f"Unsupported export format: {file_format!r}")
+    rows = 0
+    with WRITERS[file_format](path) as writer:
+        for chunk in iter_schedule_chunks(loans, chunk_rows):
+            writer.write(chunk)
+            rows += len(chunk['month'])
+    return rows
+
+
+def read_npz_schedules(path):
+    """
+    Load an archive written by ``NpzScheduleWriter`` into whole columns.
+
+    Returns:
+        dict: One concatenated array per name in ``SCHEDULE_COLUMNS``.
+    """
+    with np.load(path) as archive:
+        names = sorted(archive.files)
+        columns = {}
+        for column in SCHEDULE_COLUMNS:
+            parts = [archive[name] for name in names if name.rsplit('_', 1)[0] == column]
+            columns[column] = np.concatenate(parts) if parts else np.empty(0)
+        return columns
@@ -0,0 +1,384 @@
+"""
+This module provides vectorized loan calculations shared across the app.
+LoanBatch prices whole loan tapes with NumPy arrays instead of one Loan
+object per row, using the same closed forms as the scalar Loan model.
+"""
+
+import numpy as np
+
+from ..models.amortization import PAYOFF_TOLERANCE, remaining_balance, summarize
+from ..models.fixed_point import amortize_cents, check_rounding, fits_int64, rate_units, summarize_cents, to_cents
+from ..models.loan import Loan
+from .apr import amount_financed, level_irr, schedule_irr
+
+
+class BatchSchedule:
+    """
+    Amortization schedules of a LoanBatch as padded 2-D columns.
+
+    Row ``i`` holds loan ``i``; months past its payoff are filled with
+    ``fill_value`` (``0`` in the month column). ``num_months`` gives the
+    valid length of every row.
+    """
+
+    COLUMNS = ('month', 'payment', 'principal', 'interest', 'balance')
+
+    def __init__(self, month, payment, principal, interest, balance, num_months):
+        self.month = month
+        self.payment = payment
+        self.principal = principal
+        self.interest = interest
+        self.balance = balance
+        self.num_months = num_months
+
+    def __len__(self):
+        return len(self.num_months)
+
+    def ragged(self):
+        """
+        Flatten the padded columns into ragged, CSR-style arrays.
+
+        Returns:
+            dict: One flat array per column plus ``offsets``, so loan ``i``
+            spans ``offsets[i]:offsets[i + 1]`` and ``loan`` gives the owning
+            loan index of every row.
+        """
+        valid = self.month > 0
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(self.num_months, out=offsets[1:])
+        ragged = {column: getattr(self, column)[valid] for column in self.COLUMNS}
+        ragged['loan'] = np.repeat(np.arange(len(self)), self.num_months)
+        ragged['offsets'] = offsets
+        return ragged
+
+
+class LoanBatch:
+    """
+    Struct-of-arrays collection of loans priced in one NumPy pass.
+
+    Arguments follow ``Loan`` and broadcast against each other, so a scalar
+    rate can be combined with an array of principals. ``rate_schedules`` is
+    ``None`` or one ``RateSchedule`` (or ``None``) per loan and
+    ``prepayments`` is ``None`` or one sequence of ``Prepayment`` events per
+    loan; adjustable-rate loans and loans with prepayments are priced segment
+    by segment and the rest stay vectorized. ``rounding`` is ``None`` or one
+    rounding mode (or ``None`` for the float engine) per loan; regular
+    cent-exact loans share the int64 kernel of ``amortize_cents``. ``fees``
+    and ``points`` broadcast like the other parameters and only affect
+    ``calculate_apr``.
+    """
+
+    def __init__(self, principal, interest_rate, term, down_payment=0, extra_payment=0, rate_schedules=None,
+                 prepayments=None, rounding=None, fees=0, points=0):
+        arrays = np.broadcast_arrays(
+            np.asarray(principal, dtype=float),
+            np.asarray(interest_rate, dtype=float),
+            np.asarray(term, dtype=np.int64),
+            np.asarray(down_payment, dtype=float),
+            np.asarray(extra_payment, dtype=float),
+            np.asarray(fees, dtype=float),
+            np.asarray(points, dtype=float),
+        )
+        (self.principal, self.interest_rate, self.term, self.down_payment, self.extra_payment, self.fees,
+         self.points) = (np.atleast_1d(array).ravel() for array in arrays)
+        if rate_schedules is not None:
+            rate_schedules = list(rate_schedules)
+            if len(rate_schedules) != len(self.principal):
+                raise ValueError("rate_schedules needs one entry per loan")
+            if all(schedule is None for schedule in rate_schedules):
+                rate_schedules = None
+        self.rate_schedules = rate_schedules
+        if prepayments is not None:
+            prepayments = [tuple(events) for events in prepayments]
+            if len(prepayments) != len(self.principal):
+                raise ValueError("prepayments needs one entry per loan")
+            if not any(prepayments):
+                prepayments = None
+        self.prepayments = prepayments
+        if rounding is not None:
+            rounding = list(rounding)
+            if len(rounding) != len(self.principal):
+                raise ValueError("rounding needs one entry per loan")
+            for mode in set(rounding) - {None}:
+                check_rounding(mode)
+            if all(mode is None for mode in rounding):
+                rounding = None
+        self.rounding = rounding
+
+    @classmethod
+    def from_loans(cls, loans):
+        """
+        Build a batch from an iterable of ``Loan`` objects.
+
+        Args:
+            loans (Iterable[Loan]): Loans to combine.
+
+        Returns:
+            LoanBatch: Batch with one row per loan.
+        """
+        loans = list(loans)
+        return cls(
+            [loan.principal for loan in loans],
+            [loan.interest_rate for loan in loans],
+            [loan.term for loan in loans],
+            [loan.down_payment for loan in loans],
+            [loan.extra_payment for loan in loans],
+            [loan.rate_schedule for loan in loans],
+            [loan.prepayments for loan in loans],
+            [loan.rounding for loan in loans],
+            [loan.fees for loan in loans],
+            [loan.points for loan in loans],
+        )
+
+    def __len__(self):
+        return len(self.principal)
+
+    def __getitem__(self, index):
+        if np.isscalar(index):
+            return Loan(
+                float(self.principal[index]),
+                float(self.interest_rate[index]),
+                int(self.term[index]),
+                float(self.down_payment[index]),
+                float(self.extra_payment[index]),
+                None if self.rate_schedules is None else self.rate_schedules[index],
+                () if self.prepayments is None else self.prepayments[index],
+                None if self.rounding is None else self.rounding[index],
+                float(self.fees[index]),
+                float(self.points[index]),
+            )
+        rate_schedules = prepayments = rounding = None
+        positions = np.arange(len(self))[index]
+        if self.rate_schedules is not None:
+            rate_schedules = [self.rate_schedules[i] for i in positions]
+        if self.prepayments is not None:
+            prepayments = [self.prepayments[i] for i in positions]
+        if self.rounding is not None:
+            rounding = [self.rounding[i] for i in positions]
+        return LoanBatch(
+            self.principal[index],
+            self.interest_rate[index],
+            self.term[index],
+            self.down_payment[index],
+            self.extra_payment[index],
+            rate_schedules,
+            prepayments,
+            rounding,
+            self.fees[index],
+            self.points[index],
+        )
+
+    def variable_rate_indices(self):
+        """Positions of the adjustable-rate loans in the batch."""
+        if self.rate_schedules is None:
+            return []
+        return [i for i, schedule in enumerate(self.rate_schedules) if schedule is not None]
+
+    def prepayment_indices(self):
+        """Positions of the loans with prepayment events in the batch."""
+        if self.prepayments is None:
+            return []
+        return [i for i, events in enumerate(self.prepayments) if events]
+
+    def wide_cent_indices(self):
+        """
+        Positions of the cent-exact loans too large for the int64 kernel.
+
+        Their balance times rate would wrap around, so they are priced one by
+        one on plain ints instead.
+        """
+        if self.rounding is None:
+            return []
+        rows = np.array([i for i, mode in enumerate(self.rounding) if mode is not None], dtype=int)
+        fits = fits_int64(to_cents(self.loan_amount[rows]), rate_units(self.monthly_rate[rows]))
+        return rows[~fits].tolist()
+
+    def irregular_indices(self):
+        """Positions of the loans priced one by one instead of vectorized."""
+        return sorted(
+            set(self.variable_rate_indices()) | set(self.prepayment_indices()) | set(self.wide_cent_indices())
+        )
+
+    def cent_groups(self):
+        """
+        Regular cent-exact loans grouped by rounding mode.
+
+        Returns:
+            dict: Rounding mode -> positions of the level-payment loans that
+            use it; irregular loans are left to the per-loan engine.
+        """
+        if self.rounding is None:
+            return {}
+        irregular = set(self.irregular_indices())
+        groups = {}
+        for i, mode in enumerate(self.rounding):
+            if mode is not None and i not in irregular:
+                groups.setdefault(mode, []).append(i)
+        return {mode: np.array(rows) for mode, rows in groups.items()}
+
+    def cent_arguments(self, rows, rounding):
+        """
+        Arguments of ``amortize_cents`` for the loans at ``rows``.
+
+        The payment is the level payment of the loan amount in whole cents,
+        rounded like every other amount, as in ``Loan.calculate_amortization``.
+        """
+        loan_cents = to_cents(self.loan_amount[rows], rounding)
+        payment = LoanBatch(loan_cents / 100, self.interest_rate[rows], self.term[rows]).calculate_monthly_payment()
+        return (
+            loan_cents,
+            rate_units(self.monthly_rate[rows]),
+            self.num_payments[rows],
+            to_cents(payment, rounding),
+            to_cents(self.extra_payment[rows], rounding),
+        )
+
+    @property
+    def loan_amount(self):
+        return self.principal - self.down_payment
+
+    @property
+    def monthly_rate(self):
+        return self.interest_rate / 12 / 100
+
+    @property
+    def num_payments(self):
+        return self.term * 12
+
+    def calculate_monthly_payment(self):
+        """
+        Level monthly payment of every loan, before extra payments.
+
+        Returns:
+            numpy.ndarray: Payment per loan.
+        """
+        monthly_rate = self.monthly_rate
+        num_payments = self.num_payments
+        growth = np.power(1 + monthly_rate, num_payments)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payment = self.loan_amount * monthly_rate * growth / (growth - 1)
+            return np.where(monthly_rate == 0, self.loan_amount / num_payments, payment)
+
+    def calculate_loan_summary(self):
+        """
+        Closed-form summary of every loan without building any schedule.
+
+        Returns:
+            dict: Arrays keyed like ``LoanController.get_loan_summary`` plus
+            ``num_months``, the payoff month of each loan. For adjustable-rate
+            loans ``monthly_payment`` is the payment of the fixed period, and
+            it excludes prepayment events. Cent-exact loans report their
+            payment rounded to the cent and exact totals.
+        """
+        monthly_payment = self.calculate_monthly_payment() + self.extra_payment
+        num_months, total_interest, total_payments = summarize(
+            self.loan_amount, self.monthly_rate, self.num_payments, monthly_payment
+        )
+        for mode, rows in self.cent_groups().items():
+            arguments = self.cent_arguments(rows, mode)
+            num_months[rows], interest_cents, payment_cents = summarize_cents(*arguments, mode)
+            total_interest[rows], total_payments[rows] = interest_cents / 100, payment_cents / 100
+            monthly_payment[rows] = (arguments[3] + arguments[4]) / 100
+        max_monthly_payment = monthly_payment.copy()
+        for i in self.irregular_indices():
+            loan = self[i]
+            monthly_payment[i], total_interest[i], total_payments[i], num_months[i] = loan.calculate_loan_summary()
+            max_monthly_payment[i] = max(payment for _, payment in loan.calculate_payments())
+        return {
+            'loan_amount': self.loan_amount,
+            'interest_rate': self.interest_rate,
+            'monthly_payment': monthly_payment,
+            'max_monthly_payment': max_monthly_payment,
+            'total_interest': total_interest,
+            'total_payments': total_payments,
+            'num_months': num_months,
+            'loan_term': num_months / 12,
+        }
+
+    def calculate_apr(self, summary=None):
+        """
+        APR of every loan, with fees and points, in one vectorized solve.
+
+        Level-payment loans are discounted in closed form from their
+        summary: the same payment every month but the last. Adjustable-rate
+        loans and loans with prepayments are discounted over their schedule.
+
+        Args:
+            summary (dict | None): ``calculate_loan_summary()`` of this
+                batch, when already computed.
+
+        Returns:
+            numpy.ndarray: Annual rate in percent per loan; see
+            ``money_analyzer.utils.apr``.
+        """
+        summary = self.calculate_loan_summary() if summary is None else summary
+        financed = amount_financed(self.loan_amount, self.fees, self.points)
+        payment, num_months = summary['monthly_payment'], summary['num_months']
+        final_payment = summary['total_payments'] - payment * np.maximum(num_months - 1, 0)
+        rate = level_irr(financed, payment, num_months, final_payment, self.monthly_rate)
+        for i in self.irregular_indices():
+            schedule = self[i].calculate_amortization()
+            rate[i] = schedule_irr(schedule.principal + schedule.interest, financed[i], self.monthly_rate[i:i + 1])[0]
+        return rate * 12 * 100
+
+    def generate_amortization_schedule(self, fill_value=0.0):
+        """
+        Amortization schedules of all loans as one padded matrix per column.
+
+        Memory grows with ``len(self) * max(num_months)``; slice the batch to
+        bound it for very large tapes.
+
+        Args:
+            fill_value (float): Value stored in the months after payoff.
+
+        Returns:
+            BatchSchedule: Padded schedules; call ``ragged()`` for flat arrays.
+        """
+        loan_amount = self.loan_amount[:, None]
+        monthly_rate = self.monthly_rate[:, None]
+        extra_payment = self.extra_payment[:, None]
+        payment = self.calculate_monthly_payment()[:, None] + extra_payment
+        num_months, _, _ = summarize(loan_amount, monthly_rate, self.num_payments[:, None], payment)
+        num_months = num_months.ravel()
+        irregular = {i: self[i].calculate_amortization() for i in self.irregular_indices()}
+        for i, schedule in irregular.items():
+            num_months[i] = len(schedule)
+        cents = {}
+        for mode, rows in self.cent_groups().items():
+            cents[mode] = rows, amortize_cents(*self.cent_arguments(rows, mode), mode)
+            num_months[rows] = cents[mode][1][0]
+        width = int(num_months.max(initial=0))
+
+        month = np.arange(1, width + 1)
+        balance = remaining_balance(loan_amount, monthly_rate, payment, month)
+        opening = np.empty_like(balance)
+        opening[:, :1] = loan_amount
+        opening[:, 1:] = balance[:, :-1]
+        interest = opening * monthly_rate
+        principal = payment - interest
+        payments = np.broadcast_to(payment, balance.shape).copy()
+
+        rows = np.flatnonzero(num_months > 0)
+        last = num_months[rows] - 1
+        paid_off = balance[rows, last] <= PAYOFF_TOLERANCE * np.abs(loan_amount[rows, 0])
+        rows, last = rows[paid_off], last[paid_off]
+        principal[rows, last] = opening[rows, last]
+        payments[rows, last] = opening[rows, last] + interest[rows, last] + extra_payment[rows, 0]
+        balance[rows, last] = 0.0
+        np.maximum(balance, 0.0, out=balance)
+
+        valid = month[None, :] <= num_months[:, None]
+        columns = [np.where(valid, month[None, :], 0)]
+        columns += [np.where(valid, column, fill_value) for column in (payments, principal, interest, balance)]
+        for i, schedule in irregular.items():
+            # Adjustable-rate and prepayment rows were computed per segment; replace them
+            for column, values in zip(columns, (getattr(schedule, name) for name in BatchSchedule.COLUMNS)):
+                column[i, :len(values)] = values
+        for rows, (counts, *values) in cents.values():
+            # Cent-exact rows come from the int64 kernel; replace them as well
+            # The kernel is as wide as the longest term; keep the paid-off width
+            cent_width = min(width, values[0].shape[1])
+            valid = month[None, :cent_width] <= counts[:, None]
+            for column, cent_values in zip(columns[1:], values):
+                column[rows, :cent_width] = np.where(valid, cent_values[:, :cent_width] / 100, fill_value)
+        return BatchSchedule(*columns, num_months)
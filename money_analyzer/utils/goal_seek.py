@@ -0,0 +1,120 @@
+"""
+This module solves inverse loan problems ("goal seek") for whole arrays of
+targets at once: the extra payment needed to pay a loan off by a given
+month, the largest loan a payment cap allows, and the break-even rate at
+which a payment cap is exactly met. Rates and terms follow ``Loan``
+(annual rate in percent, term in years) and all arguments broadcast.
+"""
+
+import numpy as np
+
+RATE_TOLERANCE = 1e-12  # monthly rate, as a fraction
+MAX_ITERATIONS = 200
+
+
+def annuity_factor(monthly_rate, num_payments):
+    """
+    Present value of 1 paid every month for ``num_payments`` months.
+
+    The level payment of a loan is ``loan_amount / annuity_factor``.
+    """
+    monthly_rate = np.asarray(monthly_rate, dtype=float)
+    num_payments = np.asarray(num_payments, dtype=float)
+    discount = -np.expm1(-num_payments * np.log1p(monthly_rate))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(monthly_rate == 0, num_payments, discount / np.where(monthly_rate == 0, 1, monthly_rate))
+
+
+def required_extra_payment(loan_amount, interest_rate, term, target_months):
+    """
+    Smallest extra monthly payment that pays a loan off by ``target_months``.
+
+    Paying off in ``m`` months takes the level payment of an ``m``-month
+    loan, so the answer is that payment minus the payment over the full
+    term. Targets at or beyond the term need no extra payment.
+
+    Args:
+        loan_amount: Amount borrowed (principal minus down payment).
+        interest_rate: Annual interest rate in percent.
+        term: Loan term in years.
+        target_months: Month by which the loan must be paid off.
+
+    Returns:
+        numpy.ndarray: Extra payment per loan, never negative.
+    """
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    monthly_rate = np.asarray(interest_rate, dtype=float) / 12 / 100
+    num_payments = np.asarray(term) * 12
+    target = np.clip(target_months, 1, num_payments)
+    extra = loan_amount / annuity_factor(monthly_rate, target) - loan_amount / annuity_factor(monthly_rate, num_payments)
+    return np.maximum(extra, 0.0)
+
+
+def max_loan_amount(payment_cap, interest_rate, term, extra_payment=0):
+    """
+    Largest amount that can be borrowed without exceeding ``payment_cap``.
+
+    Args:
+        payment_cap: Highest acceptable monthly payment, including
+            ``extra_payment``.
+        interest_rate: Annual interest rate in percent.
+        term: Loan term in years.
+        extra_payment: Extra principal paid every month.
+
+    Returns:
+        numpy.ndarray: Loan amount per target, ``0`` when the cap does not
+        even cover the extra payment.
+    """
+    monthly_rate = np.asarray(interest_rate, dtype=float) / 12 / 100
+    budget = np.maximum(np.asarray(payment_cap, dtype=float) - extra_payment, 0.0)
+    return budget * annuity_factor(monthly_rate, np.asarray(term) * 12)
+
+
+def break_even_rate(loan_amount, payment_cap, term, extra_payment=0):
+    """
+    Annual rate at which the monthly payment exactly meets ``payment_cap``.
+
+    Any higher rate pushes the payment over the cap. There is no closed
+    form, so the level-payment equation is solved with vectorized Newton
+    steps, falling back to bisection whenever a step leaves the bracket.
+
+    Args:
+        loan_amount: Amount borrowed (principal minus down payment).
+        payment_cap: Highest acceptable monthly payment, including
+            ``extra_payment``.
+        term: Loan term in years.
+        extra_payment: Extra principal paid every month.
+
+    Returns:
+        numpy.ndarray: Annual rate in percent, ``nan`` where the cap is
+        below the payment even at a 0% rate.
+    """
+    loan_amount, budget, num_payments = np.broadcast_arrays(
+        np.asarray(loan_amount, dtype=float),
+        np.asarray(payment_cap, dtype=float) - extra_payment,
+        np.asarray(term, dtype=float) * 12,
+    )
+    # A 0% loan pays loan_amount / n; allow for rounding at that boundary.
+    feasible = (loan_amount > 0) & (budget * num_payments >= loan_amount * (1 - 1e-12))
+    # The payment always exceeds the interest alone, so budget / loan_amount
+    # is an upper bound on the monthly rate.
+    low = np.zeros(loan_amount.shape)
+    high = np.where(feasible, budget / np.where(loan_amount > 0, loan_amount, 1), 0.0)
+    rate = high / 2
+
+    for _ in range(MAX_ITERATIONS):
+        discount = -np.expm1(-num_payments * np.log1p(rate))
+        value = loan_amount / annuity_factor(rate, num_payments) - budget
+        above = value > 0
+        high = np.where(above, rate, high)
+        low = np.where(above, low, rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # d/dr of loan_amount * r / (1 - (1 + r)^-n)
+            slope = loan_amount * (discount - rate * num_payments * np.power(1 + rate, -num_payments - 1)) / discount ** 2
+            newton = rate - value / slope
+        inside = np.isfinite(newton) & (newton > low) & (newton < high)
+        rate = np.where(inside, newton, (low + high) / 2)
+        if np.all(~feasible | (high - low <= RATE_TOLERANCE) | (np.abs(value) <= 1e-12 * budget)):
+            break
+
+    return np.where(feasible, rate * 12 * 100, np.nan)
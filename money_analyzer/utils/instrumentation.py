@@ -0,0 +1,175 @@
+"""
+This module provides the timing spans behind the Performance dock.
+Hot paths are wrapped with ``timed``; while the shared profiler is enabled
+every call records its duration into a fixed-size ring buffer per stage, so
+memory stays bounded and percentiles reflect the most recent calls. While it
+is disabled a span costs a single flag check.
+"""
+
+import csv
+import functools
+import json
+import threading
+import time
+
+import numpy as np
+
+from ..config import PROFILER_CAPACITY, PROFILER_RATE_WINDOW_S
+
+
+class RingHistogram:
+    """
+    Durations of the latest ``capacity`` calls of one stage.
+
+    Samples overwrite the oldest ones once the buffer is full; ``count``
+    keeps the total number of calls ever recorded.
+    """
+
+    def __init__(self, capacity=PROFILER_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        # Plain lists: storing a float is cheaper than into a NumPy array
+        self._durations = [0.0] * capacity
+        self._times = [0.0] * capacity
+        self._lock = threading.Lock()
+
+    def record(self, duration, now=None):
+        """Add one call of ``duration`` seconds that ended at ``now``."""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            index = self.count % self.capacity
+            self._durations[index] = duration
+            self._times[index] = now
+            self.count += 1
+
+    def clear(self):
+        with self._lock:
+            self.count = 0
+
+    def snapshot(self, percentiles=(50, 95), window=PROFILER_RATE_WINDOW_S, now=None):
+        """
+        Summary of the retained samples.
+
+        Args:
+            percentiles (Sequence[float]): Percentiles of the duration.
+            window (float): Seconds over which the call rate is measured.
+            now (float | None): ``time.perf_counter()`` reading to measure
+                the rate up to; defaults to the current time.
+
+        Returns:
+            dict: ``count``, ``p<N>_ms`` per percentile, ``max_ms`` and
+            ``rate_per_sec``; durations are ``None`` before the first call.
+        """
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            retained = min(self.count, self.capacity)
+            durations = np.array(self._durations[:retained])
+            times = np.array(self._times[:retained])
+            count = self.count
+        summary = {'count': count}
+        for percentile in percentiles:
+            summary[f'p{percentile:g}_ms'] = float(np.percentile(durations, percentile)) * 1e3 if retained else None
+        summary['max_ms'] = float(durations.max()) * 1e3 if retained else None
+        summary['rate_per_sec'] = int(np.count_nonzero(times >= now - window)) / window
+        return summary
+
+
+class Profiler:
+    """
+    Named ring-buffer histograms that are only filled while enabled.
+
+    Caches registered with ``add_cache`` are reported next to the spans, so
+    a slow stage can be told apart from one that simply misses its cache.
+    """
+
+    def __init__(self, capacity=PROFILER_CAPACITY):
+        self.enabled = False
+        self.capacity = capacity
+        self._histograms = {}
+        self._caches = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def histogram(self, name):
+        """The histogram of stage ``name``, created on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms.setdefault(name, RingHistogram(self.capacity))
+        return histogram
+
+    def add_cache(self, name, cache):
+        """Report ``cache.stats()`` under ``name``."""
+        self._caches[name] = cache
+
+    def timed(self, name):
+        """
+        Decorator recording every call of the wrapped function as stage ``name``.
+
+        The wrapper takes ``*args``, so Qt hands it every argument of a
+        signal; connect signals to wrapped methods through a lambda.
+
+        Returns:
+            Callable: Decorator; the wrapped function behaves as before.
+        """
+        histogram = self.histogram(name)
+
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    end = time.perf_counter()
+                    histogram.record(end - start, end)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        """Drop every recorded sample; registered caches are left alone."""
+        for histogram in self._histograms.values():
+            histogram.clear()
+
+    def snapshot(self, window=PROFILER_RATE_WINDOW_S):
+        """
+        Current statistics of every stage and cache.
+
+        Returns:
+            dict: ``spans`` (stage -> ``RingHistogram.snapshot``) and
+            ``caches`` (name -> ``stats()``), both sorted by name.
+        """
+        now = time.perf_counter()
+        return {
+            'spans': {
+                name: self._histograms[name].snapshot(window=window, now=now) for name in sorted(self._histograms)
+            },
+            'caches': {name: self._caches[name].stats() for name in sorted(self._caches)},
+        }
+
+    def export(self, path):
+        """
+        Write the current snapshot to ``path``.
+
+        A ``.csv`` path gets one row per stage; any other path gets JSON
+        with the caches included.
+        """
+        snapshot = self.snapshot()
+        if str(path).lower().endswith('.csv'):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                rows = [{'stage': name, **summary} for name, summary in snapshot['spans'].items()]
+                writer = csv.DictWriter(f, fieldnames=['stage', 'count', 'p50_ms', 'p95_ms', 'max_ms', 'rate_per_sec'])
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=2)
+
+
+profiler = Profiler()
+timed = profiler.timed
@@ -0,0 +1,350 @@
+"""
+This module prices loan tapes too large to hold in memory.
+A tape (CSV, or NPY with one row per loan) is memory-mapped and cut into
+fixed-size chunks; worker processes price each chunk as a LoanBatch, write
+its per-loan summaries straight into a preallocated ``summaries.npy`` that
+every process maps shared, and return the chunk's monthly cash flows. The
+parent adds those up chunk by chunk in tape order, so peak memory depends on
+the chunk size and the number of workers, not on the tape, and the totals do
+not depend on the number of workers. Progress is checkpointed next to the
+summaries, so an interrupted run resumes where it stopped.
+"""
+
+import csv
+import json
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from ..config import PORTFOLIO_CHECKPOINT_S, PORTFOLIO_CHUNK_SIZE
+from ..models.fixed_point import check_rounding
+from .financial_calculations import LoanBatch
+
+PORTFOLIO_FORMAT = "money-analyzer-portfolio"
+PORTFOLIO_VERSION = 1
+CHECKPOINT_NAME = "checkpoint.json"
+SUMMARIES_NAME = "summaries.npy"
+TAPE_COLUMNS = ('principal', 'interest_rate', 'term', 'down_payment', 'extra_payment', 'fees', 'points')
+REQUIRED_COLUMNS = TAPE_COLUMNS[:3]
+SUMMARY_FIELDS = ('loan_amount', 'monthly_payment', 'total_interest', 'total_payments', 'num_months', 'apr')
+CASH_FLOW_COLUMNS = ('payment', 'principal', 'interest', 'balance')
+SCAN_BLOCK_BYTES = 1 << 24
+
+
+class NpyTape:
+    """
+    Loan tape stored as an ``.npy`` array.
+
+    Either a structured array with fields named like ``TAPE_COLUMNS`` or a
+    2-D array whose columns follow ``TAPE_COLUMNS``; ``principal``,
+    ``interest_rate`` and ``term`` are required and the rest default to 0.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        array = np.load(self.path, mmap_mode='r')
+        if array.dtype.names is not None:
+            missing = set(REQUIRED_COLUMNS) - set(array.dtype.names)
+            if missing or array.ndim != 1:
+                raise ValueError(f"NPY tape needs one row per loan with fields {', '.join(REQUIRED_COLUMNS)}")
+        elif array.ndim != 2 or not len(REQUIRED_COLUMNS) <= array.shape[1] <= len(TAPE_COLUMNS):
+            raise ValueError(f"NPY tape needs {len(REQUIRED_COLUMNS)} to {len(TAPE_COLUMNS)} columns: "
+                             + ", ".join(TAPE_COLUMNS))
+        self.num_loans = len(array)
+
+    def __len__(self):
+        return self.num_loans
+
+    def chunks(self, chunk_size):
+        """``(start, stop, location)`` of every chunk; NPY rows need no location."""
+        return [(start, min(start + chunk_size, self.num_loans), None)
+                for start in range(0, self.num_loans, chunk_size)]
+
+    def read(self, start, stop, location=None, rounding=None):
+        """Loans ``start:stop`` as a LoanBatch; only those rows are paged in."""
+        rows = np.load(self.path, mmap_mode='r')[start:stop]
+        if rows.dtype.names is not None:
+            columns = {name: np.array(rows[name], dtype=float) for name in TAPE_COLUMNS if name in rows.dtype.names}
+        else:
+            columns = {name: np.array(rows[:, i], dtype=float) for i, name in enumerate(TAPE_COLUMNS[:rows.shape[1]])}
+        return _tape_batch(columns, rounding)
+
+
+class CsvTape:
+    """
+    Loan tape stored as CSV with a header naming ``TAPE_COLUMNS``.
+
+    Opening the tape scans the memory-mapped file once for line breaks in
+    fixed-size blocks and keeps only the byte offset of every chunk, so the
+    index stays small however long the file is. Fields must not contain
+    line breaks; empty fields count as 0.
+    """
+
+    def __init__(self, path, chunk_size=PORTFOLIO_CHUNK_SIZE):
+        self.path = os.path.abspath(path)
+        with open(self.path, 'rb') as f:
+            self.header = next(csv.reader([f.readline().decode()]), [])
+        missing = set(REQUIRED_COLUMNS) - {name.strip() for name in self.header}
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+        self.header = [name.strip() for name in self.header]
+        self._scan(chunk_size)
+
+    def __len__(self):
+        return self.num_loans
+
+    def _scan(self, chunk_size):
+        # Byte offset of every chunk_size-th row, plus the end of the file
+        starts, num_rows = [], 0
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            position = data.find(b'\n') + 1 or size
+            for offset in range(position, size, SCAN_BLOCK_BYTES):
+                block = np.frombuffer(data, dtype=np.uint8, count=min(SCAN_BLOCK_BYTES, size - offset), offset=offset)
+                breaks = np.flatnonzero(block == ord('\n')) + offset
+                del block
+                if not len(breaks):
+                    continue
+                # Every line break ends one row; the next starts right after it
+                row_starts = np.concatenate(([position], breaks[:-1] + 1))
+                rows = num_rows + np.arange(len(breaks))
+                starts.extend(row_starts[rows % chunk_size == 0].tolist())
+                num_rows += len(breaks)
+                position = int(breaks[-1]) + 1
+            if data[position:size].strip():
+                # The last row has no line break
+                if num_rows % chunk_size == 0:
+                    starts.append(position)
+                num_rows += 1
+        self.num_loans = num_rows
+        self._chunk_size = chunk_size
+        self._row_starts = starts + [size]
+
+    def chunks(self, chunk_size):
+        """``(start, stop, (byte_start, byte_stop))`` of every chunk."""
+        if chunk_size != self._chunk_size:
+            self._scan(chunk_size)
+        starts = self._row_starts
+        return [
+            (i * chunk_size, min((i + 1) * chunk_size, self.num_loans), (starts[i], starts[i + 1]))
+            for i in range(len(starts) - 1)
+        ]
+
+    def read(self, start, stop, location, rounding=None):
+        """Loans ``start:stop`` found at bytes ``location`` as a LoanBatch."""
+        byte_start, byte_stop = location
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            text = data[byte_start:byte_stop].decode()
+        rows = list(csv.reader(text.splitlines()))
+        if len(rows) != stop - start or not all(rows):
+            raise ValueError(f"CSV rows {start}:{stop} could not be read; blank lines are not allowed")
+        columns = {}
+        for name in TAPE_COLUMNS:
+            if name in self.header:
+                index = self.header.index(name)
+                columns[name] = np.array([float(row[index] or 0) for row in rows])
+        return _tape_batch(columns, rounding)
+
+
+def open_tape(path):
+    """A ``NpyTape`` for ``.npy`` files and a ``CsvTape`` for anything else."""
+    return NpyTape(path) if os.fspath(path).lower().endswith('.npy') else CsvTape(path)
+
+
+def _tape_batch(columns, rounding=None):
+    num_loans = len(columns['principal'])
+    return LoanBatch(
+        *(columns.get(name, 0.0) for name in TAPE_COLUMNS[:5]),
+        rounding=None if rounding is None else [rounding] * num_loans,
+        fees=columns.get('fees', 0.0), points=columns.get('points', 0.0),
+    )
+
+
+class PortfolioResult:
+    """
+    Per-loan summaries and portfolio cash flows of a processed tape.
+
+    ``summaries`` is a read-only memory map with one record per loan and a
+    field per ``SUMMARY_FIELDS``; the cash-flow arrays hold the sum over all
+    loans for every month since origination.
+    """
+
+    def __init__(self, summaries, cash_flows, num_chunks, resumed_chunks):
+        self.summaries = summaries
+        self.months = np.arange(1, len(cash_flows['payment']) + 1)
+        self.payment = cash_flows['payment']
+        self.principal = cash_flows['principal']
+        self.interest = cash_flows['interest']
+        self.balance = cash_flows['balance']
+        self.num_chunks = num_chunks
+        self.resumed_chunks = resumed_chunks
+
+    def __len__(self):
+        return len(self.summaries)
+
+
+def process_tape(path, output_dir, chunk_size=PORTFOLIO_CHUNK_SIZE, workers=None, rounding=None, restart=False,
+                 checkpoint_interval=PORTFOLIO_CHECKPOINT_S):
+    """
+    Price every loan of a tape chunk by chunk, resuming an interrupted run.
+
+    Args:
+        path (str): CSV or ``.npy`` loan tape; see ``CsvTape`` and ``NpyTape``.
+        output_dir (str): Directory for ``summaries.npy`` and the checkpoint.
+        chunk_size (int): Loans priced per task.
+        workers (int | None): Processes to spread the chunks over; ``None``
+            uses every core and ``1`` runs in this process.
+        rounding (str | None): Rounding mode of the cent-exact engine for
+            every loan, or ``None`` for the float engine.
+        restart (bool): Start over even if ``output_dir`` holds a run of a
+            different tape or different settings.
+        checkpoint_interval (float): Seconds between checkpoints; one is
+            also written when the run stops for any reason.
+
+    Returns:
+        PortfolioResult: Summaries and cash flows of the whole tape.
+
+    Raises:
+        ValueError: If ``output_dir`` holds a different run and ``restart``
+            is false.
+    """
+    if rounding is not None:
+        check_rounding(rounding)
+    tape = open_tape(path)
+    chunks = tape.chunks(chunk_size)
+    os.makedirs(output_dir, exist_ok=True)
+    summaries_path = os.path.join(output_dir, SUMMARIES_NAME)
+    run = _run_manifest(tape, chunk_size, rounding)
+    checkpoint = _read_checkpoint(output_dir)
+    if checkpoint is not None and any(checkpoint.get(key) != value for key, value in run.items()):
+        if not restart:
+            raise ValueError(f"{output_dir} holds a checkpoint of a different run; restart it or use another directory")
+        checkpoint = None
+    if checkpoint is None or not os.path.exists(summaries_path):
+        # Preallocated on disk: every worker maps it shared and fills its rows
+        dtype = np.dtype([(name, np.float64) for name in SUMMARY_FIELDS])
+        summaries = np.lib.format.open_memmap(summaries_path, mode='w+', dtype=dtype, shape=(len(tape),))
+        del summaries
+        checkpoint = dict(run, next_chunk=0, cash_flows={column: [] for column in CASH_FLOW_COLUMNS})
+
+    resumed = first = checkpoint['next_chunk']
+    totals = {column: np.array(values, dtype=float) for column, values in checkpoint['cash_flows'].items()}
+    workers = max(1, min((os.cpu_count() or 1) if workers is None else workers, len(chunks) - first))
+    last_checkpoint = time.monotonic()
+
+    def add(cash_flows):
+        for column, values in cash_flows.items():
+            total = totals[column]
+            if len(values) > len(total):
+                total = totals[column] = np.concatenate((total, np.zeros(len(values) - len(total))))
+            total[:len(values)] += values
+
+    def save(next_chunk):
+        checkpoint['next_chunk'] = next_chunk
+        checkpoint['cash_flows'] = {column: values.tolist() for column, values in totals.items()}
+        _write_checkpoint(output_dir, checkpoint)
+
+    next_chunk = first
+    try:
+        if workers == 1:
+            for next_chunk in range(first, len(chunks)):
+                add(_price_chunk(tape, summaries_path, chunks[next_chunk], rounding))
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    save(next_chunk + 1)
+                    last_checkpoint = time.monotonic()
+            next_chunk = len(chunks)
+        else:
+            # spawn, not fork: the GUI process runs Qt threads
+            executor = ProcessPoolExecutor(workers, mp_context=get_context('spawn'))
+            try:
+                # A bounded window of chunks in flight, added up in tape order
+                pending, queued = deque(), iter(range(first, len(chunks)))
+                for index in queued:
+                    pending.append(executor.submit(_price_chunk, tape, summaries_path, chunks[index], rounding))
+                    if len(pending) >= 2 * workers:
+                        break
+                while pending:
+                    add(pending.popleft().result())
+                    next_chunk += 1
+                    index = next(queued, None)
+                    if index is not None:
+                        pending.append(executor.submit(_price_chunk, tape, summaries_path, chunks[index], rounding))
+                    if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                        save(next_chunk)
+                        last_checkpoint = time.monotonic()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        save(next_chunk)
+
+    summaries = np.load(summaries_path, mmap_mode='r')
+    return PortfolioResult(summaries, totals, len(chunks), resumed)
+
+
+def load_result(output_dir):
+    """
+    The result of a finished run in ``output_dir``.
+
+    Raises:
+        ValueError: If the run has not finished.
+    """
+    checkpoint = _read_checkpoint(output_dir)
+    if checkpoint is None or checkpoint['next_chunk'] < checkpoint['num_chunks']:
+        raise ValueError(f"{output_dir} does not hold a finished run")
+    totals = {column: np.array(values, dtype=float) for column, values in checkpoint['cash_flows'].items()}
+    summaries = np.load(os.path.join(output_dir, SUMMARIES_NAME), mmap_mode='r')
+    return PortfolioResult(summaries, totals, checkpoint['num_chunks'], checkpoint['num_chunks'])
+
+
+def _price_chunk(tape, summaries_path, chunk, rounding):
+    # Runs in a worker process: prices one chunk, writes its summaries into
+    # the shared file and returns the chunk's monthly cash flows
+    start, stop, location = chunk
+    batch = tape.read(start, stop, location, rounding)
+    summary = batch.calculate_loan_summary()
+    summary['apr'] = batch.calculate_apr(summary)
+    summaries = np.load(summaries_path, mmap_mode='r+')
+    for name in SUMMARY_FIELDS:
+        summaries[name][start:stop] = summary[name]
+    # Written before the parent records the chunk as done
+    summaries.flush()
+    del summaries
+
+    schedule = batch.generate_amortization_schedule()
+    return {column: getattr(schedule, column).sum(axis=0) for column in CASH_FLOW_COLUMNS}
+
+
+def _run_manifest(tape, chunk_size, rounding):
+    stat = os.stat(tape.path)
+    return {
+        'format': PORTFOLIO_FORMAT,
+        'version': PORTFOLIO_VERSION,
+        'tape': tape.path,
+        'tape_size': stat.st_size,
+        'tape_mtime_ns': stat.st_mtime_ns,
+        'num_loans': len(tape),
+        'chunk_size': chunk_size,
+        'num_chunks': len(tape.chunks(chunk_size)),
+        'rounding': rounding,
+    }
+
+
+def _read_checkpoint(output_dir):
+    try:
+        with open(os.path.join(output_dir, CHECKPOINT_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(output_dir, checkpoint):
+    # Replaced atomically, so an interrupted write keeps the previous one
+    path = os.path.join(output_dir, CHECKPOINT_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,98 @@
+"""
+This module evaluates two-parameter sensitivity grids of a loan.
+Every cell of the grid is a loan with two parameters swept and the others
+held at a base scenario; the whole grid is priced in one LoanBatch pass with
+the closed-form summary, so a 200x200 grid costs a few NumPy operations.
+The base's rate schedule, prepayments and rounding mode apply to every cell;
+adjustable-rate and prepayment bases are priced loan by loan, so the heatmap
+samples their grids at most ``IRREGULAR_RESOLUTION`` times per axis.
+"""
+
+import numpy as np
+
+from ..config import (
+    DOWN_PAYMENT_MAX, DOWN_PAYMENT_MIN, EXTRA_PAYMENT_MAX, EXTRA_PAYMENT_MIN,
+    INTEREST_RATE_MAX, INTEREST_RATE_MIN, INTEREST_RATE_SCALE_FACTOR,
+    LOAN_AMOUNT_MAX, LOAN_AMOUNT_MIN, LOAN_TERM_MAX, LOAN_TERM_MIN,
+)
+from .financial_calculations import LoanBatch
+
+# Sweepable Loan parameters: display label and slider bounds in Loan units
+PARAMETERS = {
+    'principal': ("Loan Amount ($)", LOAN_AMOUNT_MIN, LOAN_AMOUNT_MAX),
+    'interest_rate': (
+        "Interest Rate (%)",
+        INTEREST_RATE_MIN / INTEREST_RATE_SCALE_FACTOR,
+        INTEREST_RATE_MAX / INTEREST_RATE_SCALE_FACTOR,
+    ),
+    'term': ("Loan Term (Years)", LOAN_TERM_MIN, LOAN_TERM_MAX),
+    'down_payment': ("Down Payment ($)", DOWN_PAYMENT_MIN, DOWN_PAYMENT_MAX),
+    'extra_payment': ("Extra Monthly Payment ($)", EXTRA_PAYMENT_MIN, EXTRA_PAYMENT_MAX),
+}
+METRICS = {
+    'monthly_payment': "Monthly Payment ($)",
+    'total_interest': "Total Interest ($)",
+    'total_payments': "Total Paid ($)",
+    'loan_term': "Payoff Time (Years)",
+}
+DEFAULT_RESOLUTION = 200
+IRREGULAR_RESOLUTION = 50  # about a second for an adjustable-rate base
+
+
+def parameter_values(name, start=None, stop=None, num=DEFAULT_RESOLUTION):
+    """
+    Sample points for one grid axis.
+
+    Args:
+        name (str): Key of ``PARAMETERS``.
+        start (float | None): First value; defaults to the slider minimum.
+        stop (float | None): Last value; defaults to the slider maximum.
+        num (int): Number of samples. Terms are whole years, so a term axis
+            has at most one sample per year.
+
+    Returns:
+        numpy.ndarray: Increasing sample values.
+    """
+    _, minimum, maximum = PARAMETERS[name]
+    start = minimum if start is None else start
+    stop = maximum if stop is None else stop
+    if name == 'term':
+        return np.unique(np.rint(np.linspace(start, stop, num)).astype(np.int64))
+    return np.linspace(start, stop, num)
+
+
+def sensitivity_grid(base, x_name, x_values, y_name, y_values):
+    """
+    Price every combination of two swept parameters in one pass.
+
+    Args:
+        base (Loan | Scenario): Supplies the parameters that are not swept,
+            its rate schedule, prepayment events and rounding mode.
+        x_name (str): Parameter varied along the columns.
+        x_values (numpy.ndarray): Its values.
+        y_name (str): Parameter varied along the rows.
+        y_values (numpy.ndarray): Its values.
+
+    Returns:
+        dict: One ``(len(y_values), len(x_values))`` array per key of
+        ``METRICS``; cells whose down payment covers the principal are NaN.
+
+    Raises:
+        ValueError: If both axes sweep the same parameter.
+    """
+    if x_name == y_name:
+        raise ValueError("The two grid axes must sweep different parameters")
+    arguments = {name: getattr(base, name) for name in PARAMETERS}
+    arguments[x_name] = np.asarray(x_values)[None, :]
+    arguments[y_name] = np.asarray(y_values)[:, None]
+    shape = (len(y_values), len(x_values))
+    size = shape[0] * shape[1]
+    batch = LoanBatch(
+        **arguments,
+        rate_schedules=None if base.rate_schedule is None else [base.rate_schedule] * size,
+        prepayments=[base.prepayments] * size if base.prepayments else None,
+        rounding=None if base.rounding is None else [base.rounding] * size,
+    )
+    summary = batch.calculate_loan_summary()
+    valid = (batch.loan_amount > 0).reshape(shape)
+    return {metric: np.where(valid, summary[metric].reshape(shape), np.nan) for metric in METRICS}
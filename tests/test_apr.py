@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.utils.apr import amount_financed, level_irr, loan_apr, schedule_irr
+from money_analyzer.utils.financial_calculations import LoanBatch
+
+
+def bisect_apr(cash_flows, financed):
+    """APR by plain bisection on the discounted cash flows, in percent."""
+    months = np.arange(1, len(cash_flows) + 1)
+    low, high = 0.0, 1.0
+    for _ in range(200):
+        rate = (low + high) / 2
+        if (cash_flows / (1 + rate) ** months).sum() > financed:
+            low = rate
+        else:
+            high = rate
+    return rate * 12 * 100
+
+
+def test_textbook_fee_example():
+    # $200,000 at 6% over 30 years with $4,000 of finance charges: 6.189%
+    assert loan_apr(Loan(200000, 6, 30, fees=4000)) == pytest.approx(6.18948, abs=1e-5)
+
+
+def test_points_are_a_percent_of_the_loan_amount():
+    # Two points on $200,000 borrowed are the same $4,000
+    with_points = loan_apr(Loan(250000, 6, 30, 50000, points=2))
+
+    assert with_points == pytest.approx(loan_apr(Loan(200000, 6, 30, fees=4000)), abs=1e-9)
+    assert amount_financed(200000, 1000, 2) == 195000
+
+
+@pytest.mark.parametrize('loan', [
+    Loan(200000, 6, 30),
+    Loan(200000, 6, 30, extra_payment=300),
+    Loan(200000, 0, 15),
+])
+def test_without_charges_apr_is_the_nominal_rate(loan):
+    assert loan_apr(loan) == pytest.approx(loan.interest_rate, abs=1e-9)
+
+
+LOANS = [
+    Loan(200000, 6, 30, fees=4000),
+    Loan(200000, 6, 30, extra_payment=500, fees=4000),
+    Loan(120000, 0, 10, fees=2000, points=1),
+    Loan(300000, 5.5, 30, 30000, fees=1500, rounding='half_even'),
+    Loan(300000, 5.5, 30, 30000, 200, RateSchedule(60, 12, rates=(7.0, 8.0)), fees=2500, points=0.5),
+    Loan(180000, 4.25, 20, prepayments=(Prepayment(13, 20000),), fees=3000),
+]
+
+
+@pytest.mark.parametrize('loan', LOANS)
+def test_apr_discounts_the_payments_to_the_amount_financed(loan):
+    schedule = loan.calculate_amortization()
+    financed = float(amount_financed(loan.principal - loan.down_payment, loan.fees, loan.points))
+
+    assert loan_apr(loan) == pytest.approx(bisect_apr(schedule.principal + schedule.interest, financed), abs=1e-6)
+
+
+def test_extra_payments_raise_the_apr_of_fees():
+    assert loan_apr(LOANS[1]) > loan_apr(LOANS[0])
+
+
+def test_batch_matches_single_loans():
+    aprs = LoanBatch.from_loans(LOANS).calculate_apr()
+
+    np.testing.assert_allclose(aprs, [loan_apr(loan) for loan in LOANS], atol=1e-8)
+
+
+def test_closed_form_matches_schedule_irr():
+    loan = LOANS[1]
+    schedule = loan.calculate_amortization()
+    payment, _, total_payments, num_months = loan.calculate_loan_summary()
+    financed = amount_financed(200000, 4000)
+    closed_form = level_irr(financed, payment, num_months, total_payments - payment * (num_months - 1))
+    irr = schedule_irr(schedule.principal + schedule.interest, financed)
+
+    np.testing.assert_allclose(closed_form, irr, atol=1e-12)
+
+
+def test_apr_is_nan_when_nothing_is_financed():
+    assert math.isnan(loan_apr(Loan(100000, 5, 30, fees=100000)))
+    assert np.isnan(LoanBatch.from_loans([Loan(100000, 5, 30, points=100)]).calculate_apr()[0])
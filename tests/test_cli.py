@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from money_analyzer import cli
+
+
+def run(argv, stdin=None, monkeypatch=None):
+    out = io.StringIO()
+    if stdin is not None:
+        monkeypatch.setattr('sys.stdin', io.StringIO(stdin))
+    args = cli.build_parser().parse_args(argv)
+    args.handler(args, out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('argv, message', [
+    (['--term', '0'], 'term must be positive'),
+    (['--down', '1000'], 'principal must be greater than the down payment'),
+    (['--down', '-1'], 'down payment must not be negative'),
+    (['--rate', '-1'], 'interest rate must not be negative'),
+])
+def test_loan_rejects_invalid_parameters(argv, message, capsys):
+    base = {'--principal': '1000', '--rate': '5', '--term': '10'}
+    base.update(zip(argv[::2], argv[1::2]))
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['loan'] + [item for pair in base.items() for item in pair])
+
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_loan_summary():
+    out = run(['loan', '--principal', '250000', '--rate', '5', '--term', '30', '--down', '50000'])
+
+    assert 'Loan Amount: $200,000.00' in out
+    assert 'Monthly Payment: $1,073.64' in out
+
+
+def test_batch_reports_invalid_row(monkeypatch):
+    with pytest.raises(ValueError, match='line 3: term must be positive'):
+        run(['batch'], 'principal,interest_rate,term\n1000,5,10\n2000,5,0\n', monkeypatch)
+
+
+@pytest.mark.parametrize('term', ['2.5', '30.0001', 'inf'])
+def test_batch_rejects_fractional_term(monkeypatch, term):
+    with pytest.raises(ValueError, match='line 2: term must be a whole number of years'):
+        run(['batch'], f'principal,interest_rate,term\n1000,5,{term}\n', monkeypatch)
+
+
+def test_batch_writes_one_summary_per_row(monkeypatch):
+    out = run(['batch', '--chunk-size', '1'], 'principal,interest_rate,term\n1000,5,10\n2000,5,3\n', monkeypatch)
+    lines = out.splitlines()
+
+    assert lines[0] == ','.join(cli.SUMMARY_COLUMNS)
+    assert len(lines) == 3
+    assert 'nan' not in out and 'inf' not in out
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from money_analyzer.utils.data_visualization import min_max_decimate
+
+
+def bin_edges(size, num_bins):
+    bin_size = -(-size // num_bins)
+    return range(0, size, bin_size), bin_size
+
+
+@pytest.mark.parametrize('size, num_bins', [(10000, 100), (10001, 640), (360, 179), (5000, 1)])
+def test_every_bin_keeps_its_extrema(size, num_bins):
+    rng = np.random.default_rng(size)
+    x = np.sort(rng.uniform(0, 100, size))
+    y = rng.normal(size=size).cumsum()
+
+    decimated_x, decimated_y = min_max_decimate(x, y, num_bins)
+
+    assert len(decimated_x) <= 2 * num_bins + 2
+    starts, bin_size = bin_edges(size, num_bins)
+    for start in starts:
+        values = y[start:start + bin_size]
+        inside = (decimated_x >= x[start]) & (decimated_x <= x[min(start + bin_size, size) - 1])
+        assert decimated_y[inside].min() == values.min()
+        assert decimated_y[inside].max() == values.max()
+
+
+def test_output_is_in_x_order_and_keeps_endpoints():
+    x = np.linspace(0, 1, 5000)
+    y = np.sin(x * 50)
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 200)
+
+    assert np.all(np.diff(decimated_x) > 0)
+    assert decimated_x[0] == x[0] and decimated_x[-1] == x[-1]
+    # Every kept point is an original (x, y) pair
+    np.testing.assert_array_equal(decimated_y, y[np.searchsorted(x, decimated_x)])
+
+
+@pytest.mark.parametrize('size, num_bins', [(10, 10), (200, 100), (5, 0), (5, -1)])
+def test_short_series_pass_through(size, num_bins):
+    x, y = np.arange(size, dtype=float), np.arange(size, dtype=float) ** 2
+
+    decimated_x, decimated_y = min_max_decimate(x, y, num_bins)
+
+    assert decimated_x is x and decimated_y is y
+
+
+def test_empty_series():
+    x, y = np.empty(0), np.empty(0)
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 100)
+
+    assert len(decimated_x) == len(decimated_y) == 0
+
+
+def test_nan_does_not_hide_extrema():
+    x = np.arange(100, dtype=float)
+    y = x.copy()
+    y[3], y[5] = -50, np.nan
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 10)
+
+    first_bin = decimated_x < 10
+    assert np.nanmin(decimated_y[first_bin]) == -50
+    assert np.nanmax(decimated_y[first_bin]) == 9
+    # The gap is kept so the line still breaks there
+    assert 5 in decimated_x and np.isnan(decimated_y[decimated_x == 5]).all()
+
+
+def test_all_nan_series():
+    x = np.arange(1000, dtype=float)
+    y = np.full(1000, np.nan)
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 10)
+
+    assert np.all(np.diff(decimated_x) > 0)
+    assert np.isnan(decimated_y).all()
@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.utils.exporters import (
+    SCHEDULE_COLUMNS, CsvScheduleWriter, export_schedules, iter_schedule_chunks, read_npz_schedules,
+)
+from money_analyzer.utils.financial_calculations import LoanBatch
+
+LOANS = [
+    Loan(250000, 5.0, 30, 50000),
+    Loan(120000, 0, 10, 0, 300),
+    Loan(200000, 4.5, 15, prepayments=(Prepayment(12, 10000),)),
+    Loan(100000, 5.0, 10, 100000),
+    Loan(80000, 7.25, 5),
+]
+
+
+def expected_columns(loans):
+    schedules = [loan.calculate_amortization() for loan in loans]
+    columns = {column: np.concatenate([getattr(schedule, column) for schedule in schedules])
+               for column in SCHEDULE_COLUMNS[1:]}
+    columns['scenario'] = np.repeat(np.arange(len(loans)), [len(schedule) for schedule in schedules])
+    return columns
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8') as f:
+        assert f.readline().strip() == ",".join(SCHEDULE_COLUMNS)
+        values = np.loadtxt(f, delimiter=',', ndmin=2)
+    return dict(zip(SCHEDULE_COLUMNS, values.T))
+
+
+def read_parquet(path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    table = pq.read_table(path)
+    assert table.column_names == list(SCHEDULE_COLUMNS)
+    return {column: table.column(column).to_numpy() for column in SCHEDULE_COLUMNS}
+
+
+def assert_columns_equal(columns, expected, atol):
+    for column in ('scenario', 'month'):
+        np.testing.assert_array_equal(columns[column], expected[column])
+    for column in SCHEDULE_COLUMNS[2:]:
+        np.testing.assert_allclose(columns[column], expected[column], atol=atol, err_msg=column)
+
+
+INPUTS = {'batch': LoanBatch.from_loans, 'loans': list, 'generator': lambda loans: (loan for loan in loans)}
+FORMATS = {'csv': (read_csv, 0.005), 'npz': (read_npz_schedules, 1e-6), 'parquet': (read_parquet, 1e-6)}
+
+
+@pytest.mark.parametrize('make_input', INPUTS.values(), ids=INPUTS.keys())
+@pytest.mark.parametrize('file_format', FORMATS)
+@pytest.mark.parametrize('chunk_rows', [50, 65536])
+def test_round_trip(tmp_path, make_input, file_format, chunk_rows):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    read, atol = FORMATS[file_format]
+    path = tmp_path / f"schedules.{file_format}"
+    expected = expected_columns(LOANS)
+
+    # 50 rows is shorter than most schedules here, so loans span chunks
+    rows = export_schedules(path, make_input(LOANS), chunk_rows=chunk_rows)
+
+    assert rows == len(expected['month'])
+    assert_columns_equal(read(path), expected, atol)
+
+
+def test_chunks_cover_every_row():
+    chunks = list(iter_schedule_chunks(LoanBatch.from_loans(LOANS), chunk_rows=50))
+
+    assert len(chunks) > 1
+    assert_columns_equal({column: np.concatenate([chunk[column] for chunk in chunks]) for column in SCHEDULE_COLUMNS},
+                         expected_columns(LOANS), 1e-6)
+
+
+def test_explicit_format_overrides_extension(tmp_path):
+    path = tmp_path / 'schedules.dat'
+
+    export_schedules(path, LOANS, file_format='NPZ')
+
+    assert_columns_equal(read_npz_schedules(path), expected_columns(LOANS), 1e-6)
+
+
+def test_empty_export_writes_header_only(tmp_path):
+    path = tmp_path / 'empty.csv'
+
+    assert export_schedules(path, LoanBatch([], [], [])) == 0
+    assert path.read_text(encoding='utf-8') == ",".join(SCHEDULE_COLUMNS) + "\n"
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError, match='xlsx'):
+        export_schedules(tmp_path / 'schedules.xlsx', LOANS)
+    assert not (tmp_path / 'schedules.xlsx').exists()
+
+
+def test_csv_writer_leaves_open_file_open():
+    buffer = io.StringIO()
+    with CsvScheduleWriter(buffer) as writer:
+        writer.write(next(iter_schedule_chunks(LOANS[-1:])))
+
+    assert not buffer.closed
+    assert len(buffer.getvalue().splitlines()) == 1 + 60
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.utils.financial_calculations import BatchSchedule, LoanBatch
+
+
+def random_tape(count, seed=3):
+    rng = np.random.default_rng(seed)
+    principal = rng.integers(1000, 1000000, count).astype(float)
+    interest_rate = np.where(rng.random(count) < 0.15, 0.0, rng.uniform(0.5, 15, count).round(3))
+    term = rng.integers(1, 41, count)
+    down_payment = np.where(rng.random(count) < 0.1, principal, (rng.random(count) * principal / 2).round(2))
+    extra_payment = rng.choice([0.0, 100.0, 2500.0], count)
+    return principal, interest_rate, term, down_payment, extra_payment
+
+
+TAPE = random_tape(300)
+LOANS = [Loan(float(p), float(r), int(t), float(d), float(e)) for p, r, t, d, e in zip(*TAPE)]
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return LoanBatch(*TAPE)
+
+
+def test_tape_covers_edge_cases():
+    principal, interest_rate, term, down_payment, extra_payment = TAPE
+
+    assert (interest_rate == 0).any() and (down_payment == principal).any()
+    assert (extra_payment > 0).any() and len(set(term)) > 20
+
+
+def test_summary_matches_scalar_loans(batch):
+    summary = batch.calculate_loan_summary()
+
+    np.testing.assert_allclose(batch.calculate_monthly_payment(), [loan.calculate_monthly_payment() for loan in LOANS])
+    for i, loan in enumerate(LOANS):
+        monthly_payment, total_interest, total_payments, num_months = loan.calculate_loan_summary()
+        assert summary['loan_amount'][i] == loan.principal - loan.down_payment
+        assert summary['monthly_payment'][i] == pytest.approx(monthly_payment)
+        assert summary['total_interest'][i] == pytest.approx(total_interest, abs=1e-6)
+        assert summary['total_payments'][i] == pytest.approx(total_payments, abs=1e-6)
+        assert summary['num_months'][i] == num_months
+        assert summary['loan_term'][i] == pytest.approx(num_months / 12)
+
+
+def test_schedule_rows_match_scalar_loans(batch):
+    schedule = batch.generate_amortization_schedule(fill_value=np.nan)
+
+    assert schedule.month.shape == (len(LOANS), schedule.num_months.max())
+    for i, loan in enumerate(LOANS):
+        expected = loan.calculate_amortization()
+        num_months = len(expected)
+        assert schedule.num_months[i] == num_months
+        for column in BatchSchedule.COLUMNS:
+            np.testing.assert_allclose(getattr(schedule, column)[i, :num_months], getattr(expected, column),
+                                       atol=1e-6, err_msg=column)
+        assert not schedule.month[i, num_months:].any()
+        assert np.isnan(schedule.balance[i, num_months:]).all()
+
+
+def test_ragged_concatenates_scalar_schedules(batch):
+    ragged = batch.generate_amortization_schedule().ragged()
+    expected = [loan.calculate_amortization() for loan in LOANS]
+
+    np.testing.assert_array_equal(ragged['offsets'], np.cumsum([0] + [len(schedule) for schedule in expected]))
+    np.testing.assert_array_equal(ragged['loan'], np.repeat(np.arange(len(LOANS)), np.diff(ragged['offsets'])))
+    for column in BatchSchedule.COLUMNS:
+        np.testing.assert_allclose(ragged[column], np.concatenate([getattr(s, column) for s in expected]), atol=1e-6)
+
+
+@pytest.mark.parametrize('index', [slice(10, 50), slice(None, None, 7), np.arange(300) % 3 == 0])
+def test_slices_price_like_the_full_batch(batch, index):
+    part = batch[index]
+    summary, full = part.calculate_loan_summary(), batch.calculate_loan_summary()
+
+    assert len(part) == len(np.arange(len(batch))[index])
+    for key in ('monthly_payment', 'total_interest', 'total_payments', 'num_months'):
+        np.testing.assert_array_equal(summary[key], full[key][index])
+
+
+def test_item_is_the_scalar_loan(batch):
+    assert batch[17].cache_key() == LOANS[17].cache_key()
+    assert batch[-1].cache_key() == LOANS[-1].cache_key()
+
+
+def test_from_loans_round_trips(batch):
+    rebuilt = LoanBatch.from_loans(LOANS)
+
+    for name in ('principal', 'interest_rate', 'term', 'down_payment', 'extra_payment'):
+        np.testing.assert_array_equal(getattr(rebuilt, name), getattr(batch, name))
+
+
+def test_scalars_broadcast_against_arrays():
+    batch = LoanBatch([100000, 200000, 300000], 6, 30)
+
+    assert len(batch) == 3
+    np.testing.assert_allclose(batch.calculate_monthly_payment(),
+                               [Loan(amount, 6, 30).calculate_monthly_payment() for amount in (100000, 200000, 300000)])
+
+
+def test_empty_batch():
+    batch = LoanBatch([], [], [])
+
+    assert len(batch.calculate_loan_summary()['num_months']) == 0
+    assert batch.generate_amortization_schedule().month.shape == (0, 0)
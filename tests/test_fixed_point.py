@@ -0,0 +1,143 @@
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from money_analyzer.models.amortization import level_payment
+from money_analyzer.models.fixed_point import (
+    RATE_DENOMINATOR, amortize_cents, rate_units, round_divide, summarize_cents, to_cents,
+)
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.utils.financial_calculations import LoanBatch
+
+DECIMAL_ROUNDING = {'half_up': ROUND_HALF_UP, 'half_even': ROUND_HALF_EVEN}
+CENT = Decimal('0.01')
+
+
+def decimal_schedule(loan_amount, interest_rate, term, extra_payment, rounding):
+    """Lender-statement loop in Decimal, rounding every month's interest to the cent."""
+    monthly_rate = interest_rate / 12 / 100
+    num_payments = term * 12
+    rate = Decimal(int(rate_units(monthly_rate))) / RATE_DENOMINATOR
+    payment = Decimal(int(to_cents(level_payment(loan_amount, monthly_rate, num_payments), rounding))) / 100
+    due = payment + Decimal(int(to_cents(extra_payment, rounding))) / 100
+    balance = Decimal(int(to_cents(loan_amount, rounding))) / 100
+    rows = []
+    for month in range(1, num_payments + 1):
+        interest = (balance * rate).quantize(CENT, DECIMAL_ROUNDING[rounding])
+        owed = balance + interest
+        paid = owed if owed <= due or month == num_payments else due
+        balance = owed - paid
+        rows.append((paid, paid - interest, interest, balance))
+        if not balance:
+            break
+    return rows
+
+
+LOANS = [
+    (200000, 6.0, 30, 0),
+    (123456.78, 7.125, 15, 0),
+    (99999.99, 4.875, 10, 333.33),
+    (5000, 0.0, 1, 0),
+    (350000, 19.99, 30, 1000),
+]
+
+
+def test_to_cents_rounds_ties_by_mode():
+    np.testing.assert_array_equal(to_cents([0.125, 0.135, 0.145], 'half_up'), [13, 14, 15])
+    np.testing.assert_array_equal(to_cents([0.125, 0.135, 0.145], 'half_even'), [12, 14, 14])
+
+
+def test_round_divide_rounds_ties_by_mode():
+    numerators = np.array([5, 15, 25, 14, 16])
+    np.testing.assert_array_equal(round_divide(numerators, 10, 'half_up'), [1, 2, 3, 1, 2])
+    np.testing.assert_array_equal(round_divide(numerators, 10, 'half_even'), [0, 2, 2, 1, 2])
+    assert round_divide(25, 10, 'half_even') == 2
+
+
+@pytest.mark.parametrize('rounding', ['half_up', 'half_even'])
+@pytest.mark.parametrize('loan', LOANS)
+def test_schedule_matches_decimal_statement(loan, rounding):
+    expected = decimal_schedule(*loan, rounding)
+    loan_amount, interest_rate, term, extra_payment = loan
+    schedule = Loan(loan_amount, interest_rate, term, extra_payment=extra_payment, rounding=rounding) \
+        .calculate_amortization()
+
+    assert len(schedule) == len(expected)
+    for column, values in zip(('payment', 'principal', 'interest', 'balance'), zip(*expected)):
+        cents = np.rint(getattr(schedule, column) * 100).astype(np.int64)
+        assert cents.tolist() == [int(value * 100) for value in values]
+
+
+@pytest.mark.parametrize('rounding', ['half_up', 'half_even'])
+@pytest.mark.parametrize('loan', [
+    Loan(200000, 6.0, 30, rounding='half_up'),
+    Loan(250000, 5.5, 30, 25000, 150, RateSchedule(60, 12, rates=(7.25, 8.5))),
+    Loan(180000, 4.25, 20, prepayments=(Prepayment(13, 12345.67), Prepayment(40, 99.99, recurring=True))),
+])
+def test_principal_adds_up_to_the_loan(loan, rounding):
+    loan.rounding = rounding
+    schedule = loan.calculate_amortization()
+    cents = {
+        column: np.rint(getattr(schedule, column) * 100).astype(np.int64)
+        for column in ('payment', 'principal', 'interest', 'balance')
+    }
+
+    assert cents['principal'].sum() == int(to_cents(loan.principal - loan.down_payment, rounding))
+    assert cents['balance'][-1] == 0
+    np.testing.assert_array_equal(cents['payment'], cents['principal'] + cents['interest'])
+    # Every amount is a whole number of cents
+    np.testing.assert_allclose(schedule.interest * 100, cents['interest'], atol=1e-6)
+
+
+@pytest.mark.parametrize('rounding', ['half_up', 'half_even'])
+def test_kernel_matches_single_loan_path(rounding):
+    loans = [Loan(*loan[:3], extra_payment=loan[3], rounding=rounding) for loan in LOANS]
+    batch = LoanBatch.from_loans(loans)
+    schedule = batch.generate_amortization_schedule()
+    summary = batch.calculate_loan_summary()
+
+    for i, loan in enumerate(loans):
+        expected = loan.calculate_amortization()
+        _, total_interest, total_payments, num_months = loan.calculate_loan_summary()
+        assert schedule.num_months[i] == len(expected) == num_months
+        np.testing.assert_array_equal(schedule.balance[i, :num_months], expected.balance)
+        np.testing.assert_array_equal(schedule.interest[i, :num_months], expected.interest)
+        assert summary['total_interest'][i] == total_interest
+        assert summary['total_payments'][i] == total_payments
+
+
+def test_summary_totals_are_exact_sums_of_the_kernel():
+    loan_cents, monthly_rates = np.array([20000000, 12345678]), np.array([6.0, 7.125]) / 1200
+    units = rate_units(monthly_rates)
+    payment = to_cents([level_payment(cents / 100, rate, 360) for cents, rate in zip(loan_cents, monthly_rates)])
+    num_months, payments, principal, interest, _ = amortize_cents(loan_cents, units, 360, payment)
+    totals = summarize_cents(loan_cents, units, 360, payment)
+
+    np.testing.assert_array_equal(totals[0], num_months)
+    np.testing.assert_array_equal(totals[1], interest.sum(axis=1))
+    np.testing.assert_array_equal(totals[2], payments.sum(axis=1))
+    np.testing.assert_array_equal(principal.sum(axis=1), loan_cents)
+
+
+def test_kernel_rejects_products_beyond_int64():
+    units = rate_units(np.array([30.0]) / 1200)
+
+    with pytest.raises(ValueError, match='int64'):
+        summarize_cents(np.array([5 * 10**12]), units, 360, np.array([10**10]))
+
+
+def test_batch_prices_loans_too_large_for_the_kernel_on_plain_ints():
+    batch = LoanBatch([5e10, 200000], [30, 6], [30, 30], [0, 0], [0, 0], rounding=['half_up', 'half_up'])
+    summary = batch.calculate_loan_summary()
+    schedule = batch.generate_amortization_schedule()
+
+    assert batch.wide_cent_indices() == [0]
+    for i in range(len(batch)):
+        _, total_interest, total_payments, num_months = batch[i].calculate_loan_summary()
+        assert summary['num_months'][i] == num_months == 360
+        assert summary['total_interest'][i] == total_interest
+        assert summary['total_payments'][i] == total_payments
+        np.testing.assert_array_equal(schedule.balance[i], batch[i].calculate_amortization().balance)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.utils.goal_seek import annuity_factor, break_even_rate, max_loan_amount, required_extra_payment
+
+
+def test_annuity_factor_at_zero_rate_counts_payments():
+    assert annuity_factor(0.0, 360) == 360
+    assert annuity_factor(0.005, 360) == pytest.approx(166.7916, abs=1e-4)
+
+
+@pytest.mark.parametrize('target_months', [60, 120, 240, 359])
+def test_required_extra_payment_pays_off_by_target(target_months):
+    extra = float(required_extra_payment(200000, 6, 30, target_months))
+    schedule = Loan(200000, 6, 30, extra_payment=extra).calculate_amortization()
+
+    # A cent less and the loan runs one month longer
+    assert len(schedule) == target_months
+    assert len(Loan(200000, 6, 30, extra_payment=extra - 0.01).calculate_amortization()) == target_months + 1
+
+
+def test_required_extra_payment_is_zero_at_or_beyond_term():
+    np.testing.assert_array_equal(required_extra_payment(200000, 6, 30, [360, 400]), [0, 0])
+
+
+@pytest.mark.parametrize('interest_rate, extra_payment', [(6, 0), (0, 0), (4.5, 250)])
+def test_max_loan_amount_meets_payment_cap(interest_rate, extra_payment):
+    amount = float(max_loan_amount(2000, interest_rate, 30, extra_payment))
+    payment = Loan(amount, interest_rate, 30, extra_payment=extra_payment).calculate_loan_summary()[0]
+
+    assert payment == pytest.approx(2000, abs=1e-6)
+
+
+def test_max_loan_amount_is_zero_below_extra_payment():
+    assert max_loan_amount(100, 6, 30, extra_payment=200) == 0
+
+
+def test_break_even_rate_meets_payment_cap():
+    caps = np.array([1200.0, 1500.0, 2500.0])
+    rates = break_even_rate(200000, caps, 30)
+
+    for cap, rate in zip(caps, rates):
+        assert Loan(200000, float(rate), 30).calculate_monthly_payment() == pytest.approx(cap, abs=1e-4)
+
+
+def test_break_even_rate_of_textbook_loan():
+    # $1,199.10 is the payment of $200,000 over 30 years at 6%
+    assert float(break_even_rate(200000, 1199.101050, 30)) == pytest.approx(6.0, abs=1e-6)
+
+
+def test_break_even_rate_is_nan_when_cap_is_too_low():
+    # Even at 0% the payment is 200000 / 360 = $555.56
+    rates = break_even_rate([200000, 200000], [500, 200000 / 360], 30)
+
+    assert np.isnan(rates[0])
+    assert rates[1] == pytest.approx(0, abs=1e-6)
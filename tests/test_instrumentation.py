@@ -0,0 +1,131 @@
+import csv
+import json
+
+import pytest
+
+from money_analyzer.controllers.schedule_cache import ScheduleCache
+from money_analyzer.utils.instrumentation import Profiler, RingHistogram
+
+
+def test_ring_keeps_latest_samples():
+    histogram = RingHistogram(capacity=4)
+    for i in range(1, 11):
+        histogram.record(i / 1000, now=float(i))
+
+    summary = histogram.snapshot(now=10.0)
+
+    # Only calls 7..10 are retained, but every call is counted
+    assert summary['count'] == 10
+    assert summary['max_ms'] == pytest.approx(10)
+    assert summary['p50_ms'] == pytest.approx(8.5)
+
+
+def test_percentiles():
+    histogram = RingHistogram(capacity=1000)
+    for i in range(1, 101):
+        histogram.record(i / 1000, now=0.0)
+
+    summary = histogram.snapshot(percentiles=(50, 95, 99), now=0.0)
+
+    assert summary['p50_ms'] == pytest.approx(50.5)
+    assert summary['p95_ms'] == pytest.approx(95.05)
+    assert summary['p99_ms'] == pytest.approx(99.01)
+    assert summary['max_ms'] == pytest.approx(100)
+
+
+def test_rate_counts_calls_inside_window():
+    histogram = RingHistogram(capacity=100)
+    for now in (1.0, 5.0, 6.0, 7.0, 9.5):
+        histogram.record(0.001, now=now)
+
+    assert histogram.snapshot(window=5.0, now=10.0)['rate_per_sec'] == pytest.approx(4 / 5)
+    assert histogram.snapshot(window=1.0, now=10.0)['rate_per_sec'] == pytest.approx(1)
+    assert histogram.snapshot(window=1.0, now=100.0)['rate_per_sec'] == 0
+
+
+def test_empty_and_cleared_histograms_have_no_durations():
+    histogram = RingHistogram(capacity=4)
+    assert histogram.snapshot(now=0.0) == {
+        'count': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None, 'rate_per_sec': 0.0,
+    }
+
+    histogram.record(0.5, now=0.0)
+    histogram.clear()
+    assert histogram.snapshot(now=0.0)['max_ms'] is None
+
+
+def test_timed_records_only_while_enabled():
+    profiler = Profiler(capacity=8)
+
+    @profiler.timed('stage')
+    def double(value):
+        return value * 2
+
+    assert double(2) == 4
+    assert profiler.histogram('stage').count == 0
+
+    profiler.enable()
+    assert double(3) == 6
+    assert profiler.histogram('stage').count == 1
+
+    profiler.disable()
+    double(4)
+    assert profiler.histogram('stage').count == 1
+    assert double.__name__ == 'double'
+
+
+def test_timed_records_calls_that_raise():
+    profiler = Profiler()
+    profiler.enable()
+
+    @profiler.timed('failing')
+    def fail():
+        raise KeyError
+
+    with pytest.raises(KeyError):
+        fail()
+    assert profiler.histogram('failing').count == 1
+
+
+def test_reset_keeps_caches():
+    profiler = Profiler()
+    profiler.add_cache('cache', ScheduleCache())
+    profiler.histogram('stage').record(0.1)
+
+    profiler.reset()
+
+    assert profiler.snapshot()['spans']['stage']['count'] == 0
+    assert 'cache' in profiler.snapshot()['caches']
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.add_cache('cache', ScheduleCache(maxsize=3))
+    for name, durations in (('b.stage', (0.002, 0.004)), ('a.stage', (0.001,))):
+        for duration in durations:
+            profiler.histogram(name).record(duration)
+    return profiler
+
+
+def test_export_json(profiler, tmp_path):
+    path = tmp_path / 'profile.json'
+    profiler.export(path)
+
+    with open(path, encoding='utf-8') as f:
+        exported = json.load(f)
+    assert list(exported['spans']) == ['a.stage', 'b.stage']
+    assert exported['spans']['b.stage']['count'] == 2
+    assert exported['spans']['b.stage']['max_ms'] == pytest.approx(4)
+    assert exported['caches']['cache']['maxsize'] == 3
+
+
+def test_export_csv(profiler, tmp_path):
+    path = tmp_path / 'profile.CSV'
+    profiler.export(path)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['stage'] for row in rows] == ['a.stage', 'b.stage']
+    assert rows[1]['count'] == '2'
+    assert float(rows[1]['p50_ms']) == pytest.approx(3)
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from money_analyzer.models.loan import Loan
+
+CENT = 0.005
+
+
+def reference_schedule(principal, interest_rate, term, down_payment=0, extra_payment=0):
+    """The month-by-month loop the columnar engine replaced."""
+    monthly_rate = interest_rate / 12 / 100
+    num_payments = term * 12
+    remaining_balance = principal - down_payment
+    if monthly_rate == 0:
+        monthly_payment = remaining_balance / num_payments
+    else:
+        monthly_payment = (remaining_balance * monthly_rate * (1 + monthly_rate) ** num_payments) / (
+            (1 + monthly_rate) ** num_payments - 1
+        )
+    schedule = []
+    for month in range(1, num_payments + 1):
+        interest_payment = remaining_balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment + extra_payment
+        if remaining_balance - principal_payment < 0:
+            principal_payment = remaining_balance
+            interest_payment = remaining_balance * monthly_rate
+            monthly_payment = principal_payment + interest_payment
+        remaining_balance -= principal_payment
+        schedule.append({
+            'month': month,
+            'payment': monthly_payment + extra_payment,
+            'principal': principal_payment,
+            'interest': interest_payment,
+            'balance': max(0, remaining_balance),
+        })
+        if remaining_balance <= 0:
+            break
+    return schedule
+
+
+CASES = [
+    (250000, 5.0, 30, 50000, 0),
+    (300000, 6.5, 30, 0, 0),
+    (300000, 0, 30, 0, 0),
+    (300000, 0, 30, 0, 500),
+    (200000, 4.0, 15, 20000, 1000),
+    (1000000, 15, 30, 0, 10000),
+    (1000, 0.5, 1, 1000, 50),
+    (120000, 7.25, 10, 0, 120000),
+]
+
+
+def random_cases(count, seed=1):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        principal = rng.randint(1000, 1000000)
+        down_payment = rng.choice([0, rng.randint(0, principal // 2)])
+        extra_payment = rng.choice([0, rng.randint(0, 300), rng.randint(0, 10000)])
+        cases.append((principal, rng.randint(0, 150) / 10, rng.randint(1, 30), down_payment, extra_payment))
+    return cases
+
+
+@pytest.mark.parametrize('case', CASES + random_cases(200))
+def test_schedule_matches_reference_loop(case):
+    expected = reference_schedule(*case)
+    schedule = Loan(*case).generate_amortization_schedule()
+
+    assert len(schedule) == len(expected)
+    for row, expected_row in zip(schedule, expected):
+        for column, value in expected_row.items():
+            assert row[column] == pytest.approx(value, abs=CENT)
+
+
+@pytest.mark.parametrize('case', CASES + random_cases(200, seed=2))
+def test_summary_matches_reference_loop(case):
+    expected = reference_schedule(*case)
+    monthly_payment, total_interest, total_payments, num_months = Loan(*case).calculate_loan_summary()
+
+    if len(expected) > 1:
+        # A loan paid off in month 1 pays only its balance
+        assert monthly_payment == pytest.approx(expected[0]['payment'], abs=CENT)
+    assert num_months == len(expected)
+    assert total_interest == pytest.approx(sum(row['interest'] for row in expected), abs=CENT)
+    assert total_payments == pytest.approx(
+        sum(row['principal'] + row['interest'] for row in expected), abs=CENT
+    )
+
+
+def test_extra_payment_pays_off_before_term():
+    loan = Loan(200000, 6, 30, extra_payment=500)
+    schedule = loan.calculate_amortization()
+
+    assert len(schedule) < 360
+    assert len(schedule) == len(reference_schedule(200000, 6, 30, extra_payment=500))
+    assert schedule.balance[-1] == pytest.approx(0, abs=CENT)
+    assert schedule.principal.sum() == pytest.approx(200000, abs=CENT)
+
+
+def test_loan_details_columns_match_schedule():
+    loan = Loan(250000, 5.0, 30, 50000, 200)
+    monthly_payment, principal, interest = loan.calculate_loan_details()
+    expected = reference_schedule(250000, 5.0, 30, 50000, 200)
+
+    assert monthly_payment == pytest.approx(expected[0]['payment'], abs=CENT)
+    assert principal.tolist() == pytest.approx([row['principal'] for row in expected], abs=CENT)
+    assert interest.tolist() == pytest.approx([row['interest'] for row in expected], abs=CENT)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.utils.monte_carlo import (
+    PATH_COLUMNS, SHARD_PATHS, BootstrapModel, VasicekModel, amortize_paths, simulate_loan,
+)
+
+LOAN = Loan(250000, 5.0, 10, 50000, 100, RateSchedule(36, 12, initial_cap=2.0, periodic_cap=1.0, lifetime_cap=5.0))
+MODEL = VasicekModel(mean_rate=6.0, reversion=0.3, volatility=1.5)
+
+
+def assert_same_result(result, other):
+    for column in PATH_COLUMNS + ('total_interest',):
+        np.testing.assert_array_equal(getattr(result, column), getattr(other, column))
+
+
+def test_same_seed_gives_same_result_for_any_worker_count():
+    # More paths than one shard, so the pool really splits the run
+    num_paths = 2 * SHARD_PATHS + 7
+    serial = simulate_loan(LOAN, MODEL, num_paths, seed=42, workers=1)
+    parallel = simulate_loan(LOAN, MODEL, num_paths, seed=42, workers=2)
+
+    assert_same_result(serial, parallel)
+
+
+def test_same_seed_repeats_and_other_seeds_differ():
+    first = simulate_loan(LOAN, MODEL, 500, seed=7)
+    second = simulate_loan(LOAN, MODEL, 500, seed=7)
+    other = simulate_loan(LOAN, MODEL, 500, seed=8)
+
+    assert_same_result(first, second)
+    assert not np.array_equal(first.total_interest, other.total_interest)
+
+
+def test_bands_are_ordered():
+    result = simulate_loan(LOAN, MODEL, 1000, seed=1, percentiles=(5, 50, 95))
+
+    assert np.all(np.diff(result.payment, axis=0) >= 0)
+    assert np.all(np.diff(result.total_interest) >= 0)
+    assert result.band('payment', 50).shape == (LOAN.term * 12,)
+
+
+def test_constant_rate_paths_match_the_loan():
+    # No volatility and a mean at the initial rate: every path keeps the
+    # rate, though the payment is still recast at every reset
+    model = VasicekModel(mean_rate=LOAN.interest_rate, reversion=0.5, volatility=0.0)
+    result = simulate_loan(LOAN, model, 50, seed=3)
+    rate_schedule = RateSchedule(36, 12, rates=(LOAN.interest_rate,))
+    schedule = Loan(LOAN.principal, LOAN.interest_rate, LOAN.term, LOAN.down_payment, LOAN.extra_payment,
+                    rate_schedule).calculate_amortization()
+
+    assert result.total_interest == pytest.approx(schedule.interest.sum(), abs=0.01)
+    np.testing.assert_allclose(result.band('balance', 50)[:len(schedule)], schedule.balance, atol=0.01)
+
+
+def test_paths_match_the_deterministic_schedule():
+    starts, rates = LOAN.rate_schedule.segments(LOAN.interest_rate, LOAN.term * 12)
+    rate_schedule = RateSchedule(36, 12, rates=tuple(rates[1:]))
+    loan = Loan(LOAN.principal, LOAN.interest_rate, LOAN.term, LOAN.down_payment, LOAN.extra_payment, rate_schedule)
+    schedule = loan.calculate_amortization()
+    columns, total_interest = amortize_paths(
+        loan.principal - loan.down_payment, starts, rates[None, :], loan.term * 12, loan.extra_payment
+    )
+
+    assert total_interest[0] == pytest.approx(schedule.interest.sum(), abs=0.01)
+    np.testing.assert_allclose(columns['balance'][0, :len(schedule)], schedule.balance, atol=0.01)
+
+
+def test_bootstrap_rejects_short_history():
+    model = BootstrapModel(np.linspace(3, 5, 20))
+
+    with pytest.raises(ValueError):
+        simulate_loan(LOAN, model, 10)
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+import pytest
+
+from money_analyzer.utils import portfolio
+from money_analyzer.utils.financial_calculations import LoanBatch
+from money_analyzer.utils.portfolio import (
+    CASH_FLOW_COLUMNS, CHECKPOINT_NAME, SUMMARY_FIELDS, TAPE_COLUMNS, load_result, open_tape, process_tape,
+)
+
+NUM_LOANS = 2500
+CHUNK_SIZE = 300
+
+
+@pytest.fixture
+def tape(tmp_path):
+    rng = np.random.default_rng(5)
+    columns = np.column_stack([
+        rng.uniform(50000, 900000, NUM_LOANS).round(2),
+        rng.uniform(1, 12, NUM_LOANS).round(3),
+        rng.integers(5, 31, NUM_LOANS),
+        rng.choice([0, 20000], NUM_LOANS),
+        rng.choice([0, 150], NUM_LOANS),
+        rng.choice([0, 2500], NUM_LOANS),
+        rng.choice([0, 1], NUM_LOANS),
+    ])
+    path = tmp_path / 'tape.npy'
+    np.save(path, columns)
+    return str(path), LoanBatch(*columns[:, :5].T, fees=columns[:, 5], points=columns[:, 6])
+
+
+def assert_same_run(result, other):
+    for name in SUMMARY_FIELDS:
+        np.testing.assert_array_equal(result.summaries[name], other.summaries[name])
+    for column in CASH_FLOW_COLUMNS:
+        np.testing.assert_array_equal(getattr(result, column), getattr(other, column))
+
+
+def test_matches_batch(tape, tmp_path):
+    path, batch = tape
+    result = process_tape(path, tmp_path / 'run', CHUNK_SIZE, workers=1)
+    summary = batch.calculate_loan_summary()
+    schedule = batch.generate_amortization_schedule()
+
+    assert len(result) == NUM_LOANS
+    for name in SUMMARY_FIELDS[:-1]:
+        np.testing.assert_allclose(result.summaries[name], summary[name])
+    np.testing.assert_allclose(result.summaries['apr'], batch.calculate_apr(summary))
+    for column in CASH_FLOW_COLUMNS:
+        np.testing.assert_allclose(getattr(result, column), getattr(schedule, column).sum(axis=0))
+
+
+def test_worker_count_does_not_change_the_result(tape, tmp_path):
+    path, _ = tape
+    serial = process_tape(path, tmp_path / 'serial', CHUNK_SIZE, workers=1)
+    parallel = process_tape(path, tmp_path / 'parallel', CHUNK_SIZE, workers=2)
+
+    assert_same_run(serial, parallel)
+
+
+def test_resume_after_interrupted_chunk_matches_full_run(tape, tmp_path, monkeypatch):
+    path, _ = tape
+    full = process_tape(path, tmp_path / 'full', CHUNK_SIZE, workers=1)
+    price_chunk = portfolio._price_chunk
+
+    def interrupted(tape, summaries_path, chunk, rounding):
+        if chunk[0] == 4 * CHUNK_SIZE:
+            raise KeyboardInterrupt
+        return price_chunk(tape, summaries_path, chunk, rounding)
+
+    monkeypatch.setattr(portfolio, '_price_chunk', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        process_tape(path, tmp_path / 'run', CHUNK_SIZE, workers=1)
+    with open(tmp_path / 'run' / CHECKPOINT_NAME, encoding='utf-8') as f:
+        assert json.load(f)['next_chunk'] == 4
+    with pytest.raises(ValueError):
+        load_result(tmp_path / 'run')
+
+    monkeypatch.setattr(portfolio, '_price_chunk', price_chunk)
+    resumed = process_tape(path, tmp_path / 'run', CHUNK_SIZE, workers=1)
+
+    assert resumed.resumed_chunks == 4
+    assert_same_run(resumed, full)
+    assert_same_run(load_result(tmp_path / 'run'), full)
+
+
+def test_different_run_needs_restart(tape, tmp_path):
+    path, _ = tape
+    process_tape(path, tmp_path / 'run', CHUNK_SIZE, workers=1)
+
+    with pytest.raises(ValueError, match='different run'):
+        process_tape(path, tmp_path / 'run', CHUNK_SIZE * 2, workers=1)
+    result = process_tape(path, tmp_path / 'run', CHUNK_SIZE * 2, workers=1, restart=True)
+    assert result.resumed_chunks == 0
+
+
+def test_csv_tape_matches_npy_tape(tape, tmp_path):
+    path, batch = tape
+    csv_path = tmp_path / 'tape.csv'
+    columns = np.load(path)
+    lines = [",".join(repr(float(value)) if value else "" for value in row) for row in columns]
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        # Zero columns are left empty and the last row has no line break
+        f.write(",".join(TAPE_COLUMNS) + "\n" + "\n".join(lines))
+    csv_tape = open_tape(csv_path)
+
+    assert len(csv_tape) == NUM_LOANS
+    assert_same_run(process_tape(str(csv_path), tmp_path / 'csv', CHUNK_SIZE, workers=1),
+                    process_tape(path, tmp_path / 'npy', CHUNK_SIZE, workers=1))
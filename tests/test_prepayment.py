@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.amortization import AmortizationSchedule
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment, first_changed_month
+from money_analyzer.models.rate_schedule import RateSchedule
+
+CENT = 0.005
+
+
+def reference_schedule(loan):
+    """Month-by-month fixed-rate loop; prepayments shorten the loan, never recast it."""
+    monthly_rate = loan.interest_rate / 12 / 100
+    level = loan.calculate_monthly_payment()
+    balance = loan.principal - loan.down_payment
+    rows = []
+    for month in range(1, loan.term * 12 + 1):
+        extra = loan.extra_payment + sum(event.amount for event in loan.prepayments
+                                         if event.recurring and event.month <= month)
+        lump_sum = sum(event.amount for event in loan.prepayments if not event.recurring and event.month == month)
+        interest = balance * monthly_rate
+        principal = level + extra - interest
+        paid = level + extra
+        if balance - principal <= 0:
+            principal = balance
+            paid = principal + interest + extra
+        else:
+            # A lump sum never pays more than the balance left
+            lump_sum = min(lump_sum, balance - principal)
+            principal += lump_sum
+            paid += lump_sum
+        balance -= principal
+        rows.append((paid, principal, interest, max(balance, 0)))
+        if balance <= 1e-9:
+            break
+    return np.array(rows)
+
+
+LOANS = {
+    'lump_sum': Loan(200000, 6, 30, prepayments=(Prepayment(12, 10000),)),
+    'recurring': Loan(200000, 6, 30, 0, 100, prepayments=(Prepayment(24, 300, recurring=True),)),
+    'mixed': Loan(250000, 4.5, 30, 50000, prepayments=(
+        Prepayment(6, 2500), Prepayment(18, 150, recurring=True), Prepayment(18, 4000), Prepayment(90, 75, True),
+    )),
+    'early_payoff': Loan(200000, 6, 30, prepayments=(Prepayment(60, 500000),)),
+    'zero_rate': Loan(200000, 0, 30, prepayments=(Prepayment(60, 5000), Prepayment(10, 50, recurring=True))),
+    'after_term': Loan(50000, 5, 5, prepayments=(Prepayment(61, 1000), Prepayment(70, 10, recurring=True))),
+}
+
+
+@pytest.mark.parametrize('loan', LOANS.values(), ids=LOANS.keys())
+def test_schedule_matches_monthly_loop(loan):
+    expected = reference_schedule(loan)
+    schedule = loan.calculate_amortization()
+
+    assert len(schedule) == len(expected)
+    for column, values in zip(('payment', 'principal', 'interest', 'balance'), expected.T):
+        np.testing.assert_allclose(getattr(schedule, column), values, atol=CENT, err_msg=column)
+
+
+@pytest.mark.parametrize('loan', LOANS.values(), ids=LOANS.keys())
+def test_summary_matches_schedule(loan):
+    schedule = loan.calculate_amortization()
+    _, total_interest, total_payments, num_months = loan.calculate_loan_summary()
+
+    assert num_months == len(schedule)
+    assert total_interest == pytest.approx(schedule.interest.sum(), abs=CENT)
+    assert total_payments == pytest.approx(schedule.principal.sum() + total_interest, abs=CENT)
+
+
+def test_early_payoff_caps_the_lump_sum():
+    schedule = LOANS['early_payoff'].calculate_amortization()
+
+    assert len(schedule) == 60
+    assert schedule.balance[-1] == 0
+    assert schedule.principal.sum() == pytest.approx(200000)
+
+
+BASE_EVENTS = (Prepayment(24, 5000), Prepayment(36, 200, recurring=True), Prepayment(120, 20000))
+EDITS = {
+    'amount': (Prepayment(24, 5000), Prepayment(36, 200, recurring=True), Prepayment(120, 25000)),
+    'month': (Prepayment(24, 5000), Prepayment(48, 200, recurring=True), Prepayment(120, 20000)),
+    'added': BASE_EVENTS + (Prepayment(200, 1000),),
+    'removed': BASE_EVENTS[:2],
+    'payoff': BASE_EVENTS[:2] + (Prepayment(120, 1000000),),
+    'first': (Prepayment(1, 100),) + BASE_EVENTS,
+}
+
+
+@pytest.mark.parametrize('rate_schedule', [None, RateSchedule(60, 12, rates=(7.0, 8.0))], ids=['fixed', 'arm'])
+@pytest.mark.parametrize('events', EDITS.values(), ids=EDITS.keys())
+def test_incremental_recompute_equals_full_recompute(events, rate_schedule):
+    before = Loan(300000, 5.5, 30, 30000, 50, rate_schedule, BASE_EVENTS)
+    after = Loan(300000, 5.5, 30, 30000, 50, rate_schedule, events)
+    previous = before.calculate_amortization()
+
+    incremental = after.calculate_amortization(previous=(before, previous))
+    full = after.calculate_amortization()
+
+    for column in AmortizationSchedule.COLUMNS:
+        np.testing.assert_array_equal(getattr(incremental, column), getattr(full, column), err_msg=column)
+
+
+def test_incremental_recompute_reuses_the_shared_prefix():
+    before = Loan(300000, 5.5, 30, prepayments=BASE_EVENTS)
+    after = Loan(300000, 5.5, 30, prepayments=EDITS['amount'])
+    previous = before.calculate_amortization()
+
+    assert after.shared_months(before) == 119
+    incremental = after.calculate_amortization(previous=(before, previous))
+    np.testing.assert_array_equal(incremental.balance[:119], previous.balance[:119])
+    assert incremental.balance[119] < previous.balance[119]
+
+
+def test_other_base_loan_shares_nothing():
+    before = Loan(300000, 5.5, 30, prepayments=BASE_EVENTS)
+    after = Loan(300000, 6.0, 30, prepayments=BASE_EVENTS)
+
+    assert after.shared_months(before) == 0
+    for column in AmortizationSchedule.COLUMNS:
+        np.testing.assert_array_equal(
+            getattr(after.calculate_amortization(previous=(before, before.calculate_amortization())), column),
+            getattr(after.calculate_amortization(), column),
+        )
+
+
+def test_first_changed_month():
+    assert first_changed_month(BASE_EVENTS, BASE_EVENTS) is None
+    assert first_changed_month(BASE_EVENTS, EDITS['month']) == 36
+    assert first_changed_month(BASE_EVENTS, EDITS['removed']) == 120
+
+
+def test_months_start_at_one():
+    with pytest.raises(ValueError):
+        Prepayment(0, 100)
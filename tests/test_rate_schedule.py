@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.rate_schedule import RateSchedule
+
+CENT = 0.005
+
+
+def reference_schedule(loan):
+    """Month-by-month ARM loop, recasting the payment at every reset."""
+    starts, rates = loan.rate_segments()
+    num_payments = loan.term * 12
+    balance = loan.principal - loan.down_payment
+    payment = 0.0
+    rows = []
+    for month in range(1, num_payments + 1):
+        segment = np.searchsorted(starts, month - 1, side='right') - 1
+        rate = rates[segment]
+        if month - 1 == starts[segment]:
+            remaining = num_payments - starts[segment]
+            level = balance / remaining if rate == 0 else balance * rate / (1 - (1 + rate) ** -remaining)
+            payment = level + loan.extra_payment
+        interest = balance * rate
+        principal = payment - interest
+        paid = payment
+        if balance - principal < 0:
+            # Like the fixed-rate engine, the final row settles the balance
+            # and still shows the extra payment on top
+            principal = balance
+            paid = principal + interest + loan.extra_payment
+        balance -= principal
+        rows.append((paid, principal, interest, max(balance, 0)))
+        if balance <= 0:
+            break
+    return np.array(rows)
+
+
+SCHEDULES = [
+    RateSchedule(60, 12, rates=(7.0, 9.0)),
+    RateSchedule(36, 6, rates=(2.0,), floor=3.0),
+    RateSchedule(84, 12, rates=(12.0,), initial_cap=2.0, periodic_cap=1.0, lifetime_cap=5.0),
+    RateSchedule(12, 12),
+]
+
+
+@pytest.mark.parametrize('rate_schedule', SCHEDULES)
+@pytest.mark.parametrize('extra_payment', [0, 400])
+def test_schedule_matches_monthly_loop(rate_schedule, extra_payment):
+    loan = Loan(300000, 5.5, 30, 30000, extra_payment, rate_schedule)
+    expected = reference_schedule(loan)
+    schedule = loan.calculate_amortization()
+
+    assert len(schedule) == len(expected)
+    for column, values in zip(('payment', 'principal', 'interest', 'balance'), expected.T):
+        np.testing.assert_allclose(getattr(schedule, column), values, atol=CENT)
+
+
+@pytest.mark.parametrize('rate_schedule', SCHEDULES)
+def test_summary_matches_schedule(rate_schedule):
+    loan = Loan(300000, 5.5, 30, 30000, 250, rate_schedule)
+    schedule = loan.calculate_amortization()
+    _, total_interest, total_payments, num_months = loan.calculate_loan_summary()
+
+    assert num_months == len(schedule)
+    assert total_interest == pytest.approx(schedule.interest.sum(), abs=CENT)
+    assert total_payments == pytest.approx(schedule.principal.sum() + total_interest, abs=CENT)
+
+
+def test_caps_and_floor_limit_resets():
+    rate_schedule = RateSchedule(60, 12, rates=(12.0, 1.0), initial_cap=2.0, periodic_cap=1.0, lifetime_cap=5.0,
+                                 floor=4.0)
+    starts, rates = rate_schedule.segments(5.0, 120)
+
+    np.testing.assert_array_equal(starts, [0, 60, 72, 84, 96, 108])
+    # +2 at the first reset, then -1 per reset towards 1% until the 4% floor
+    np.testing.assert_allclose(rates, [5.0, 7.0, 6.0, 5.0, 4.0, 4.0])
+
+
+def test_lifetime_cap():
+    _, rates = RateSchedule(12, 12, rates=(20.0,), lifetime_cap=3.0).segments(5.0, 60)
+
+    np.testing.assert_allclose(rates, [5.0, 8.0, 8.0, 8.0, 8.0])
+
+
+def test_vectorized_caps_match_scalar_walk():
+    rate_schedule = SCHEDULES[2]
+    targets = np.array([[12.0, 3.0, 9.0], [1.0, 1.0, 15.0]])
+    capped = rate_schedule.cap_rates(5.5, targets)
+
+    for path, expected_targets in zip(capped, targets):
+        scalar = RateSchedule(84, 12, rates=tuple(expected_targets), initial_cap=2.0, periodic_cap=1.0,
+                              lifetime_cap=5.0)
+        np.testing.assert_allclose(path, scalar.segments(5.5, 84 + 12 * 3)[1][1:])
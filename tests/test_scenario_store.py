@@ -0,0 +1,105 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.models.scenario_store import MANIFEST_NAME, STORE_VERSION, ScenarioStore
+
+LOANS = [
+    Loan(250000, 5.0, 30, 50000),
+    Loan(300000, 6.0, 30, 0, 200, rate_schedule=RateSchedule(60, 12, rates=(7.0, 8.0), periodic_cap=1.0)),
+    Loan(200000, 4.5, 15, prepayments=(Prepayment(12, 10000), Prepayment(24, 100, recurring=True))),
+    Loan(150000, 7.0, 10, rounding='half_even'),
+    Loan(400000, 6.5, 30, 80000, fees=3000, points=1.5),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScenarioStore.create(tmp_path / 'store', with_schedules=True)
+    store.append(LOANS[:2])
+    store.append(LOANS[2:])
+    return store
+
+
+def test_round_trip_keeps_every_loan(store):
+    reopened = ScenarioStore.open(os.path.join(store.path, MANIFEST_NAME))
+
+    assert len(reopened) == len(LOANS)
+    assert reopened.version == STORE_VERSION
+    for index, loan in enumerate(LOANS):
+        assert reopened.loan(index).cache_key() == loan.cache_key()
+
+
+def test_round_trip_keeps_schedules(store):
+    reopened = ScenarioStore.open(store.path)
+
+    for index, loan in enumerate(LOANS):
+        expected = loan.calculate_amortization()
+        schedule = reopened.schedule(index)
+        assert len(schedule) == len(expected)
+        np.testing.assert_allclose(schedule.balance, expected.balance, atol=1e-6)
+        np.testing.assert_allclose(schedule.interest, expected.interest, atol=1e-6)
+
+
+def test_negative_index_counts_from_end(store):
+    assert store.loan(-1).cache_key() == LOANS[-1].cache_key()
+    np.testing.assert_array_equal(store.schedule(-1).balance, store.schedule(len(LOANS) - 1).balance)
+
+
+@pytest.mark.parametrize('index', [len(LOANS), -len(LOANS) - 1])
+def test_index_out_of_range(store, index):
+    with pytest.raises(IndexError):
+        store.schedule(index)
+    with pytest.raises(IndexError):
+        store.loan(index)
+
+
+def test_interrupted_append_is_discarded(store):
+    # An append that died before replacing the manifest leaves extra bytes
+    with open(os.path.join(store.path, 'principal.bin'), 'ab') as f:
+        f.write(b'\0' * 8)
+
+    store.append([Loan(1000, 5, 1)])
+    reopened = ScenarioStore.open(store.path)
+
+    assert len(reopened) == len(LOANS) + 1
+    assert reopened.loan(-1).cache_key() == Loan(1000, 5, 1).cache_key()
+    assert os.path.getsize(os.path.join(store.path, 'principal.bin')) == 8 * len(reopened)
+
+
+def test_create_refuses_existing_store(store):
+    with pytest.raises(FileExistsError):
+        ScenarioStore.create(store.path)
+    assert len(ScenarioStore.create(store.path, overwrite=True)) == 0
+
+
+def test_newer_version_is_rejected(store):
+    manifest_path = os.path.join(store.path, MANIFEST_NAME)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['version'] = STORE_VERSION + 1
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError, match='newer'):
+        ScenarioStore.open(store.path)
+
+
+def test_loan_reads_one_row(store, monkeypatch):
+    calls = []
+    batch = ScenarioStore.batch
+
+    def recording_batch(self, start=0, stop=None):
+        calls.append((start, stop))
+        return batch(self, start, stop)
+
+    monkeypatch.setattr(ScenarioStore, 'batch', recording_batch)
+    for index in range(-len(LOANS), len(LOANS)):
+        assert store.loan(index).cache_key() == LOANS[index].cache_key()
+
+    assert all(stop == start + 1 for start, stop in calls)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from money_analyzer.controllers.loan_controller import LoanController, compute_batch_results
+from money_analyzer.controllers.schedule_cache import ScheduleCache, shared_cache
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+
+LOANS = [
+    Loan(250000, 5.0, 30, 50000),
+    Loan(300000, 0, 15, 0, 250),
+    Loan(300000, 6.0, 30, 0, 200, rate_schedule=RateSchedule(60, 12, rates=(7.0, 8.0), periodic_cap=1.0)),
+    Loan(200000, 4.5, 15, prepayments=(Prepayment(12, 10000), Prepayment(24, 100, recurring=True))),
+    Loan(150000, 7.0, 10, rounding='half_even'),
+    Loan(400000, 6.5, 30, 80000, fees=3000, points=1.5),
+    Loan(100000, 5.0, 10, 100000),
+]
+
+
+def test_evicts_least_recently_used():
+    cache = ScheduleCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get_or_compute('a', lambda: pytest.fail("a is cached")) == 1
+
+    cache.put('c', 3)
+
+    assert len(cache) == 2
+    assert cache.peek('b') is None
+    assert cache.peek('a') == 1 and cache.peek('c') == 3
+
+
+def test_put_refreshes_existing_key():
+    cache = ScheduleCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('a', 10)
+    cache.put('c', 3)
+
+    assert cache.peek('a') == 10 and cache.peek('b') is None
+
+
+def test_counts_hits_and_misses():
+    cache = ScheduleCache(maxsize=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute('a', compute) == 1
+    assert cache.get_or_compute('a', compute) == 1
+    assert cache.get_or_compute('b', compute) == 2
+    cache.peek('a')
+
+    assert len(calls) == 2
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 2, 'maxsize': 4, 'hit_rate': pytest.approx(1 / 3)}
+
+
+def test_clear_drops_entries_and_counters():
+    cache = ScheduleCache()
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('a', lambda: 1)
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+    assert cache.stats()['hit_rate'] == 0.0
+
+
+def test_controllers_share_the_default_cache():
+    shared_cache.clear()
+    first, second = LoanController(), LoanController()
+    first.loan = second.loan = Loan(250000, 5.0, 30, 50000)
+
+    assert first.cache is second.cache is shared_cache
+    first.get_loan_summary()
+    second.get_loan_summary()
+    assert shared_cache.stats()['hits'] == 1 and shared_cache.stats()['misses'] == 1
+    shared_cache.clear()
+
+
+def per_loan_results(cache):
+    results = []
+    for loan in LOANS:
+        controller = LoanController(cache=cache)
+        controller.loan = loan
+        results.append((controller.get_loan_summary(), controller.get_amortization_data()))
+    return results
+
+
+def assert_same_results(results, expected):
+    for (summary, data), (expected_summary, expected_data) in zip(results, expected, strict=True):
+        assert summary.keys() == expected_summary.keys()
+        for key, value in expected_summary.items():
+            assert summary[key] == pytest.approx(value, rel=1e-9, abs=1e-6, nan_ok=True), key
+        for key in ('months', 'principal_payments', 'interest_payments'):
+            np.testing.assert_allclose(data[key], expected_data[key], atol=1e-6, err_msg=key)
+        np.testing.assert_allclose(data['schedule'].balance, expected_data['schedule'].balance, atol=1e-6)
+
+
+def test_batch_results_match_per_loan_controllers():
+    expected = per_loan_results(ScheduleCache())
+
+    assert_same_results(compute_batch_results(LOANS, ScheduleCache()), expected)
+
+
+def test_batch_results_warm_the_cache():
+    cache = ScheduleCache()
+    cold = compute_batch_results(LOANS, cache)
+    warm = per_loan_results(cache)
+
+    assert cache.stats()['hits'] == 2 * len(LOANS) and cache.stats()['misses'] == 0
+    assert_same_results(warm, cold)
+    assert_same_results(compute_batch_results(LOANS, cache), cold)
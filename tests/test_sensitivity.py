@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from money_analyzer.models.loan import Loan
+from money_analyzer.models.prepayment import Prepayment
+from money_analyzer.models.rate_schedule import RateSchedule
+from money_analyzer.utils.sensitivity import METRICS, sensitivity_grid
+
+BASES = [
+    Loan(250000, 5.0, 30, 50000),
+    Loan(250000, 5.0, 30, 50000, rate_schedule=RateSchedule(60, 12, rates=(7.0, 9.0))),
+    Loan(250000, 5.0, 30, 50000, prepayments=(Prepayment(24, 5000), Prepayment(36, 100, recurring=True))),
+    Loan(250000, 5.0, 30, 50000, rounding='half_even'),
+]
+
+
+@pytest.mark.parametrize('base', BASES)
+def test_every_cell_is_the_swept_loan(base):
+    rates, terms = np.array([3.0, 6.5]), np.array([15, 30])
+    grid = sensitivity_grid(base, 'interest_rate', rates, 'term', terms)
+
+    for row, term in enumerate(terms):
+        for column, rate in enumerate(rates):
+            loan = Loan(base.principal, rate, int(term), base.down_payment, base.extra_payment, base.rate_schedule,
+                        base.prepayments, base.rounding)
+            monthly_payment, total_interest, total_payments, num_months = loan.calculate_loan_summary()
+            assert grid['monthly_payment'][row, column] == pytest.approx(monthly_payment)
+            assert grid['total_interest'][row, column] == pytest.approx(total_interest)
+            assert grid['total_payments'][row, column] == pytest.approx(total_payments)
+            assert grid['loan_term'][row, column] == pytest.approx(num_months / 12)
+
+
+def test_cells_without_a_loan_are_nan():
+    grid = sensitivity_grid(Loan(100000, 5, 30), 'down_payment', np.array([0, 100000]), 'term', np.array([10]))
+
+    for metric in METRICS:
+        assert not np.isnan(grid[metric][0, 0])
+        assert np.isnan(grid[metric][0, 1])
+
+
+def test_same_axis_twice_is_rejected():
+    with pytest.raises(ValueError):
+        sensitivity_grid(Loan(100000, 5, 30), 'term', np.arange(1, 3), 'term', np.arange(1, 3))
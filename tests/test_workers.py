@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip('PyQt6.QtWidgets')
+
+from money_analyzer.models.loan import Loan  # noqa: E402
+from money_analyzer.ui.workers import LoanComputeService  # noqa: E402
+
+QUIT_WHILE_RUNNING = textwrap.dedent("""
+    import threading
+    import time
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication, QWidget
+
+    from money_analyzer.controllers.loan_controller import LoanController
+    from money_analyzer.models.loan import Loan
+    from money_analyzer.ui.workers import LoanComputeService
+
+    started = threading.Event()
+    get_loan_summary = LoanController.get_loan_summary
+
+    def slow_summary(self):
+        started.set()
+        time.sleep(0.5)
+        return get_loan_summary(self)
+
+    LoanController.get_loan_summary = slow_summary
+    app = QApplication([])
+    widget = QWidget()
+    service = LoanComputeService(widget)
+    service.submit('loan', Loan(200000, 6, 30), lambda summary, amortization_data: None)
+    started.wait()
+    QTimer.singleShot(0, app.quit)
+    app.exec()
+    # The interpreter tears the widget and service down while the task runs
+    print('clean exit')
+""")
+
+
+def test_quit_with_task_running_exits_cleanly():
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    process = subprocess.run([sys.executable, '-c', QUIT_WHILE_RUNNING], capture_output=True, text=True, env=env,
+                             timeout=60)
+
+    assert process.returncode == 0, process.stderr
+    assert 'clean exit' in process.stdout
+    assert 'RuntimeError' not in process.stderr
+
+
+class RecordingPool:
+    def __init__(self):
+        self.tasks = []
+
+    def start(self, task):
+        self.tasks.append(task)
+
+
+@pytest.fixture
+def service():
+    return LoanComputeService(thread_pool=RecordingPool())
+
+
+def finish(service, task, result='summary'):
+    # Runs on this thread instead of the pool, like the queued signal would
+    service._on_finished(task.owner, task.generation, (result, 'amortization data'))
+
+
+def test_only_latest_submission_is_applied(service):
+    applied = []
+    service.submit('loan', Loan(1000, 5, 1), lambda *results: applied.append(results))
+    service.submit('loan', Loan(2000, 5, 1), lambda *results: applied.append(results))
+    first, second = service.thread_pool.tasks
+
+    finish(service, first, 'old')
+    assert service.is_pending('loan') and not applied
+    finish(service, second, 'new')
+    assert applied == [('new', 'amortization data')]
+    assert not service.is_pending('loan')
+
+
+def test_cancel_forgets_owner_and_drops_result_in_flight(service):
+    applied = []
+    owners = [object() for _ in range(300)]
+    for owner in owners:
+        service.submit(owner, Loan(1000, 5, 1), applied.append)
+    for owner in owners:
+        service.cancel(owner)
+
+    assert not service._generations and not service._callbacks
+    service.submit(owners[0], Loan(1000, 5, 1), lambda *results: applied.append(results))
+    # The cancelled task must not match the new submission of the same owner
+    finish(service, service.thread_pool.tasks[0])
+    assert not applied
+    finish(service, service.thread_pool.tasks[-1])
+    assert applied == [('summary', 'amortization data')]
+    assert not service._generations
+
+
+def test_submit_call_hands_result_to_callback(service):
+    applied = []
+    service.submit_call('bands', lambda: 'simulated', applied.append)
+    task = service.thread_pool.tasks[0]
+
+    service._on_finished(task.owner, task.generation, task.compute())
+
+    assert applied == ['simulated']